@@ -0,0 +1,68 @@
+"""
+
+Builds an opening book (see models/OpeningBook.py) from PGN collections.
+
+Every game is replayed for its first max_ply half-moves. Each (position, move) pair seen is
+weighted by how well it did for the side that played it: 2 for a win, 1 for a draw, 0 for a
+loss. Pairs seen in fewer than min_games games are left out, which keeps one-off blunders and
+the long tail of rare lines out of the book. The games are streamed with read_games, so the
+size of the collection only matters for the time it takes, the memory used grows with the
+number of distinct (position, move) pairs.
+
+Usage (from the repository root):
+    python -m Designs.Chess.Book games.pgn more.pgn --output book.bin --max-ply 24 --min-games 3
+
+"""
+
+import argparse
+import time
+
+from Designs.Chess.Pgn import read_games, new_board, san_to_move, PgnError
+from Designs.Chess.models.Fen import START_FEN, FenError
+from Designs.Chess.models.OpeningBook import write_book
+
+POINTS = {"1-0": (2, 0), "0-1": (0, 2), "1/2-1/2": (1, 1)}
+
+
+def collect(sources, max_ply: int = 24, min_games: int = 1) -> dict:
+    # -> {(key, move_code): weight}
+    weights = {}
+    games = {}
+    board = new_board()
+    for source in sources:
+        for game in read_games(source, decode=False, skip_invalid=True):
+            points = POINTS.get(game.result)
+            if points is None:
+                continue
+            try:
+                board.set_fen(game.headers.get("FEN", START_FEN))
+                for san in game.moves[:max_ply]:
+                    move = san_to_move(board, san)
+                    entry = (board.hash, move.encode())
+                    weights[entry] = weights.get(entry, 0) + points[0 if board.isWhiteTurn else 1]
+                    games[entry] = games.get(entry, 0) + 1
+                    board.make_move(move)
+            except (PgnError, FenError):
+                # The moves before the bad one are kept, they were legal
+                continue
+    if min_games > 1:
+        weights = {entry: weight for entry, weight in weights.items() if games[entry] >= min_games}
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile an opening book from PGN files")
+    parser.add_argument("sources", nargs="+")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--max-ply", type=int, default=24)
+    parser.add_argument("--min-games", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    weights = collect(args.sources, args.max_ply, args.min_games)
+    entries = write_book(args.output, weights)
+    print(f"{entries} entries written to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
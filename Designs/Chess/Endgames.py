@@ -0,0 +1,34 @@
+"""
+
+Generates endgame tablebases (see models/Tablebase.py) for the given material signatures.
+
+The tables an ending depends on (the ones reached by a capture or a promotion) are generated
+first, so asking for KPvK also builds KQvK, KRvK and the rest. Three-piece tables take seconds,
+four-piece tables are 64 times bigger and take a long while in pure Python, but only need to
+be generated once.
+
+Usage (from the repository root):
+    python -m Designs.Chess.Endgames KQvK KRvK KPvK --directory tablebases
+
+"""
+
+import argparse
+import time
+
+from Designs.Chess.models.Tablebase import generate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate endgame tablebases by retrograde analysis")
+    parser.add_argument("signatures", nargs="+", help="material signatures such as KQvK or KRvKP")
+    parser.add_argument("--directory", default="tablebases")
+    args = parser.parse_args(argv)
+
+    for signature in args.signatures:
+        start = time.perf_counter()
+        path = generate(signature, args.directory, log=print)
+        print(f"{path} ready in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,10 @@ For extensibality, the game can be extended to support boards of different sizes
 For example, we can create a 10x10 board for a variant of chess that includes additional pieces.
 We can also implement different rules for movement or capturing based on the variant being played.
 
+Variant.py describes such boards (size, pieces as combinations of leaps and slides, start position)
+and VariantBoard.py generates and makes their moves from tables cached per variant, see Capablanca
+and Grand chess there. VariantBoard is a move generation model, games are still played on Board.
+
 """
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+"""
+
+Perft (performance test) for the chess move generator.
+
+Perft walks the game tree to a fixed depth and counts the leaf nodes. The counts for a set of
+reference positions are well known, so a mismatch means the move generator is wrong, and the
+time it takes gives a nodes-per-second figure to track move generation speed between builds.
+
+Usage (from the repository root):
+    python -m Designs.Chess.Perft --depth 3 --output perft.json
+
+The "start" position is the one set up by Board.initialize, the others are the usual tricky
+positions (castling, en passant, promotions, pins and checks) set up from FEN.
+
+"""
+
+import argparse
+import json
+import platform
+import time
+
+from Designs.Chess.models.Board import Board
+from Designs.Chess.models.Player import Player
+
+# name -> (FEN or None for Board.initialize, known node counts for depth 1, 2, ...)
+POSITIONS = {
+    "start": (None, [20, 400, 8902, 197281, 4865609]),
+    "kiwipete": ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                 [48, 2039, 97862, 4085603]),
+    "position3": ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+                  [14, 191, 2812, 43238, 674624]),
+    "position4": ("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+                  [6, 264, 9467, 422333]),
+    "position5": ("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+                  [44, 1486, 62379, 2103487]),
+    "position6": ("r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+                  [46, 2079, 89890, 3894594]),
+}
+
+
+def new_board(fen: str = None) -> Board:
+    return Board(player1=Player("White", True), player2=Player("Black", False), fen=fen)
+
+
+def perft(board: Board, depth: int) -> int:
+    if depth == 0:
+        return 1
+    moves = board.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board: Board, depth: int) -> dict:
+    result = {}
+    for move in board.legal_moves():
+        board.make_move(move)
+        result[move.uci()] = perft(board, depth - 1)
+        board.unmake_move()
+    return result
+
+
+def run(depth: int, names=None) -> dict:
+    results = []
+    for name in names or POSITIONS:
+        fen, expected = POSITIONS[name]
+        for current in range(1, depth + 1):
+            board = new_board(fen)
+            start = time.perf_counter()
+            nodes = perft(board, current)
+            seconds = time.perf_counter() - start
+            known = expected[current - 1] if current <= len(expected) else None
+            results.append({
+                "position": name,
+                "depth": current,
+                "nodes": nodes,
+                "expected": known,
+                "ok": known is None or nodes == known,
+                "seconds": round(seconds, 6),
+                "nps": int(nodes / seconds) if seconds > 0 else 0,
+            })
+    total_nodes = sum(result["nodes"] for result in results)
+    total_seconds = sum(result["seconds"] for result in results)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "depth": depth,
+        "ok": all(result["ok"] for result in results),
+        "nodes": total_nodes,
+        "seconds": round(total_seconds, 6),
+        "nps": int(total_nodes / total_seconds) if total_seconds > 0 else 0,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft benchmark for the chess move generator")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--position", action="append", choices=sorted(POSITIONS), help="defaults to all positions")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--divide", action="store_true", help="print the node count below every root move")
+    args = parser.parse_args(argv)
+
+    if args.divide:
+        for name in args.position or POSITIONS:
+            print(name)
+            for move, nodes in sorted(divide(new_board(POSITIONS[name][0]), args.depth).items()):
+                print(f"  {move}: {nodes}")
+        return 0
+
+    report = run(args.depth, args.position)
+    for result in report["results"]:
+        status = "ok" if result["ok"] else f"MISMATCH (expected {result['expected']})"
+        print(f"{result['position']:<10} depth {result['depth']}: {result['nodes']:>10} nodes "
+              f"{result['seconds']:>9.3f}s {result['nps']:>9} nps  {status}")
+    print(f"total: {report['nodes']} nodes in {report['seconds']:.3f}s, {report['nps']} nps")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
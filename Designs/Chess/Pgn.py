@@ -0,0 +1,296 @@
+"""
+
+Streaming PGN (Portable Game Notation) reader and writer.
+
+read_games is a generator: it reads the file line by line and yields one PgnGame at a time,
+so only the game being parsed is ever in memory, whatever the size of the file.
+The moves are decoded from SAN (e4, Nbd7, exd8=Q+, O-O) by replaying them on a Board, which
+both checks that they are legal and gives back real Move objects. Games with a FEN header
+start from that position.
+
+PgnWriter writes games back out, buffering them and writing a whole batch with one call.
+game_from_board turns a finished Board (its move stack) into a PgnGame for export.
+
+Usage (from the repository root), re-exporting an archive and counting its games:
+    python -m Designs.Chess.Pgn games.pgn --output clean.pgn
+
+"""
+
+import argparse
+import re
+import time
+
+from Designs.Chess.models.Board import Board, BoardState
+from Designs.Chess.models.BitBoard import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from Designs.Chess.models.Fen import START_FEN, FenError
+from Designs.Chess.models.Move import Move, square_name, parse_square
+from Designs.Chess.models.Player import Player
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+PIECE_LETTERS = {KNIGHT: "N", BISHOP: "B", ROOK: "R", QUEEN: "Q", KING: "K"}
+LETTER_KINDS = {letter: kind for kind, letter in PIECE_LETTERS.items()}
+
+HEADER_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN_RE = re.compile(r'\{[^}]*\}|;[^\n]*|1-0|0-1|1/2-1/2|\*|\d+\.+|\$\d+|\(|\)|[^\s(){};$]+')
+SAN_RE = re.compile(r'^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$')
+
+
+class PgnError(ValueError):
+    pass
+
+
+class PgnGame:
+    def __init__(self, headers: dict = None, moves: list = None, result: str = "*"):
+        self.headers = headers if headers is not None else {}
+        self.moves = moves if moves is not None else []
+        self.result = result
+
+    def __repr__(self):
+        return f"PgnGame({self.headers.get('White', '?')} - {self.headers.get('Black', '?')}, {len(self.moves)} moves)"
+
+
+def new_board(fen: str = None) -> Board:
+    return Board(Player("White", True), Player("Black", False), fen=fen)
+
+
+def san_to_move(board: Board, san: str) -> Move:
+    text = san.rstrip("+#!?")
+    color = board.side_to_move()
+    if text in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        king = 60 if board.isWhiteTurn else 4
+        target = king + (2 if len(text) == 3 else -2)
+        move = Move(king, target)
+        if board.validate_move(move):
+            return move
+        raise PgnError(f"Illegal castling {san}")
+
+    match = SAN_RE.match(text)
+    if match is None:
+        raise PgnError(f"Cannot read move {san}")
+    letter, from_file, from_rank, target, promotion = match.groups()
+    kind = LETTER_KINDS[letter] if letter else PAWN
+    target = parse_square(target)
+    promotion = LETTER_KINDS[promotion] if promotion else None
+
+    candidates = []
+    for move in board.legal_moves(board.bitboard.pieces[color * 6 + kind]):
+        if move.to_square != target or move.promotion != promotion:
+            continue
+        name = square_name(move.from_square)
+        if (from_file and name[0] != from_file) or (from_rank and name[1] != from_rank):
+            continue
+        candidates.append(move)
+    if len(candidates) != 1:
+        raise PgnError(f"{'Ambiguous' if candidates else 'Illegal'} move {san}")
+    return candidates[0]
+
+
+def move_to_san(board: Board, move: Move) -> str:
+    kind = board.bitboard.piece_at(move.from_square)[0]
+    if kind == KING and abs(move.to_square - move.from_square) == 2:
+        san = "O-O" if move.to_square > move.from_square else "O-O-O"
+    else:
+        capture = board.bitboard.piece_at(move.to_square) is not None or (kind == PAWN and move.to_square == board.en_passant)
+        san = ""
+        if kind == PAWN:
+            if capture:
+                san = square_name(move.from_square)[0]
+        else:
+            san = PIECE_LETTERS[kind]
+            rivals = [other.from_square for other in board.legal_moves(board.bitboard.pieces[board.side_to_move() * 6 + kind])
+                      if other.to_square == move.to_square and other.from_square != move.from_square]
+            if rivals:
+                name = square_name(move.from_square)
+                if all(square_name(rival)[0] != name[0] for rival in rivals):
+                    san += name[0]
+                elif all(square_name(rival)[1] != name[1] for rival in rivals):
+                    san += name[1]
+                else:
+                    san += name
+        if capture:
+            san += "x"
+        san += square_name(move.to_square)
+        if move.promotion is not None:
+            san += "=" + PIECE_LETTERS[move.promotion]
+
+    board.make_move(move)
+    if board.checkers:
+        san += "#" if board.boardstate == BoardState.CHECKMATE else "+"
+    board.unmake_move()
+    return san
+
+
+def _parse_game(headers: dict, movetext: str, decode: bool) -> PgnGame:
+    game = PgnGame(headers, [], headers.get("Result", "*"))
+    board = None
+    if decode:
+        try:
+            board = new_board(headers.get("FEN"))
+        except FenError as error:
+            raise PgnError(str(error))
+    depth = 0
+    for token in TOKEN_RE.findall(movetext):
+        first = token[0]
+        if first == "(":
+            depth += 1
+        elif first == ")":
+            depth -= 1
+        elif depth or first in "{;$" or token[-1] == ".":
+            continue
+        elif token in RESULTS:
+            game.result = token
+        elif decode:
+            move = san_to_move(board, token)
+            board.make_move(move)
+            game.moves.append(move)
+        else:
+            game.moves.append(token)
+    return game
+
+
+def read_games(source, decode: bool = True, skip_invalid: bool = False):
+    # source is a path or an open text file; yields PgnGame objects one at a time
+    file = open(source, encoding="utf-8", errors="replace") if isinstance(source, str) else source
+    try:
+        headers = {}
+        movetext = []
+        for line in file:
+            stripped = line.strip()
+            if stripped.startswith("%"):
+                continue
+            if stripped.startswith("["):
+                if movetext:
+                    game = _finish(headers, movetext, decode, skip_invalid)
+                    if game is not None:
+                        yield game
+                    headers = {}
+                    movetext = []
+                match = HEADER_RE.match(stripped)
+                if match:
+                    headers[match.group(1)] = match.group(2).replace('\\"', '"')
+            elif stripped:
+                movetext.append(stripped)
+        if movetext or headers:
+            game = _finish(headers, movetext, decode, skip_invalid)
+            if game is not None:
+                yield game
+    finally:
+        if file is not source:
+            file.close()
+
+
+def _finish(headers: dict, movetext: list, decode: bool, skip_invalid: bool):
+    try:
+        return _parse_game(headers, "\n".join(movetext), decode)
+    except PgnError:
+        if skip_invalid:
+            return None
+        raise
+
+
+def game_from_board(board: Board, headers: dict = None, result: str = "*") -> PgnGame:
+    moves = board.moves_played()
+    start = board.copy()
+    for _ in moves:
+        start.unmake_move()
+    headers = dict(headers or {})
+    if start.fen() != START_FEN:
+        headers["SetUp"] = "1"
+        headers["FEN"] = start.fen()
+    headers.setdefault("White", board.player1.get_name() if board.player1 else "?")
+    headers.setdefault("Black", board.player2.get_name() if board.player2 else "?")
+    headers["Result"] = result
+    return PgnGame(headers, moves, result)
+
+
+def format_game(game: PgnGame) -> str:
+    headers = {tag: "?" for tag in SEVEN_TAG_ROSTER}
+    headers.update(game.headers)
+    headers["Result"] = game.result
+    lines = [f'[{tag} "{str(value).replace(chr(34), chr(92) + chr(34))}"]' for tag, value in headers.items()]
+    lines.append("")
+
+    board = new_board(game.headers.get("FEN"))
+    tokens = []
+    for move in game.moves:
+        if board.isWhiteTurn:
+            tokens.append(f"{board.fullmove_number}.")
+        elif not tokens:
+            tokens.append(f"{board.fullmove_number}...")
+        tokens.append(move if isinstance(move, str) else move_to_san(board, move))
+        board.make_move(move if isinstance(move, Move) else san_to_move(board, move))
+    tokens.append(game.result)
+
+    line = ""
+    for token in tokens:
+        if len(line) + len(token) + 1 > 79:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n\n"
+
+
+class PgnWriter:
+    def __init__(self, target, batch_size: int = 1000):
+        self.file = open(target, "w", encoding="utf-8") if isinstance(target, str) else target
+        self._owns_file = self.file is not target
+        self.batch_size = batch_size
+        self._batch = []
+        self.games_written = 0
+
+    def write_game(self, game: PgnGame):
+        self._batch.append(format_game(game))
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_games(self, games):
+        for game in games:
+            self.write_game(game)
+
+    def flush(self):
+        if self._batch:
+            self.file.write("".join(self._batch))
+            self.games_written += len(self._batch)
+            self._batch = []
+
+    def close(self):
+        self.flush()
+        if self._owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a PGN file, checking every move")
+    parser.add_argument("source")
+    parser.add_argument("--output", help="write the games back out to this PGN file")
+    parser.add_argument("--skip-invalid", action="store_true")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    games = moves = 0
+    writer = PgnWriter(args.output) if args.output else None
+    try:
+        for game in read_games(args.source, skip_invalid=args.skip_invalid):
+            games += 1
+            moves += len(game.moves)
+            if writer is not None:
+                writer.write_game(game)
+    finally:
+        if writer is not None:
+            writer.close()
+    seconds = time.perf_counter() - start
+    print(f"{games} games, {moves} moves in {seconds:.2f}s ({games / seconds if seconds else 0:.1f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
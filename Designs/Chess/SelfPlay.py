@@ -0,0 +1,208 @@
+"""
+
+Self-play runner producing training data for evaluation tuning.
+
+Games are played by EnginePlayers across a process pool. Each side has its own EngineConfig
+(time per move, depth, hash size, opening book, tablebases), so engines and time controls can be
+pitted against each other. Every game starts with a few random moves, drawn from a seed and the
+game number, so games differ from each other and a run can be reproduced.
+
+Results are streamed to disk as games finish and are never collected in memory. Each game is
+one JSON line (the FEN before every move, the moves, the result) in gzip-compressed chunk
+files of chunk_size games. A manifest lists the finished chunks and the games in them, and it
+is rewritten atomically after every chunk. A run that was interrupted is resumed by starting it
+again with the same output directory: the games of finished chunks are skipped and the
+partly written chunk is played again.
+
+Usage (from the repository root):
+    python -m Designs.Chess.SelfPlay --games 1000 --output selfplay --workers 8 --white-ms 100 --black-ms 50
+
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from Designs.Chess.models.Board import Board, BoardRepresentation
+from Designs.Chess.models.Player import EnginePlayer
+
+MANIFEST = "manifest.json"
+
+_players = {}
+
+
+class EngineConfig:
+    def __init__(self, time_limit_ms: int = 100, max_depth: int = 64, hash_mb: float = 16,
+                 book: str = None, tablebase: str = None):
+        self.time_limit_ms = time_limit_ms
+        self.max_depth = max_depth
+        self.hash_mb = hash_mb
+        self.book = book
+        self.tablebase = tablebase
+
+    def key(self) -> tuple:
+        return self.time_limit_ms, self.max_depth, self.hash_mb, self.book, self.tablebase
+
+    def describe(self) -> str:
+        return f"engine {self.time_limit_ms}ms" + (f" depth {self.max_depth}" if self.max_depth < 64 else "")
+
+    def player(self, isWhite: bool) -> EnginePlayer:
+        # One player per config and color in each worker process, its hash table is kept between games
+        key = self.key() + (isWhite,)
+        player = _players.get(key)
+        if player is None:
+            player = _players[key] = EnginePlayer(self.describe(), isWhite, self.time_limit_ms, self.max_depth,
+                                                  self.hash_mb, book=self.book, tablebase=self.tablebase)
+        return player
+
+
+def play_game(number: int, white: EngineConfig, black: EngineConfig, seed: int = 0,
+              random_plies: int = 4, max_plies: int = 400) -> dict:
+    white_player, black_player = white.player(True), black.player(False)
+    board = Board(white_player, black_player, BoardRepresentation.BITBOARD)
+    rng = random.Random(seed * 1_000_003 + number)
+    positions = []
+    moves = []
+    while True:
+        outcome = board.game_result()
+        if outcome is not None:
+            break
+        if len(moves) >= max_plies:
+            outcome = "1/2-1/2", "move limit"
+            break
+        if len(moves) < random_plies:
+            move = rng.choice(board.legal_moves())
+        else:
+            move = (white_player if board.isWhiteTurn else black_player).get_move(board)
+        positions.append(board.fen())
+        moves.append(move.uci())
+        board.make_move(move)
+    return {
+        "game": number,
+        "white": white.describe(),
+        "black": black.describe(),
+        "result": outcome[0],
+        "reason": outcome[1],
+        "plies": len(moves),
+        "positions": positions,
+        "moves": moves,
+    }
+
+
+class ChunkWriter:
+    def __init__(self, directory: str, chunk_size: int = 1000):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = {"chunks": []}
+        path = os.path.join(directory, MANIFEST)
+        if os.path.exists(path):
+            with open(path) as file:
+                self.manifest = json.load(file)
+        self._file = None
+        self._name = None
+        self._games = []
+
+    def finished_games(self) -> set:
+        return {game for chunk in self.manifest["chunks"] for game in chunk["games"]}
+
+    def write(self, record: dict):
+        if self._file is None:
+            self._name = f"games-{len(self.manifest['chunks']):05d}.jsonl.gz"
+            self._file = gzip.open(os.path.join(self.directory, self._name), "wt", encoding="utf-8")
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._games.append(record["game"])
+        if len(self._games) >= self.chunk_size:
+            self.finish_chunk()
+
+    def finish_chunk(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self.manifest["chunks"].append({"file": self._name, "games": sorted(self._games)})
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + ".tmp", "w") as file:
+            json.dump(self.manifest, file)
+        os.replace(path + ".tmp", path)
+        self._file = None
+        self._games = []
+
+
+def run(games: int, output: str, white: EngineConfig, black: EngineConfig, workers: int = None,
+        chunk_size: int = 1000, seed: int = 0, random_plies: int = 4, max_plies: int = 400, report_every: int = 10):
+    workers = workers or os.cpu_count() or 1
+    writer = ChunkWriter(output, chunk_size)
+    pending = [number for number in range(games) if number not in writer.finished_games()]
+    skipped = games - len(pending)
+    if skipped:
+        print(f"resuming: {skipped} games already done")
+
+    start = time.perf_counter()
+    played = plies = 0
+    results = {}
+    with ProcessPoolExecutor(workers) as pool:
+        # Only a couple of games per worker are in flight, the rest are submitted as games finish
+        window = 2 * workers
+        queue = iter(pending)
+        running = set()
+        while True:
+            for number in queue:
+                running.add(pool.submit(play_game, number, white, black, seed, random_plies, max_plies))
+                if len(running) >= window:
+                    break
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for job in done:
+                record = job.result()
+                writer.write(record)
+                played += 1
+                plies += record["plies"]
+                results[record["result"]] = results.get(record["result"], 0) + 1
+                if played % report_every == 0:
+                    seconds = time.perf_counter() - start
+                    print(f"{skipped + played}/{games} games, {played / seconds:.2f} games/s, {plies / seconds:.1f} plies/s")
+    writer.finish_chunk()
+
+    seconds = time.perf_counter() - start
+    return {
+        "games": played,
+        "skipped": skipped,
+        "plies": plies,
+        "results": results,
+        "seconds": round(seconds, 3),
+        "games_per_second": round(played / seconds, 3) if seconds > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play engine games against each other and record them")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--output", required=True, help="directory for the chunk files and the manifest")
+    parser.add_argument("--workers", type=int, help="defaults to the number of CPUs")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--random-plies", type=int, default=4, help="random moves at the start of every game")
+    parser.add_argument("--max-plies", type=int, default=400, help="games longer than this are adjudicated drawn")
+    for side in ("white", "black"):
+        parser.add_argument(f"--{side}-ms", type=int, default=100, help=f"time per move for {side}")
+        parser.add_argument(f"--{side}-depth", type=int, default=64)
+        parser.add_argument(f"--{side}-hash-mb", type=float, default=16)
+    parser.add_argument("--book", help="opening book for both engines")
+    parser.add_argument("--tablebase", help="tablebase directory for both engines")
+    args = parser.parse_args(argv)
+
+    white = EngineConfig(args.white_ms, args.white_depth, args.white_hash_mb, args.book, args.tablebase)
+    black = EngineConfig(args.black_ms, args.black_depth, args.black_hash_mb, args.book, args.tablebase)
+    report = run(args.games, args.output, white, black, args.workers, args.chunk_size, args.seed,
+                 args.random_plies, args.max_plies)
+    print(f"{report['games']} games ({report['skipped']} resumed) in {report['seconds']:.1f}s, "
+          f"{report['games_per_second']:.2f} games/s, results {report['results']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+
+Asyncio game server hosting many chess games on one event loop.
+
+Every game is a coroutine (run_game) that awaits moves from its two AsyncPlayers, so a game
+waiting for a move costs nothing but a suspended coroutine. Clients connect over TCP or a Unix
+socket and speak a line protocol. One connection can play any number of games at once, every
+game message carries the game id:
+
+    NEW <white|black> [engine_ms]   start a game, against the engine if engine_ms is given
+                                    -> GAME <id> <color>
+    JOIN <id>                       take the free seat of a game started without an engine
+                                    -> GAME <id> <color>
+    MOVE <id> <uci>                 play a move            -> OK <id> <uci> | ERROR <id> <reason>
+    STATS [id]                      server or game metrics -> STATS <json>
+    QUIT                            close the connection, resigning its games
+
+The server pushes `MOVE <id> <uci>` when the opponent moved and `END <id> <result> <reason>`
+when a game is over (`END <id> * aborted` when it could not go on, like an engine failure).
+
+Usage (from the repository root):
+    python -m Designs.Chess.Server --port 7000
+    python -m Designs.Chess.Server --unix /tmp/chess.sock --engine-workers 4 --book book.bin
+
+With --profile the server times move validation, moves and move generation in its own process
+(see Instrumentation.py), and the engine searches in the executor processes, which send their
+figures back with every move. STATS adds them under "profile": the engine searches of that
+game for `STATS <id>`, everything for the server STATS.
+
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Designs.Chess.models.AsyncPlayer import QueuePlayer, AsyncEnginePlayer
+from Designs.Chess.models.GameManager import GameManager
+from Designs.Chess.models.Instrumentation import Metrics, install, uninstall
+from Designs.Chess.models.Move import Move
+
+
+class GameMetrics:
+    __slots__ = ("started", "finished", "moves", "wait_seconds", "processing_seconds", "max_processing_seconds",
+                 "profile")
+
+    def __init__(self, profile: bool = False):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.moves = 0
+        # Time spent waiting for players to move, and time the server spent handling the moves
+        self.wait_seconds = 0.0
+        self.processing_seconds = 0.0
+        self.max_processing_seconds = 0.0
+        # Engine search figures of this game, sent back by the executor processes
+        self.profile = Metrics() if profile else None
+
+    def record_move(self, wait: float, processing: float):
+        self.moves += 1
+        self.wait_seconds += wait
+        self.processing_seconds += processing
+        if processing > self.max_processing_seconds:
+            self.max_processing_seconds = processing
+
+    def snapshot(self) -> dict:
+        duration = (self.finished or time.perf_counter()) - self.started
+        snapshot = {
+            "moves": self.moves,
+            "duration_seconds": round(duration, 6),
+            "moves_per_second": round(self.moves / duration, 3) if duration > 0 else 0.0,
+            "mean_wait_ms": round(1000 * self.wait_seconds / self.moves, 3) if self.moves else 0.0,
+            "mean_processing_ms": round(1000 * self.processing_seconds / self.moves, 3) if self.moves else 0.0,
+            "max_processing_ms": round(1000 * self.max_processing_seconds, 3),
+        }
+        if self.profile is not None:
+            snapshot["profile"] = self.profile.snapshot()
+        return snapshot
+
+
+class ServerMetrics:
+    def __init__(self, profile: Metrics = None):
+        # Figures measured in the server process, None when not profiling
+        self.profile = profile
+        self.engine_profile = Metrics()
+        self.started = time.perf_counter()
+        self.games_started = 0
+        self.games_finished = 0
+        self.moves = 0
+        self.processing_seconds = 0.0
+        self.games = {}
+
+    def game_started(self, game_id) -> GameMetrics:
+        self.games_started += 1
+        metrics = self.games[game_id] = GameMetrics(self.profile is not None)
+        return metrics
+
+    def game_finished(self, game_id):
+        self.games_finished += 1
+        metrics = self.games.pop(game_id)
+        metrics.finished = time.perf_counter()
+        self.moves += metrics.moves
+        self.processing_seconds += metrics.processing_seconds
+        if metrics.profile is not None:
+            self.engine_profile.merge(metrics.profile)
+        return metrics
+
+    def snapshot(self) -> dict:
+        uptime = time.perf_counter() - self.started
+        moves = self.moves + sum(game.moves for game in self.games.values())
+        processing = self.processing_seconds + sum(game.processing_seconds for game in self.games.values())
+        snapshot = {
+            "uptime_seconds": round(uptime, 3),
+            "active_games": len(self.games),
+            "games_started": self.games_started,
+            "games_finished": self.games_finished,
+            "moves": moves,
+            "moves_per_second": round(moves / uptime, 3) if uptime > 0 else 0.0,
+            "games_per_second": round(self.games_finished / uptime, 3) if uptime > 0 else 0.0,
+            "mean_processing_ms": round(1000 * processing / moves, 3) if moves else 0.0,
+        }
+        if self.profile is not None:
+            total = Metrics()
+            total.started = self.profile.started
+            total.merge(self.profile)
+            total.merge(self.engine_profile)
+            for game in self.games.values():
+                total.merge(game.profile)
+            snapshot["profile"] = total.snapshot()
+        return snapshot
+
+
+async def run_game(game_id, board, metrics: GameMetrics) -> tuple:
+    players = (board.player1, board.player2)
+    try:
+        while True:
+            outcome = board.game_result()
+            if outcome is not None:
+                break
+            player = board.player1 if board.isWhiteTurn else board.player2
+            asked = time.perf_counter()
+            move = await player.get_move(board)
+            received = time.perf_counter()
+            if move is None:
+                outcome = ("0-1" if board.isWhiteTurn else "1-0"), "resignation"
+                break
+            if not board.validate_move(move, player):
+                await player.notify(f"ERROR {game_id} illegal move {move.uci()}")
+                continue
+            board.make_move(move, player)
+            await player.notify(f"OK {game_id} {move.uci()}")
+            opponent = board.player1 if board.isWhiteTurn else board.player2
+            await opponent.notify(f"MOVE {game_id} {move.uci()}")
+            metrics.record_move(received - asked, time.perf_counter() - received)
+    except Exception:
+        # An engine or server failure ends the game, the players still hear about it
+        outcome = "*", "aborted"
+
+    for player in players:
+        await player.notify(f"END {game_id} {outcome[0]} {outcome[1]}")
+    return outcome
+
+
+class GameServer:
+    def __init__(self, engine_workers: int = 1, engine_hash_mb: float = 16, engine_book: str = None,
+                 profile: bool = False):
+        self.manager = GameManager()
+        self.profile = install() if profile else None
+        self.metrics = ServerMetrics(self.profile)
+        self.executor = ProcessPoolExecutor(engine_workers)
+        self.engine_hash_mb = engine_hash_mb
+        self.engine_book = engine_book
+        self.tasks = {}
+        self._open_seats = {}
+        self._server = None
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 7000):
+        self._server = await asyncio.start_server(self.handle_connection, host, port)
+        return self._server
+
+    async def start_unix(self, path: str):
+        self._server = await asyncio.start_unix_server(self.handle_connection, path)
+        return self._server
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        for task in self.tasks.values():
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+        self.executor.shutdown(cancel_futures=True)
+        if self.profile is not None:
+            uninstall()
+
+    def _start_game(self, game_id, white, black):
+        board = self.manager.get_board(game_id)
+        board.player1, board.player2 = white, black
+        metrics = self.metrics.game_started(game_id)
+        for player in (white, black):
+            if isinstance(player, AsyncEnginePlayer):
+                player.profile = metrics.profile
+        task = asyncio.create_task(run_game(game_id, board, metrics))
+        self.tasks[game_id] = task
+        task.add_done_callback(lambda _: self._finish_game(game_id))
+
+    def _finish_game(self, game_id):
+        self.tasks.pop(game_id, None)
+        self._open_seats.pop(game_id, None)
+        self.metrics.game_finished(game_id)
+        self.manager.end_game(game_id)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        seats = {}
+
+        async def send(message: str):
+            # Games outlive their connection long enough to report the resignation, drop those messages
+            if writer.is_closing():
+                return
+            writer.write(message.encode() + b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.decode().split()
+                if not parts:
+                    continue
+                command = parts[0].upper()
+                if command == "QUIT":
+                    break
+                elif command == "NEW" and len(parts) >= 2 and parts[1] in ("white", "black"):
+                    isWhite = parts[1] == "white"
+                    engine_ms = None
+                    if len(parts) >= 3:
+                        engine_ms = int(parts[2]) if parts[2].isdigit() else 0
+                        if engine_ms <= 0:
+                            await send(f"ERROR engine_ms must be a positive number of milliseconds: {parts[2]}")
+                            continue
+                    game_id = self.manager.create_game(None, None)
+                    seats[game_id] = QueuePlayer(f"client-{game_id}", isWhite, send)
+                    await send(f"GAME {game_id} {parts[1]}")
+                    if engine_ms is not None:
+                        engine = AsyncEnginePlayer("engine", not isWhite, self.executor, engine_ms,
+                                                   self.engine_hash_mb, self.engine_book)
+                        self._seat_players(game_id, seats[game_id], engine)
+                    else:
+                        self._open_seats[game_id] = seats[game_id]
+                elif command == "JOIN" and len(parts) == 2 and self._parse_id(parts[1]) in seats:
+                    # One connection plays one color of a game, its MOVEs would reach only one seat
+                    await send(f"ERROR {parts[1]} already playing this game")
+                elif command == "JOIN" and len(parts) == 2 and self._parse_id(parts[1]) in self._open_seats:
+                    game_id = self._parse_id(parts[1])
+                    other = self._open_seats.pop(game_id)
+                    seats[game_id] = QueuePlayer(f"client-{game_id}", not other.isWhite, send)
+                    await send(f"GAME {game_id} {'white' if seats[game_id].isWhite else 'black'}")
+                    self._seat_players(game_id, other, seats[game_id])
+                elif command == "MOVE" and len(parts) == 3 and self._parse_id(parts[1]) in seats:
+                    game_id = self._parse_id(parts[1])
+                    try:
+                        move = Move.from_uci(parts[2])
+                    except (ValueError, IndexError, KeyError):
+                        await send(f"ERROR {game_id} cannot parse move {parts[2]}")
+                        continue
+                    if game_id not in self.tasks:
+                        await send(f"ERROR {game_id} game is not running")
+                        continue
+                    seats[game_id].moves.put_nowait(move)
+                elif command == "STATS":
+                    if len(parts) == 2 and self._parse_id(parts[1]) in self.metrics.games:
+                        stats = self.metrics.games[self._parse_id(parts[1])].snapshot()
+                    else:
+                        stats = self.metrics.snapshot()
+                    await send("STATS " + json.dumps(stats))
+                else:
+                    await send("ERROR unknown command " + line.decode().strip())
+        except ConnectionError:
+            pass
+        finally:
+            # Leaving the connection resigns every game it is still playing
+            for game_id, player in seats.items():
+                if game_id in self.tasks:
+                    player.moves.put_nowait(None)
+                elif game_id in self._open_seats:
+                    self._open_seats.pop(game_id)
+                    self.manager.end_game(game_id)
+            writer.close()
+
+    def _seat_players(self, game_id, first, second):
+        white, black = (first, second) if first.isWhite else (second, first)
+        self._start_game(game_id, white, black)
+
+    @staticmethod
+    def _parse_id(text: str):
+        return int(text) if text.isdigit() else text
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asyncio chess game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7000)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--engine-workers", type=int, default=1)
+    parser.add_argument("--engine-hash-mb", type=float, default=16)
+    parser.add_argument("--book", help="opening book for the engine, built with Designs.Chess.Book")
+    parser.add_argument("--profile", action="store_true", help="time moves, move generation and engine searches, reported by STATS")
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.engine_workers, args.engine_hash_mb, args.book, args.profile)
+    if args.unix:
+        await server.start_unix(args.unix)
+    else:
+        await server.start_tcp(args.host, args.port)
+    try:
+        await server.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+
+Async players for games hosted on an asyncio event loop (see Server.py).
+
+Board.play blocks on Player.get_move, which ties up a whole thread per game. An AsyncPlayer's
+get_move is a coroutine instead, so one event loop can wait on thousands of players at once.
+
+- QueuePlayer gets its moves from an asyncio.Queue, which is how moves typed by a remote
+  client reach a game.
+- AsyncEnginePlayer runs the search in an executor (a process pool, so the engine does not
+  hold the event loop's GIL) and awaits the result. Its opening book is mapped once per executor
+  process, all of them sharing the same pages. Given a Metrics (`profile`), every search is
+  profiled in the executor process and its figures are merged into it (see Instrumentation.py).
+
+Players are also notified of every move through `notify`. This is the Observer Pattern mentioned
+in Board.py: the game publishes moves and the players decide what to do with them.
+
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+
+from Designs.Chess.models.Instrumentation import Metrics, profiled
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.OpeningBook import OpeningBook
+from Designs.Chess.models.Player import Player
+from Designs.Chess.models.Search import Search
+from Designs.Chess.models.TranspositionTable import TranspositionTable
+
+_engine_search = None
+_engine_books = {}
+
+
+def _engine_move(board, time_limit_ms: int, hash_mb: float, book: str = None, profile: bool = False):
+    # Runs in an executor process, the search, its table and the books are kept between moves.
+    # -> (move code or None, Metrics of the search when profiling)
+    global _engine_search
+    if book is not None:
+        if book not in _engine_books:
+            _engine_books[book] = OpeningBook(book)
+        move = _engine_books[book].pick(board)
+        if move is not None:
+            return move.encode(), None
+    if _engine_search is None:
+        _engine_search = Search(transposition_table=TranspositionTable(hash_mb) if hash_mb else None)
+    metrics = None
+    if profile:
+        with profiled() as metrics:
+            move = _engine_search.best_move(board, time_limit_ms)
+    else:
+        move = _engine_search.best_move(board, time_limit_ms)
+    return None if move is None else move.encode(), metrics
+
+
+class AsyncPlayer(Player, ABC):
+    @abstractmethod
+    async def get_move(self, board) -> Move:
+        pass
+
+    async def notify(self, message: str):
+        pass
+
+
+class QueuePlayer(AsyncPlayer):
+    def __init__(self, name, isWhite, send=None):
+        super().__init__(name, isWhite)
+        self.moves = asyncio.Queue()
+        self._send = send
+
+    async def get_move(self, board) -> Move:
+        return await self.moves.get()
+
+    async def notify(self, message: str):
+        if self._send is not None:
+            await self._send(message)
+
+
+class AsyncEnginePlayer(AsyncPlayer):
+    def __init__(self, name, isWhite, executor, time_limit_ms: int = 1000, hash_mb: float = 16, book: str = None,
+                 profile: Metrics = None):
+        super().__init__(name, isWhite)
+        self.executor = executor
+        self.time_limit_ms = time_limit_ms
+        self.hash_mb = hash_mb
+        self.book = book
+        self.profile = profile
+
+    async def get_move(self, board) -> Move:
+        loop = asyncio.get_running_loop()
+        code, metrics = await loop.run_in_executor(self.executor, _engine_move, board.copy(), self.time_limit_ms,
+                                                   self.hash_mb, self.book, self.profile is not None)
+        if metrics is not None:
+            self.profile.merge(metrics)
+        return None if code is None else Move.decode(code)
@@ -0,0 +1,126 @@
+"""
+
+Precomputed attack tables used by the movement strategies and the move generator.
+
+Everything here is computed once at import time so that move generation and validation
+are table lookups instead of per-call geometry:
+
+- KNIGHT_ATTACKS / KING_ATTACKS: one bitboard of target squares per square.
+- PAWN_ATTACKS: capture targets per color and square (white pawns move towards row 0).
+- Sliding pieces use occupancy-indexed tables, the same idea as magic bitboards:
+  for every square we keep the mask of squares whose occupancy matters (the ray without its
+  last square) and a table from every subset of that mask to the resulting attack set.
+  A Python dict keyed by the masked occupancy plays the role of the magic multiply-and-shift.
+- BETWEEN: the squares strictly between two squares on a common line, used for pins and for
+  the squares that block a check.
+
+Squares follow the cell grid: square = x * 8 + y.
+
+"""
+
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+KNIGHT_OFFSETS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_OFFSETS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def lsb(bitboard: int) -> int:
+    return (bitboard & -bitboard).bit_length() - 1
+
+
+def squares(bitboard: int):
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+def _on_board(x: int, y: int) -> bool:
+    return 0 <= x < 8 and 0 <= y < 8
+
+
+def _leaper_attacks(offsets):
+    table = []
+    for square in range(64):
+        x, y = divmod(square, 8)
+        attacks = 0
+        for dx, dy in offsets:
+            if _on_board(x + dx, y + dy):
+                attacks |= 1 << ((x + dx) * 8 + y + dy)
+        table.append(attacks)
+    return table
+
+
+def _slide(square: int, occupied: int, directions) -> int:
+    x, y = divmod(square, 8)
+    attacks = 0
+    for dx, dy in directions:
+        nx, ny = x + dx, y + dy
+        while _on_board(nx, ny):
+            bit = 1 << (nx * 8 + ny)
+            attacks |= bit
+            if occupied & bit:
+                break
+            nx, ny = nx + dx, ny + dy
+    return attacks
+
+
+def _relevant_mask(square: int, directions) -> int:
+    x, y = divmod(square, 8)
+    mask = 0
+    for dx, dy in directions:
+        nx, ny = x + dx, y + dy
+        while _on_board(nx + dx, ny + dy):
+            mask |= 1 << (nx * 8 + ny)
+            nx, ny = nx + dx, ny + dy
+    return mask
+
+
+def _slider_tables(directions):
+    masks = []
+    tables = []
+    for square in range(64):
+        mask = _relevant_mask(square, directions)
+        table = {}
+        # Carry-rippler: walks every subset of the mask
+        subset = 0
+        while True:
+            table[subset] = _slide(square, subset, directions)
+            subset = (subset - mask) & mask
+            if subset == 0:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+KNIGHT_ATTACKS = _leaper_attacks(KNIGHT_OFFSETS)
+KING_ATTACKS = _leaper_attacks(KING_OFFSETS)
+PAWN_ATTACKS = (_leaper_attacks(((-1, -1), (-1, 1))), _leaper_attacks(((1, -1), (1, 1))))
+
+ROOK_MASKS, ROOK_TABLE = _slider_tables(ROOK_DIRECTIONS)
+BISHOP_MASKS, BISHOP_TABLE = _slider_tables(BISHOP_DIRECTIONS)
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    return ROOK_TABLE[square][occupied & ROOK_MASKS[square]]
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    return BISHOP_TABLE[square][occupied & BISHOP_MASKS[square]]
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    return ROOK_TABLE[square][occupied & ROOK_MASKS[square]] | BISHOP_TABLE[square][occupied & BISHOP_MASKS[square]]
+
+
+def _between(a: int, b: int) -> int:
+    # Seen from both ends with the other end as the only blocker, the rays meet between the two
+    if rook_attacks(a, 0) >> b & 1:
+        return rook_attacks(a, 1 << b) & rook_attacks(b, 1 << a)
+    if bishop_attacks(a, 0) >> b & 1:
+        return bishop_attacks(a, 1 << b) & bishop_attacks(b, 1 << a)
+    return 0
+
+
+BETWEEN = [[_between(a, b) for b in range(64)] for a in range(64)]
@@ -0,0 +1,150 @@
+"""
+
+Vectorized static evaluation of many positions at once, for evaluation tuning.
+
+Evaluation.evaluate scores one board at a time in a Python loop, which is what the search needs.
+Tuning jobs score millions of positions per iteration instead, so here positions are encoded as
+one NumPy array of shape (N, 12, 64): plane color * 6 + kind has a 1 on every square holding
+that piece, the same order as BitBoard.pieces. Every feature is then computed for the whole
+batch with array operations:
+
+- material: piece count difference per kind (White minus Black)
+- piece-square tables: the positional part of Evaluation's tables, one matrix product
+- mobility: squares attacked per kind that are not occupied by own pieces. Knights go through a
+  64x64 attack matrix; bishops, rooks and queens use Kogge-Stone fills on the uint64 bitboards,
+  one per direction (the rays of two pieces in the same direction never overlap, so counting
+  the filled squares counts every piece's moves)
+
+The score is the dot product of the features with a weight vector (material values, mobility
+weights, 1 for the tables), so tuning only has to change the weights. With zero mobility weights
+it equals Evaluation.evaluate. Scores are from White's point of view, or from the side to move
+when white_to_move is given.
+
+Requires NumPy (`pip install numpy`), the only third-party package the chess code uses. Nothing
+else imports this module, so the game, the engine and the server run without it.
+
+"""
+
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("BatchEvaluation needs NumPy: pip install numpy") from error
+
+from Designs.Chess.models.AttackTables import KNIGHT_ATTACKS
+from Designs.Chess.models.BitBoard import KNIGHT, BISHOP, ROOK, QUEEN
+from Designs.Chess.models.Evaluation import PIECE_VALUES, PIECE_SQUARE_TABLES
+from Designs.Chess.models.Fen import parse_fen
+
+# Centipawns per attacked square, by kind
+MOBILITY_WEIGHTS = (0, 4, 3, 2, 1, 0)
+FEATURES = 13
+WEIGHTS = np.array(PIECE_VALUES + MOBILITY_WEIGHTS + (1,), dtype=np.float32)
+
+# Positional part of the piece-square tables, signed so White is positive
+PST = np.array([PIECE_SQUARE_TABLES[kind] for kind in range(6)]
+               + [[-PIECE_SQUARE_TABLES[kind][square ^ 56] for square in range(64)] for kind in range(6)],
+               dtype=np.float32).reshape(768)
+
+KNIGHT_MATRIX = np.array([[KNIGHT_ATTACKS[source] >> target & 1 for target in range(64)] for source in range(64)],
+                         dtype=np.float32)
+
+ALL = np.uint64(0xFFFFFFFFFFFFFFFF)
+NOT_FILE_A = np.uint64(0xFEFEFEFEFEFEFEFE)
+NOT_FILE_H = np.uint64(0x7F7F7F7F7F7F7F7F)
+# (square step, squares a step may land on without wrapping around the board)
+ROOK_STEPS = ((8, ALL), (-8, ALL), (1, NOT_FILE_A), (-1, NOT_FILE_H))
+BISHOP_STEPS = ((9, NOT_FILE_A), (7, NOT_FILE_H), (-7, NOT_FILE_A), (-9, NOT_FILE_H))
+SLIDERS = ((BISHOP, BISHOP_STEPS), (ROOK, ROOK_STEPS), (QUEEN, ROOK_STEPS + BISHOP_STEPS))
+
+
+def _planes(bitboards) -> np.ndarray:
+    bits = np.array(bitboards, dtype="<u8").reshape(-1, 12)
+    return np.unpackbits(bits.view(np.uint8).reshape(-1, 12, 8), axis=2, bitorder="little")
+
+
+def encode_boards(boards):
+    # -> (planes (N, 12, 64) uint8, white_to_move (N,) bool)
+    boards = list(boards)
+    return (_planes([board.bitboard.pieces for board in boards]),
+            np.array([board.isWhiteTurn for board in boards], dtype=bool))
+
+
+def encode_fens(fens):
+    parsed = [parse_fen(fen) for fen in fens]
+    return _planes([fields[0] for fields in parsed]), np.array([fields[1] for fields in parsed], dtype=bool)
+
+
+def _shift(bits: np.ndarray, step: int) -> np.ndarray:
+    return bits << np.uint64(step) if step > 0 else bits >> np.uint64(-step)
+
+
+def _ray_attacks(pieces: np.ndarray, empty: np.ndarray, step: int, mask: np.uint64) -> np.ndarray:
+    # Kogge-Stone fill along one direction: the rays stop at the first occupied square, which is attacked
+    empty = empty & mask
+    for distance in (1, 2, 4):
+        pieces = pieces | (empty & _shift(pieces, step * distance))
+        empty = empty & _shift(empty, step * distance)
+    return _shift(pieces, step) & mask
+
+
+def _unpack(bits: np.ndarray) -> np.ndarray:
+    # (N,) uint64 bitboards -> (N, 64) planes
+    bits = np.ascontiguousarray(bits, dtype="<u8")
+    return np.unpackbits(bits.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).astype(np.int32)
+    return _unpack(bits).sum(axis=1, dtype=np.int32)
+
+
+def _mobility(planes: np.ndarray) -> np.ndarray:
+    count = len(planes)
+    bits = np.packbits(planes, axis=2, bitorder="little").view("<u8").reshape(count, 12)
+    own = (np.bitwise_or.reduce(bits[:, :6], axis=1), np.bitwise_or.reduce(bits[:, 6:], axis=1))
+    empty = ~(own[0] | own[1])
+    mobility = np.zeros((count, 6), dtype=np.float32)
+    for color, sign in ((0, 1), (1, -1)):
+        offset = color * 6
+        not_own = ~own[color]
+        # Knight attackers of every square, kept where the square is not an own piece
+        knights = planes[:, offset + KNIGHT].astype(np.float32) @ KNIGHT_MATRIX
+        mobility[:, KNIGHT] += sign * np.einsum("ij,ij->i", knights, _unpack(not_own).astype(np.float32))
+        for kind, steps in SLIDERS:
+            pieces = bits[:, offset + kind]
+            for step, mask in steps:
+                mobility[:, kind] += sign * _popcount(_ray_attacks(pieces, empty, step, mask) & not_own)
+    return mobility
+
+
+def features(planes: np.ndarray) -> np.ndarray:
+    # -> (N, 13) float32: material difference (6), mobility difference (6), piece-square tables (1)
+    planes = np.asarray(planes, dtype=np.uint8)
+    count = len(planes)
+    pieces = planes.sum(axis=2, dtype=np.int32)
+    material = (pieces[:, :6] - pieces[:, 6:]).astype(np.float32)
+    positional = planes.reshape(count, 768).astype(np.float32) @ PST
+    return np.concatenate([material, _mobility(planes), positional[:, None]], axis=1)
+
+
+def evaluate_batch(planes: np.ndarray, white_to_move: np.ndarray = None, weights: np.ndarray = None) -> np.ndarray:
+    scores = np.rint(features(planes) @ (WEIGHTS if weights is None else weights)).astype(np.int32)
+    if white_to_move is None:
+        return scores
+    return np.where(white_to_move, scores, -scores)
+
+
+def evaluate_fens(fens, weights: np.ndarray = None, batch_size: int = 65536) -> np.ndarray:
+    # Scores from the side to move for any number of FENs, encoding batch_size positions at a time
+    fens = iter(fens)
+    results = []
+    while True:
+        batch = list(islice(fens, batch_size))
+        if not batch:
+            break
+        planes, white_to_move = encode_fens(batch)
+        results.append(evaluate_batch(planes, white_to_move, weights))
+    return np.concatenate(results) if results else np.zeros(0, dtype=np.int32)
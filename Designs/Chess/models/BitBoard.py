@@ -0,0 +1,110 @@
+"""
+
+BitBoard is an alternative representation of the chess board.
+
+Instead of an 8x8 grid of Cell objects each holding a Piece instance, the board is stored as
+twelve 64-bit integers, one per (piece type, color), plus occupancy masks for each color and for
+the whole board. Bit n of an integer is set when square n holds that piece.
+
+Squares are numbered the same way the cell grid is indexed: square = x * 8 + y,
+so square 0 is cells[0][0] (a8) and square 63 is cells[7][7] (h1).
+
+Copying a BitBoard copies a handful of integers, and scanning for a piece type is a bit operation,
+which makes it much cheaper than the cell grid for analysis code that copies and scans boards a lot.
+
+"""
+
+from Designs.Chess.models import Piece
+
+WHITE = 0
+BLACK = 1
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+# Order of the twelve piece bitboards: index = color * 6 + kind
+PIECE_TYPES = (
+    Piece.PieceType.PAWN,
+    Piece.PieceType.KNIGHT,
+    Piece.PieceType.BISHOP,
+    Piece.PieceType.ROOK,
+    Piece.PieceType.QUEEN,
+    Piece.PieceType.KING,
+)
+KIND = {piece_type: kind for kind, piece_type in enumerate(PIECE_TYPES)}
+
+
+def square_index(x: int, y: int) -> int:
+    return x * 8 + y
+
+
+class BitBoard:
+    __slots__ = ("pieces", "occupancy", "occupied")
+
+    def __init__(self):
+        self.pieces = [0] * 12
+        self.occupancy = [0, 0]
+        self.occupied = 0
+
+    def put(self, square: int, kind: int, color: int):
+        bit = 1 << square
+        self.pieces[color * 6 + kind] |= bit
+        self.occupancy[color] |= bit
+        self.occupied |= bit
+
+    def remove(self, square: int):
+        bit = 1 << square
+        if not self.occupied & bit:
+            return None
+        color = WHITE if self.occupancy[WHITE] & bit else BLACK
+        for kind in range(6):
+            if self.pieces[color * 6 + kind] & bit:
+                self.pieces[color * 6 + kind] ^= bit
+                self.occupancy[color] ^= bit
+                self.occupied ^= bit
+                return kind, color
+
+    def piece_at(self, square: int):
+        bit = 1 << square
+        if not self.occupied & bit:
+            return None
+        color = WHITE if self.occupancy[WHITE] & bit else BLACK
+        for kind in range(6):
+            if self.pieces[color * 6 + kind] & bit:
+                return kind, color
+
+    def count(self, kind: int, color: int) -> int:
+        return bin(self.pieces[color * 6 + kind]).count("1")
+
+    def copy(self) -> "BitBoard":
+        clone = BitBoard.__new__(BitBoard)
+        clone.pieces = self.pieces[:]
+        clone.occupancy = self.occupancy[:]
+        clone.occupied = self.occupied
+        return clone
+
+    def get_piece(self, x: int, y: int):
+        found = self.piece_at(square_index(x, y))
+        if found is None:
+            return None
+        kind, color = found
+        return Piece.PieceFactory.create_piece(PIECE_TYPES[kind], color == WHITE)
+
+    def set_piece(self, x: int, y: int, piece):
+        square = square_index(x, y)
+        self.remove(square)
+        if piece is not None:
+            self.put(square, KIND[piece.piece_type], WHITE if piece.isWhite else BLACK)
+
+    @classmethod
+    def from_cells(cls, cells) -> "BitBoard":
+        bitboard = cls()
+        for row in cells:
+            for cell in row:
+                if cell.piece is not None:
+                    bitboard.set_piece(cell.x, cell.y, cell.piece)
+        return bitboard
+
+    def to_cells(self):
+        # Imported here because Board imports this module
+        from Designs.Chess.models.Board import Cell
+        return [[Cell(x, y, self.get_piece(x, y)) for y in range(8)] for x in range(8)]
@@ -10,85 +10,440 @@ The Board class can have a state which can be either Player1TurnState or Player2
 Each state will handle the move accordingly and switch the state after a valid move.
 But for simplicity, we are skipping that here.
 
-Used Singleton Pattern to ensure only one instance of the Board exists during a game.
+Board is a plain per-game object. It used to be a Singleton, but a process that hosts many games
+needs one board per game, and a second game would otherwise silently reuse the first game's board.
+GameManager (see GameManager.py) keeps the boards of all running games keyed by game id.
+
+The pieces can be stored either as the 8x8 grid of Cell objects or as a BitBoard (see BitBoard.py).
+The representation is chosen when the Board is created and the rest of the Board API stays the same:
+get_piece / set_piece work on both, and `cells` is built from the bitboard on demand when the
+bitboard representation is used (mutating that grid does not change the board).
+The move generator always works on the bitboard, so with the cell representation the board
+keeps the bitboard in sync next to the grid.
+
+validate_move checks a move against the legal moves of the piece on its start square, and
+make_move applies it, including castling, en passant and promotion.
+
+A Board can also start from any position given as FEN (`Board(..., fen=...)` or set_fen),
+which fills the bitboards in one pass over the string, and fen() writes the position back out.
+
+Every position has a Zobrist key (see Zobrist.py) kept in `hash`. make_move and unmake_move
+update it with a few XORs, and board_history holds the key of every position of the game
+together with a count per key, so a threefold repetition check is a dictionary lookup.
+
+make_move pushes a small UndoRecord onto a stack instead of copying the board, and unmake_move
+pops it to restore the previous position. Search and validation explore moves in place this way.
+
+make_move also keeps `checkers`, the pieces giving check to the side to move, which comes from a
+few attack lookups at the king square and is restored for free on unmake. boardstate (ACTIVE,
+CHECK, CHECKMATE, STALEMATE) is worked out from it when first asked for after a move, with the
+pinned pieces and a legal move search that stops at the first move found (see
+MoveGenerator.has_legal_move), instead of generating every move. Search never asks for it, so
+it costs nothing in the search tree.
 
 """
 
 from enum import Enum
 from Designs.Chess.models import Piece
+from Designs.Chess.models.BitBoard import BitBoard, WHITE, BLACK, PAWN, ROOK, KING, PIECE_TYPES
+from Designs.Chess.models.Fen import parse_fen, format_fen, FenError
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.MoveGenerator import (
+    generate_moves, checkers, pinned_pieces, has_legal_move, is_square_attacked, king_square,
+    ALL_SQUARES, ALL_CASTLING, CASTLING_MASK, CASTLING_ROOKS,
+)
+from Designs.Chess.models.Zobrist import PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, en_passant_key, hash_position
 from Designs.Chess.models.Player import Player
 
 
 class Cell:
+    __slots__ = ("x", "y", "piece")
+
     def __init__(self, x: int, y: int, piece: Piece = None):
         self.x = x
         self.y = y
         self.piece = piece
 
+class UndoRecord:
+    # Only what make_move destroys: the rest (rook move, en passant square) is derived on unmake
+    __slots__ = ("move", "moved_kind", "captured_kind", "castling_rights", "en_passant",
+                 "halfmove_clock", "hash_delta", "checkers")
+
+    def __init__(self, move, moved_kind: int, captured_kind, castling_rights: int, en_passant,
+                 halfmove_clock: int, hash_delta: int, checkers: int):
+        self.move = move
+        self.moved_kind = moved_kind
+        self.captured_kind = captured_kind
+        self.castling_rights = castling_rights
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+        self.hash_delta = hash_delta
+        self.checkers = checkers
+
 class BoardState(Enum):
     ACTIVE = "Active"
     CHECK = "Check"
     CHECKMATE = "Checkmate"
     STALEMATE = "Stalemate"
 
-class Board:
-    _instance = None
-
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+class BoardRepresentation(Enum):
+    CELLS = "Cells"
+    BITBOARD = "BitBoard"
 
-    def __init__(self, player1: Player, player2: Player):
-        self.cells = [[Cell(x, y) for y in range(8)] for x in range(8)]
+class Board:
+    def __init__(self, player1: Player, player2: Player, representation: BoardRepresentation = BoardRepresentation.CELLS,
+                 fen: str = None):
+        self.representation = representation
+        self._cells = None
+        self.bitboard = None
         self.player1 = player1
         self.player2 = player2
-        self.isWhiteTurn = True
-        self.initialize()
-        self.board_history = []
-        self.boardstate = BoardState.ACTIVE
-    
+        self.checkers = 0
+        self._boardstate = None
+        if fen is None:
+            self.initialize()
+        else:
+            self.set_fen(fen)
+
+    @property
+    def boardstate(self) -> BoardState:
+        if self._boardstate is None:
+            color = self.side_to_move()
+            if has_legal_move(self.bitboard, color, self.en_passant, self.checkers,
+                              pinned_pieces(self.bitboard, color)):
+                self._boardstate = BoardState.CHECK if self.checkers else BoardState.ACTIVE
+            else:
+                self._boardstate = BoardState.CHECKMATE if self.checkers else BoardState.STALEMATE
+        return self._boardstate
+
+    @boardstate.setter
+    def boardstate(self, state: BoardState):
+        self._boardstate = state
+
+    def is_game_over(self) -> bool:
+        return self.boardstate in (BoardState.CHECKMATE, BoardState.STALEMATE)
+
+    @property
+    def cells(self):
+        if self.representation == BoardRepresentation.BITBOARD:
+            return self.bitboard.to_cells()
+        return self._cells
+
+    def get_piece(self, x: int, y: int):
+        if self.representation == BoardRepresentation.BITBOARD:
+            return self.bitboard.get_piece(x, y)
+        return self._cells[x][y].piece
+
+    def set_piece(self, x: int, y: int, piece):
+        square = x * 8 + y
+        old = self.bitboard.remove(square)
+        if old is not None:
+            self.hash ^= PIECE_KEYS[old[1] * 6 + old[0]][square]
+        self.bitboard.set_piece(x, y, piece)
+        if piece is not None:
+            kind, color = self.bitboard.piece_at(square)
+            self.hash ^= PIECE_KEYS[color * 6 + kind][square]
+        if self._cells is not None:
+            self._cells[x][y].piece = piece
+        # A position being set up piece by piece may not have its king yet
+        color = self.side_to_move()
+        self.checkers = checkers(self.bitboard, color) if self.bitboard.pieces[color * 6 + KING] else 0
+        self._boardstate = None
+
+    def to_bitboard(self) -> BitBoard:
+        return self.bitboard.copy()
+
+    def copy(self) -> "Board":
+        # Skips __init__, which would set up the start position only to overwrite it
+        clone = Board.__new__(Board)
+        clone.__dict__.update(self.__dict__)
+        clone.bitboard = self.bitboard.copy()
+        if self._cells is not None:
+            clone._cells = [[Cell(cell.x, cell.y, cell.piece) for cell in row] for row in self._cells]
+        clone.board_history = self.board_history[:]
+        clone.position_counts = self.position_counts.copy()
+        clone._undo_stack = self._undo_stack[:]
+        return clone
+
+    def __getstate__(self):
+        # Boards are pickled to hand positions to worker processes, players stay behind
+        state = self.__dict__.copy()
+        state["player1"] = state["player2"] = None
+        return state
+
+    def load_from(self, other: "Board"):
+        # Takes over the position of another board, reusing this board's objects where possible
+        self.bitboard.pieces[:] = other.bitboard.pieces
+        self.bitboard.occupancy[:] = other.bitboard.occupancy
+        self.bitboard.occupied = other.bitboard.occupied
+        if self._cells is not None:
+            for x in range(8):
+                for y in range(8):
+                    self._cells[x][y].piece = other.get_piece(x, y)
+        self.isWhiteTurn = other.isWhiteTurn
+        self.castling_rights = other.castling_rights
+        self.en_passant = other.en_passant
+        self.halfmove_clock = other.halfmove_clock
+        self.fullmove_number = other.fullmove_number
+        self.checkers = other.checkers
+        self._boardstate = other._boardstate
+        self.hash = other.hash
+        self.board_history = other.board_history[:]
+        self.position_counts = other.position_counts.copy()
+        self._undo_stack = []
+
+    def rehash(self):
+        # Recomputes the key from scratch and starts a new history, used after setting up a position by hand
+        self.hash = hash_position(self.bitboard, self.isWhiteTurn, self.castling_rights, self.en_passant)
+        self.board_history = [self.hash]
+        self.position_counts = {self.hash: 1}
+        self._undo_stack = []
+        self.checkers = checkers(self.bitboard, self.side_to_move())
+        self._boardstate = None
+
+    def moves_played(self) -> list:
+        return [record.move for record in self._undo_stack]
+
+    def repetition_count(self) -> int:
+        return self.position_counts.get(self.hash, 0)
+
+    def is_threefold_repetition(self) -> bool:
+        return self.position_counts.get(self.hash, 0) >= 3
+
+    def game_result(self):
+        # (result, reason) when the game is over, None while it goes on
+        if self.boardstate == BoardState.CHECKMATE:
+            return ("0-1" if self.isWhiteTurn else "1-0"), "checkmate"
+        if self.boardstate == BoardState.STALEMATE:
+            return "1/2-1/2", "stalemate"
+        if self.halfmove_clock >= 100:
+            return "1/2-1/2", "fifty-move rule"
+        if self.is_threefold_repetition():
+            return "1/2-1/2", "threefold repetition"
+        return None
+
+    def set_fen(self, fen: str):
+        pieces, isWhiteTurn, castling_rights, en_passant, halfmove_clock, fullmove_number, key = parse_fen(fen)
+        if pieces[KING].bit_count() != 1 or pieces[6 + KING].bit_count() != 1:
+            raise FenError(f"Each side needs exactly one king: {fen!r}")
+        bitboard = BitBoard()
+        bitboard.pieces[:] = pieces
+        white = pieces[0] | pieces[1] | pieces[2] | pieces[3] | pieces[4] | pieces[5]
+        black = pieces[6] | pieces[7] | pieces[8] | pieces[9] | pieces[10] | pieces[11]
+        bitboard.occupancy[WHITE] = white
+        bitboard.occupancy[BLACK] = black
+        bitboard.occupied = white | black
+        # The side that just moved cannot have left its king in check, the king could be captured
+        color = WHITE if isWhiteTurn else BLACK
+        if is_square_attacked(bitboard, king_square(bitboard, 1 - color), color):
+            raise FenError(f"The side not to move is in check: {fen!r}")
+        # Checked on a new bitboard, so a bad FEN leaves the board as it was
+        self.bitboard = bitboard
+        if self.representation == BoardRepresentation.CELLS:
+            self._cells = bitboard.to_cells()
+
+        self.isWhiteTurn = isWhiteTurn
+        self.castling_rights = castling_rights
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.checkers = checkers(bitboard, color)
+        self._boardstate = None
+        self.hash = key
+        self.board_history = [key]
+        self.position_counts = {key: 1}
+        self._undo_stack = []
+
+    def fen(self) -> str:
+        return format_fen(self)
+
     def initialize(self):
+        self.bitboard = BitBoard()
+        if self.representation == BoardRepresentation.CELLS:
+            self._cells = [[Cell(x, y) for y in range(8)] for x in range(8)]
+        self.isWhiteTurn = True
+        self.castling_rights = ALL_CASTLING
+        self.en_passant = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.hash = 0
+
         # Initialize pieces on the board
         for x in range(8):
             for y in range(8):
                 if x == 1:
-                    self.cells[x][y].piece = Piece.PieceFactory.create_piece(Piece.PieceType.PAWN, False)
+                    self.set_piece(x, y, Piece.PieceFactory.create_piece(Piece.PieceType.PAWN, False))
                 elif x == 6:
-                    self.cells[x][y].piece = Piece.PieceFactory.create_piece(Piece.PieceType.PAWN, True)
+                    self.set_piece(x, y, Piece.PieceFactory.create_piece(Piece.PieceType.PAWN, True))
                 elif x == 0 or x == 7:
                     isWhite = (x == 7)
                     if y == 0 or y == 7:
-                        self.cells[x][y].piece = Piece.PieceFactory.create_piece(Piece.PieceType.ROOK, isWhite)
+                        self.set_piece(x, y, Piece.PieceFactory.create_piece(Piece.PieceType.ROOK, isWhite))
                     elif y == 1 or y == 6:
-                        self.cells[x][y].piece = Piece.PieceFactory.create_piece(Piece.PieceType.KNIGHT, isWhite)
+                        self.set_piece(x, y, Piece.PieceFactory.create_piece(Piece.PieceType.KNIGHT, isWhite))
                     elif y == 2 or y == 5:
-                        self.cells[x][y].piece = Piece.PieceFactory.create_piece(Piece.PieceType.BISHOP, isWhite)
+                        self.set_piece(x, y, Piece.PieceFactory.create_piece(Piece.PieceType.BISHOP, isWhite))
                     elif y == 3:
-                        self.cells[x][y].piece = Piece.PieceFactory.create_piece(Piece.PieceType.QUEEN, isWhite)
+                        self.set_piece(x, y, Piece.PieceFactory.create_piece(Piece.PieceType.QUEEN, isWhite))
                     elif y == 4:
-                        self.cells[x][y].piece = Piece.PieceFactory.create_piece(Piece.PieceType.KING, isWhite)
+                        self.set_piece(x, y, Piece.PieceFactory.create_piece(Piece.PieceType.KING, isWhite))
+        self.rehash()
 
     def play(self):
-        while self.boardstate == BoardState.ACTIVE:
+        while not self.is_game_over():
             # Get current player
             current_player = self.player1 if self.isWhiteTurn else self.player2
 
             # Get and validate move
-            move = current_player.get_move()
+            move = current_player.get_move(self)
             if self.validate_move(move, current_player):
                 self.make_move(move, current_player)
-                self.switch_turn()
             else:
                 print("Invalid move. Try again.")
-    
-    def validate_move(self, move, player: Player):
-        # Implement move validation logic
-        pass
+        print(f"{self.boardstate.value}!")
+
+    def side_to_move(self) -> int:
+        return WHITE if self.isWhiteTurn else BLACK
+
+    def legal_moves(self, from_mask: int = ALL_SQUARES) -> list:
+        return generate_moves(self.bitboard, self.side_to_move(), self.castling_rights, self.en_passant, from_mask)
+
+    def validate_move(self, move: Move, player: Player = None) -> bool:
+        if player is not None and player.is_white() != self.isWhiteTurn:
+            return False
+        return move in self.legal_moves(1 << move.from_square)
+
+    def make_move(self, move: Move, player: Player = None):
+        bitboard = self.bitboard
+        color = self.side_to_move()
+        src, dst = move.from_square, move.to_square
+        # Taken before the pieces move, whether it counts depends on the pawns next to the square
+        old_en_passant_key = en_passant_key(bitboard.pieces, self.en_passant, self.isWhiteTurn)
+        kind, _ = bitboard.remove(src)
+        placed = kind if move.promotion is None else move.promotion
+        delta = PIECE_KEYS[color * 6 + kind][src] ^ PIECE_KEYS[color * 6 + placed][dst] ^ SIDE_KEY
+
+        captured_square = dst
+        if kind == PAWN and dst == self.en_passant:
+            captured_square = dst + 8 if color == WHITE else dst - 8
+        captured = bitboard.remove(captured_square)
+        if captured is not None:
+            delta ^= PIECE_KEYS[captured[1] * 6 + captured[0]][captured_square]
+        bitboard.put(dst, placed, color)
+
+        rook_move = None
+        if kind == KING and abs(dst - src) == 2:
+            rook_move = CASTLING_ROOKS[dst]
+            bitboard.remove(rook_move[0])
+            bitboard.put(rook_move[1], ROOK, color)
+            delta ^= PIECE_KEYS[color * 6 + ROOK][rook_move[0]] ^ PIECE_KEYS[color * 6 + ROOK][rook_move[1]]
+
+        if self._cells is not None:
+            self._move_cells(src, dst, captured_square, move.promotion, rook_move)
+
+        self._undo_stack.append(UndoRecord(move, kind, None if captured is None else captured[0],
+                                           self.castling_rights, self.en_passant, self.halfmove_clock, delta,
+                                           self.checkers))
+
+        castling_rights = self.castling_rights & CASTLING_MASK[src] & CASTLING_MASK[dst]
+        delta ^= CASTLING_KEYS[self.castling_rights] ^ CASTLING_KEYS[castling_rights]
+        self.castling_rights = castling_rights
+        self.en_passant = (src + dst) // 2 if kind == PAWN and abs(dst - src) == 16 else None
+        delta ^= old_en_passant_key ^ en_passant_key(bitboard.pieces, self.en_passant, color == BLACK)
+        self.halfmove_clock = 0 if kind == PAWN or captured is not None else self.halfmove_clock + 1
+        if color == BLACK:
+            self.fullmove_number += 1
+        self.switch_turn()
+        self.checkers = checkers(bitboard, 1 - color)
+        self._boardstate = None
+
+        # The stored delta covers the pieces only, the rest is restored from the saved state
+        self.hash ^= delta
+        self.board_history.append(self.hash)
+        self.position_counts[self.hash] = self.position_counts.get(self.hash, 0) + 1
+
+    def unmake_move(self):
+        record = self._undo_stack.pop()
+        move = record.move
+        kind = record.moved_kind
+        en_passant = record.en_passant
+
+        count = self.position_counts[self.hash] - 1
+        if count:
+            self.position_counts[self.hash] = count
+        else:
+            del self.position_counts[self.hash]
+        self.board_history.pop()
+
+        # Taken before the pieces move back, like in make_move
+        en_passant_delta = en_passant_key(self.bitboard.pieces, self.en_passant, self.isWhiteTurn)
+        self.switch_turn()
+        color = self.side_to_move()
+        if color == BLACK:
+            self.fullmove_number -= 1
+        bitboard = self.bitboard
+        src, dst = move.from_square, move.to_square
+        bitboard.remove(dst)
+        bitboard.put(src, kind, color)
+        captured_square = dst
+        if kind == PAWN and dst == en_passant:
+            captured_square = dst + 8 if color == WHITE else dst - 8
+        if record.captured_kind is not None:
+            bitboard.put(captured_square, record.captured_kind, 1 - color)
+        rook_move = None
+        if kind == KING and abs(dst - src) == 2:
+            rook_move = CASTLING_ROOKS[dst]
+            bitboard.remove(rook_move[1])
+            bitboard.put(rook_move[0], ROOK, color)
+        if self._cells is not None:
+            self._unmove_cells(src, dst, captured_square, rook_move, kind, record.captured_kind, color)
+
+        self.hash ^= (record.hash_delta
+                      ^ CASTLING_KEYS[self.castling_rights] ^ CASTLING_KEYS[record.castling_rights]
+                      ^ en_passant_delta ^ en_passant_key(bitboard.pieces, en_passant, self.isWhiteTurn))
+        self.castling_rights = record.castling_rights
+        self.en_passant = en_passant
+        self.halfmove_clock = record.halfmove_clock
+        self.checkers = record.checkers
+        self._boardstate = None
+
+    def _move_cells(self, src: int, dst: int, captured_square: int, promotion, rook_move):
+        cells = self._cells
+        source = cells[src // 8][src % 8]
+        cells[captured_square // 8][captured_square % 8].piece = None
+        piece = source.piece
+        if promotion is not None:
+            piece = Piece.PieceFactory.create_piece(PIECE_TYPES[promotion], piece.isWhite)
+        cells[dst // 8][dst % 8].piece = piece
+        source.piece = None
+        if rook_move is not None:
+            rook_from = cells[rook_move[0] // 8][rook_move[0] % 8]
+            cells[rook_move[1] // 8][rook_move[1] % 8].piece = rook_from.piece
+            rook_from.piece = None
+
+    def _unmove_cells(self, src: int, dst: int, captured_square: int, rook_move, kind: int, captured_kind, color: int):
+        # Pieces are shared flyweights, so the grid is restored from the kinds in the undo record
+        cells = self._cells
+        cells[dst // 8][dst % 8].piece = None
+        cells[src // 8][src % 8].piece = Piece.PieceFactory.create_piece(PIECE_TYPES[kind], color == WHITE)
+        if captured_kind is not None:
+            cells[captured_square // 8][captured_square % 8].piece = Piece.PieceFactory.create_piece(
+                PIECE_TYPES[captured_kind], color != WHITE)
+        if rook_move is not None:
+            rook_to = cells[rook_move[1] // 8][rook_move[1] % 8]
+            cells[rook_move[0] // 8][rook_move[0] % 8].piece = rook_to.piece
+            rook_to.piece = None
 
-    def make_move(self, move, player: Player):
-        # Implement move execution logic
-        pass
+    def captured_pieces(self) -> list:
+        # Pieces captured so far in this game, in order; captures are board state, not piece state
+        captured = []
+        # The last move was made by the side not to move, the moves before it alternate
+        capturedWhite = (len(self._undo_stack) % 2 == 0) != self.isWhiteTurn
+        for record in self._undo_stack:
+            if record.captured_kind is not None:
+                captured.append(Piece.PieceFactory.create_piece(PIECE_TYPES[record.captured_kind], capturedWhite))
+            capturedWhite = not capturedWhite
+        return captured
 
     def switch_turn(self):
-        self.isWhiteTurn = not self.isWhiteTurn
\ No newline at end of file
+        self.isWhiteTurn = not self.isWhiteTurn
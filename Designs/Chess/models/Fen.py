@@ -0,0 +1,159 @@
+"""
+
+FEN (Forsyth-Edwards Notation) parsing and generation.
+
+parse_fen reads the whole position in a single pass over the string, filling the twelve piece
+bitboards and the Zobrist key as it goes, so setting up a Board from FEN never touches the
+cell grid or the PieceFactory (unless the board keeps a cell grid).
+
+load_positions streams a file with one FEN (or EPD) per line. With reuse_board=True every
+position is loaded into the same Board, so millions of positions can be scanned without
+allocating a board per line.
+
+Files from elsewhere are checked rather than trusted: the placement must be exactly 8 ranks of 8
+squares with no pawn on the first or last rank, castling rights whose king or rook is not on its
+home square are dropped, and an en passant square must be on the right rank for the side to
+move, empty, with the enemy pawn that just stepped twice in front of it. Board.set_fen also
+needs one king per side, and the side not to move must not be in check.
+
+"""
+
+from Designs.Chess.models.Zobrist import PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, en_passant_key
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+PIECE_LETTERS = "PNBRQKpnbrqk"
+PIECE_INDEX = {letter: index for index, letter in enumerate(PIECE_LETTERS)}
+CASTLING_LETTERS = (("K", 1), ("Q", 2), ("k", 4), ("q", 8))
+CASTLING_INDEX = dict(CASTLING_LETTERS)
+# right -> (king index, king home square, rook index, rook home square)
+CASTLING_HOMES = {
+    1: (PIECE_INDEX["K"], 60, PIECE_INDEX["R"], 63),
+    2: (PIECE_INDEX["K"], 60, PIECE_INDEX["R"], 56),
+    4: (PIECE_INDEX["k"], 4, PIECE_INDEX["r"], 7),
+    8: (PIECE_INDEX["k"], 4, PIECE_INDEX["r"], 0),
+}
+FILES = "abcdefgh"
+# Rank 8 and rank 1, where no pawn can stand
+BACK_RANKS = 0xFF | 0xFF << 56
+
+
+class FenError(ValueError):
+    pass
+
+
+def parse_fen(fen: str):
+    # -> (pieces, isWhiteTurn, castling_rights, en_passant, halfmove_clock, fullmove_number, hash)
+    fields = fen.split()
+    if len(fields) < 4:
+        raise FenError(f"FEN needs at least 4 fields: {fen!r}")
+
+    ranks = fields[0].split("/")
+    if len(ranks) != 8:
+        raise FenError(f"Piece placement needs 8 ranks: {fen!r}")
+    pieces = [0] * 12
+    key = 0
+    square = 0
+    for x, rank in enumerate(ranks):
+        end = x * 8 + 8
+        for char in rank:
+            if "1" <= char <= "8":
+                square += ord(char) - 48
+                continue
+            index = PIECE_INDEX.get(char)
+            if index is None or square >= end:
+                raise FenError(f"Bad piece placement: {fen!r}")
+            pieces[index] |= 1 << square
+            key ^= PIECE_KEYS[index][square]
+            square += 1
+        if square != end:
+            raise FenError(f"Rank with other than 8 squares: {fen!r}")
+    if (pieces[PIECE_INDEX["P"]] | pieces[PIECE_INDEX["p"]]) & BACK_RANKS:
+        raise FenError(f"Pawn on the first or last rank: {fen!r}")
+
+    if fields[1] not in ("w", "b"):
+        raise FenError(f"Bad side to move: {fen!r}")
+    isWhiteTurn = fields[1] == "w"
+    if not isWhiteTurn:
+        key ^= SIDE_KEY
+
+    castling_rights = 0
+    if fields[2] != "-":
+        for char in fields[2]:
+            if char not in CASTLING_INDEX:
+                raise FenError(f"Bad castling rights: {fen!r}")
+            castling_rights |= CASTLING_INDEX[char]
+    # A right is only kept while its king and rook are on their home squares
+    for right, (king, king_square, rook, rook_square) in CASTLING_HOMES.items():
+        if castling_rights & right and not (pieces[king] >> king_square & 1 and pieces[rook] >> rook_square & 1):
+            castling_rights &= ~right
+    key ^= CASTLING_KEYS[castling_rights]
+
+    en_passant = None
+    if fields[3] != "-":
+        name = fields[3]
+        if len(name) != 2 or name[0] not in FILES or name[1] != ("6" if isWhiteTurn else "3"):
+            raise FenError(f"Bad en passant square: {fen!r}")
+        en_passant = (8 - int(name[1])) * 8 + FILES.index(name[0])
+        # The pawn that just stepped twice stands behind the square, which itself is empty
+        passed, pawn = (en_passant + 8, PIECE_INDEX["p"]) if isWhiteTurn else (en_passant - 8, PIECE_INDEX["P"])
+        if not pieces[pawn] >> passed & 1 or any(bits >> en_passant & 1 for bits in pieces):
+            raise FenError(f"En passant square without a pawn that stepped twice: {fen!r}")
+        key ^= en_passant_key(pieces, en_passant, isWhiteTurn)
+
+    # EPD lines stop after four fields or carry operations instead of the clocks
+    halfmove_clock = int(fields[4]) if len(fields) > 4 and fields[4].isdigit() else 0
+    fullmove_number = int(fields[5]) if len(fields) > 5 and fields[5].isdigit() else 1
+    return pieces, isWhiteTurn, castling_rights, en_passant, halfmove_clock, fullmove_number, key
+
+
+def format_fen(board) -> str:
+    letters = [None] * 64
+    for index, bits in enumerate(board.bitboard.pieces):
+        while bits:
+            low = bits & -bits
+            bits ^= low
+            letters[low.bit_length() - 1] = PIECE_LETTERS[index]
+
+    rows = []
+    for x in range(8):
+        row = ""
+        empty = 0
+        for letter in letters[x * 8:x * 8 + 8]:
+            if letter is None:
+                empty += 1
+                continue
+            if empty:
+                row += str(empty)
+                empty = 0
+            row += letter
+        rows.append(row + (str(empty) if empty else ""))
+
+    castling = "".join(letter for letter, right in CASTLING_LETTERS if board.castling_rights & right) or "-"
+    en_passant = "-"
+    if board.en_passant is not None:
+        en_passant = FILES[board.en_passant & 7] + str(8 - board.en_passant // 8)
+    return (f"{'/'.join(rows)} {'w' if board.isWhiteTurn else 'b'} {castling} {en_passant} "
+            f"{board.halfmove_clock} {board.fullmove_number}")
+
+
+def load_positions(path: str, reuse_board: bool = True, skip_invalid: bool = False):
+    # Yields a Board per line; with reuse_board the same Board is yielded every time
+    from Designs.Chess.models.Board import Board, BoardRepresentation
+
+    board = None
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                if board is None or not reuse_board:
+                    board = Board(None, None, BoardRepresentation.BITBOARD, fen=line)
+                else:
+                    board.set_fen(line)
+            except FenError:
+                if skip_invalid:
+                    continue
+                raise
+            yield board
@@ -0,0 +1,54 @@
+"""
+
+GameManager holds the boards of every game running in the process, keyed by game id.
+
+Setting up the start position piece by piece for every new game is wasted work, so the manager
+sets it up once on a template board and creates new boards by copying the template.
+Boards of finished games are reset from the template and kept in a pool for the next games,
+so a busy server does not keep allocating and freeing boards.
+
+Boards use the bitboard representation by default: copying and resetting them is a handful of
+integer copies, and the cell grid is still available through Board.cells.
+
+"""
+
+from itertools import count
+
+from Designs.Chess.models.Board import Board, BoardRepresentation
+from Designs.Chess.models.Player import Player
+
+
+class GameManager:
+    def __init__(self, representation: BoardRepresentation = BoardRepresentation.BITBOARD, max_pool_size: int = 1024):
+        self._template = Board(Player("White", True), Player("Black", False), representation)
+        self._pool = []
+        self._ids = count(1)
+        self.max_pool_size = max_pool_size
+        self.games = {}
+
+    def create_game(self, player1: Player, player2: Player, game_id=None):
+        if game_id is None:
+            game_id = next(self._ids)
+        if game_id in self.games:
+            raise ValueError(f"Game {game_id} already exists")
+        board = self._pool.pop() if self._pool else self._template.copy()
+        board.player1 = player1
+        board.player2 = player2
+        self.games[game_id] = board
+        return game_id
+
+    def get_board(self, game_id) -> Board:
+        return self.games[game_id]
+
+    def end_game(self, game_id):
+        # The board goes back to the pool, so read anything needed from it before ending the game
+        board = self.games.pop(game_id)
+        if len(self._pool) < self.max_pool_size:
+            board.load_from(self._template)
+            self._pool.append(board)
+
+    def __len__(self):
+        return len(self.games)
+
+    def __contains__(self, game_id):
+        return game_id in self.games
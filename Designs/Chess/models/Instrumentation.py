@@ -0,0 +1,220 @@
+"""
+
+Optional profiling instrumentation for the game loop, move generation and search.
+
+It is off by default and then costs nothing: the measured methods are the plain methods, with no
+flag checked on every call. install() replaces them on their classes with wrappers that count
+and time the calls, and uninstall() puts the original functions back.
+
+Measured (times are inclusive, so the legal_moves called by validate_move is in both):
+- Board.validate_move, make_move, unmake_move and legal_moves (move generation)
+- Board.boardstate when it is worked out after a move (check, mate and stalemate detection),
+  not when the cached state is read again
+- Search.best_move: every search also adds its nodes, beta cutoffs and completed depth
+
+Metrics holds the counters and timers of one installation. summary() formats them as a table,
+for a report at the end of a game, and snapshot() returns them as a dict for periodic export.
+
+Only the process that installed the wrappers is measured. Work done in other processes is
+measured there and sent back: a Metrics pickles as plain data and merge() adds one into
+another. AsyncEnginePlayer does this when given a Metrics, profiling each search in its
+executor process and merging the figures into the game's Metrics, which is how the Server's
+STATS (with --profile) reports engine searches per game and for the whole server.
+
+Usage:
+    with profiled() as metrics:
+        board.play()
+    print(metrics.summary())
+
+"""
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from Designs.Chess.models.Board import Board
+from Designs.Chess.models.Search import Search
+
+MEASURED = (
+    (Board, "validate_move"),
+    (Board, "make_move"),
+    (Board, "unmake_move"),
+    (Board, "legal_moves"),
+    (Board, "boardstate"),
+    (Search, "best_move"),
+)
+
+# (class, name) -> the original attribute while instrumentation is installed
+_originals = {}
+_metrics = None
+
+
+class Timer:
+    __slots__ = ("calls", "seconds", "max_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float):
+        self.calls += 1
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counters = {}
+        self.timers = {}
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timer(self, name: str) -> Timer:
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Timer()
+        return timer
+
+    def merge(self, other: "Metrics"):
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        for name, timer in other.timers.items():
+            mine = self.timer(name)
+            mine.calls += timer.calls
+            mine.seconds += timer.seconds
+            if timer.max_seconds > mine.max_seconds:
+                mine.max_seconds = timer.max_seconds
+
+    def reset(self):
+        # Timers are cleared in place, the installed wrappers keep a reference to them
+        self.started = time.perf_counter()
+        self.counters.clear()
+        for timer in self.timers.values():
+            timer.calls = 0
+            timer.seconds = 0.0
+            timer.max_seconds = 0.0
+
+    def snapshot(self, reset: bool = False) -> dict:
+        elapsed = time.perf_counter() - self.started
+        timers = {
+            name: {
+                "calls": timer.calls,
+                "total_ms": round(1000 * timer.seconds, 3),
+                "mean_us": round(1_000_000 * timer.seconds / timer.calls, 3) if timer.calls else 0.0,
+                "max_us": round(1_000_000 * timer.max_seconds, 3),
+                "share": round(timer.seconds / elapsed, 4) if elapsed > 0 else 0.0,
+            }
+            for name, timer in sorted(self.timers.items())
+        }
+        data = {"elapsed_seconds": round(elapsed, 6), "counters": dict(sorted(self.counters.items())), "timers": timers}
+        search = self.timers.get("Search.best_move")
+        if search is not None and search.calls:
+            nodes = self.counters.get("search.nodes", 0)
+            data["search"] = {
+                "searches": search.calls,
+                "nodes": nodes,
+                "nodes_per_second": round(nodes / search.seconds, 1) if search.seconds > 0 else 0.0,
+                "cutoffs": self.counters.get("search.cutoffs", 0),
+                "cutoffs_per_node": round(self.counters.get("search.cutoffs", 0) / nodes, 4) if nodes else 0.0,
+                "mean_depth": round(self.counters.get("search.depth", 0) / search.calls, 2),
+            }
+        if reset:
+            self.reset()
+        return data
+
+    def summary(self) -> str:
+        data = self.snapshot()
+        lines = [f"{'':24} {'calls':>10} {'total ms':>12} {'mean us':>10} {'max us':>10} {'share':>7}"]
+        for name, timer in data["timers"].items():
+            lines.append(f"{name:24} {timer['calls']:>10} {timer['total_ms']:>12.1f} {timer['mean_us']:>10.1f} "
+                         f"{timer['max_us']:>10.1f} {timer['share']:>7.1%}")
+        search = data.get("search")
+        if search is not None:
+            lines.append(f"search: {search['searches']} searches, {search['nodes']} nodes, "
+                         f"{search['nodes_per_second']:.0f} nps, {search['cutoffs']} cutoffs "
+                         f"({search['cutoffs_per_node']:.1%} of nodes), mean depth {search['mean_depth']}")
+        lines.append(f"elapsed: {data['elapsed_seconds']:.3f}s")
+        return "\n".join(lines)
+
+
+def _timed(function, timer: Timer):
+    clock = time.perf_counter
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timer.record(clock() - start)
+    return wrapper
+
+
+def _timed_boardstate(prop: property, timer: Timer) -> property:
+    fget = prop.fget
+    timed = _timed(fget, timer)
+
+    def getter(board):
+        if board._boardstate is not None:
+            return board._boardstate
+        return timed(board)
+    return property(getter, prop.fset)
+
+
+def _timed_search(function, timer: Timer, metrics: Metrics):
+    timed = _timed(function, timer)
+
+    @wraps(function)
+    def wrapper(search, *args, **kwargs):
+        try:
+            return timed(search, *args, **kwargs)
+        finally:
+            metrics.count("search.nodes", search.nodes)
+            metrics.count("search.cutoffs", search.cutoffs)
+            metrics.count("search.depth", search.completed_depth)
+    return wrapper
+
+
+def install(metrics: Metrics = None) -> Metrics:
+    global _metrics
+    uninstall()
+    metrics = metrics or Metrics()
+    for cls, name in MEASURED:
+        original = cls.__dict__[name]
+        timer = metrics.timer(f"{cls.__name__}.{name}")
+        if isinstance(original, property):
+            replacement = _timed_boardstate(original, timer)
+        elif cls is Search:
+            replacement = _timed_search(original, timer, metrics)
+        else:
+            replacement = _timed(original, timer)
+        _originals[(cls, name)] = original
+        setattr(cls, name, replacement)
+    _metrics = metrics
+    return metrics
+
+
+def uninstall():
+    global _metrics
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
+    _metrics = None
+
+
+def installed() -> Metrics:
+    # The Metrics being collected, None when instrumentation is off
+    return _metrics
+
+
+@contextmanager
+def profiled(metrics: Metrics = None):
+    metrics = install(metrics)
+    try:
+        yield metrics
+    finally:
+        uninstall()
@@ -0,0 +1,80 @@
+"""
+
+A Move is a value object: the square it starts from, the square it goes to and, for pawn
+promotions, the kind of piece the pawn becomes. Two moves are equal when those three match,
+so a move typed in by a player compares equal to the one produced by the move generator.
+
+The generator also fills in flags (capture, en passant, castling, double push) which are
+handy for move ordering and display but are not part of equality.
+
+"""
+
+from Designs.Chess.models.BitBoard import KNIGHT, BISHOP, ROOK, QUEEN
+
+CAPTURE = 1
+DOUBLE_PUSH = 2
+EN_PASSANT = 4
+CASTLE = 8
+
+PROMOTION_LETTERS = {KNIGHT: "n", BISHOP: "b", ROOK: "r", QUEEN: "q"}
+PROMOTION_KINDS = {letter: kind for kind, letter in PROMOTION_LETTERS.items()}
+
+
+def square_name(square: int) -> str:
+    x, y = divmod(square, 8)
+    return "abcdefgh"[y] + str(8 - x)
+
+
+def parse_square(name: str) -> int:
+    if len(name) != 2 or name[0] not in "abcdefgh" or name[1] not in "12345678":
+        raise ValueError(f"Not a square: {name!r}")
+    return (8 - int(name[1])) * 8 + "abcdefgh".index(name[0])
+
+
+class Move:
+    __slots__ = ("from_square", "to_square", "promotion", "flags")
+
+    def __init__(self, from_square: int, to_square: int, promotion: int = None, flags: int = 0):
+        self.from_square = from_square
+        self.to_square = to_square
+        self.promotion = promotion
+        self.flags = flags
+
+    @classmethod
+    def from_uci(cls, text: str) -> "Move":
+        text = text.strip().lower()
+        if len(text) not in (4, 5):
+            raise ValueError(f"Not a move: {text!r}")
+        promotion = PROMOTION_KINDS[text[4]] if len(text) == 5 else None
+        return cls(parse_square(text[:2]), parse_square(text[2:4]), promotion)
+
+    def uci(self) -> str:
+        text = square_name(self.from_square) + square_name(self.to_square)
+        if self.promotion is not None:
+            text += PROMOTION_LETTERS[self.promotion]
+        return text
+
+    def encode(self) -> int:
+        # 16 bits: from (6), to (6), promotion kind + 1 or 0 (3)
+        promotion = 0 if self.promotion is None else self.promotion + 1
+        return self.from_square | self.to_square << 6 | promotion << 12
+
+    @classmethod
+    def decode(cls, code: int) -> "Move":
+        promotion = code >> 12
+        return cls(code & 63, (code >> 6) & 63, promotion - 1 if promotion else None)
+
+    def is_capture(self) -> bool:
+        return bool(self.flags & (CAPTURE | EN_PASSANT))
+
+    def __eq__(self, other):
+        return (isinstance(other, Move)
+                and self.from_square == other.from_square
+                and self.to_square == other.to_square
+                and self.promotion == other.promotion)
+
+    def __hash__(self):
+        return hash((self.from_square, self.to_square, self.promotion))
+
+    def __repr__(self):
+        return f"Move({self.uci()})"
@@ -0,0 +1,276 @@
+"""
+
+Legal move generation on top of the BitBoard representation.
+
+Each piece kind asks its MovementStrategy (see Piece.py) for the squares it attacks, which is
+a lookup in the precomputed tables of AttackTables.py. Pawn pushes, en passant and castling are
+handled here because they depend on board state rather than on the piece alone.
+
+A pseudo-legal move is kept only if it does not leave the own king attacked. That check does not
+copy the board: it recomputes the attacks on the king square against the occupancy the move
+would produce, again through table lookups.
+
+The attack check works on attack sets rather than on the board: the leap tables and slide
+functions the enemy pieces move by, each with the pieces that use it, plus the pawns
+(attack_sets). They are built once per generation, and square_attacked / king_safe_after only
+look them up. VariantBoard builds the same sets from a variant's tables and shares these two
+functions, so boards of any size and piece set check attacks and pins the same way.
+
+Deciding whether the game is over does not need the full move list: has_legal_move stops at the
+first legal move it finds. It tries king steps first, and uses the checkers and pinned pieces of
+the position (see Board.checkers) so that most candidate moves are accepted without the
+king-safety check.
+
+"""
+
+from Designs.Chess.models import Piece
+from Designs.Chess.models.AttackTables import (
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN, rook_attacks, bishop_attacks, lsb,
+)
+from Designs.Chess.models.BitBoard import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from Designs.Chess.models.Move import Move, CAPTURE, DOUBLE_PUSH, EN_PASSANT, CASTLE
+
+ALL_SQUARES = (1 << 64) - 1
+
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = 15
+
+# Castling rights lost when a move touches a square (king or rook start squares)
+CASTLING_MASK = [ALL_CASTLING] * 64
+CASTLING_MASK[60] &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[63] &= ~WHITE_KINGSIDE
+CASTLING_MASK[56] &= ~WHITE_QUEENSIDE
+CASTLING_MASK[4] &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASK[7] &= ~BLACK_KINGSIDE
+CASTLING_MASK[0] &= ~BLACK_QUEENSIDE
+
+# King destination square -> (rook from, rook to)
+CASTLING_ROOKS = {62: (63, 61), 58: (56, 59), 6: (7, 5), 2: (0, 3)}
+
+# (color, right, king from, king to, squares that must be empty, squares that must not be attacked)
+CASTLING_RULES = (
+    (WHITE, WHITE_KINGSIDE, 60, 62, (1 << 61) | (1 << 62), (60, 61, 62)),
+    (WHITE, WHITE_QUEENSIDE, 60, 58, (1 << 59) | (1 << 58) | (1 << 57), (60, 59, 58)),
+    (BLACK, BLACK_KINGSIDE, 4, 6, (1 << 5) | (1 << 6), (4, 5, 6)),
+    (BLACK, BLACK_QUEENSIDE, 4, 2, (1 << 3) | (1 << 2) | (1 << 1), (4, 3, 2)),
+)
+
+PROMOTION_RANKS = (0x00000000000000FF, 0xFF00000000000000)
+PAWN_START_RANKS = (0x00FF000000000000, 0x000000000000FF00)
+PAWN_STEP = (-8, 8)
+
+STRATEGIES = {
+    KNIGHT: Piece.KnightMovementStrategy(),
+    BISHOP: Piece.BishopMovementStrategy(),
+    ROOK: Piece.RookMovementStrategy(),
+    QUEEN: Piece.QueenMovementStrategy(),
+    KING: Piece.KingMovementStrategy(),
+}
+
+
+def attack_sets(bitboard, by_color: int) -> tuple:
+    # -> ((leap table, pieces), ...), ((slide function, pieces), ...), pawn attack table, pawns
+    pieces = bitboard.pieces
+    offset = by_color * 6
+    queens = pieces[offset + QUEEN]
+    return (((KNIGHT_ATTACKS, pieces[offset + KNIGHT]), (KING_ATTACKS, pieces[offset + KING])),
+            ((bishop_attacks, pieces[offset + BISHOP] | queens), (rook_attacks, pieces[offset + ROOK] | queens)),
+            PAWN_ATTACKS[1 - by_color], pieces[offset + PAWN])
+
+
+def square_attacked(square: int, occupied: int, keep: int, attacks: tuple) -> bool:
+    # keep masks out a piece the move captures, which no longer attacks anything
+    leaps, slides, pawn_attacks, pawns = attacks
+    for table, pieces in leaps:
+        if table[square] & pieces & keep:
+            return True
+    for slide, pieces in slides:
+        if pieces & keep and slide(square, occupied) & pieces & keep:
+            return True
+    return bool(pawn_attacks[square] & pawns & keep)
+
+
+def king_safe_after(king: int, occupied: int, from_square: int, to_square: int, captured_square: int,
+                    attacks: tuple) -> bool:
+    captured = 1 << captured_square
+    return not square_attacked(king, (occupied & ~(1 << from_square) & ~captured) | (1 << to_square), ~captured,
+                               attacks)
+
+
+def is_square_attacked(bitboard, square: int, by_color: int, occupied: int = None, ignore: int = 0) -> bool:
+    if occupied is None:
+        occupied = bitboard.occupied
+    return square_attacked(square, occupied, ~ignore, attack_sets(bitboard, by_color))
+
+
+def attackers(bitboard, square: int, by_color: int, occupied: int = None) -> int:
+    # Bitboard of the by_color pieces attacking the square
+    if occupied is None:
+        occupied = bitboard.occupied
+    pieces = bitboard.pieces
+    offset = by_color * 6
+    queens = pieces[offset + QUEEN]
+    return ((KNIGHT_ATTACKS[square] & pieces[offset + KNIGHT])
+            | (KING_ATTACKS[square] & pieces[offset + KING])
+            | (PAWN_ATTACKS[1 - by_color][square] & pieces[offset + PAWN])
+            | (bishop_attacks(square, occupied) & (pieces[offset + BISHOP] | queens))
+            | (rook_attacks(square, occupied) & (pieces[offset + ROOK] | queens)))
+
+
+def checkers(bitboard, color: int) -> int:
+    return attackers(bitboard, king_square(bitboard, color), 1 - color)
+
+
+def pinned_pieces(bitboard, color: int) -> int:
+    # Own pieces that are the only piece between the king and an enemy slider
+    king = king_square(bitboard, color)
+    pieces = bitboard.pieces
+    offset = (1 - color) * 6
+    queens = pieces[offset + QUEEN]
+    snipers = ((rook_attacks(king, 0) & (pieces[offset + ROOK] | queens))
+               | (bishop_attacks(king, 0) & (pieces[offset + BISHOP] | queens)))
+    occupied = bitboard.occupied
+    own = bitboard.occupancy[color]
+    pinned = 0
+    while snipers:
+        low = snipers & -snipers
+        snipers ^= low
+        blockers = BETWEEN[king][low.bit_length() - 1] & occupied
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pinned |= blockers
+    return pinned
+
+
+def king_square(bitboard, color: int) -> int:
+    return lsb(bitboard.pieces[color * 6 + KING])
+
+
+def in_check(bitboard, color: int) -> bool:
+    return is_square_attacked(bitboard, king_square(bitboard, color), 1 - color)
+
+
+def generate_moves(bitboard, color: int, castling_rights: int, en_passant, from_mask: int = ALL_SQUARES) -> list:
+    moves = []
+    own = bitboard.occupancy[color]
+    enemy = bitboard.occupancy[1 - color]
+    occupied = bitboard.occupied
+    pieces = bitboard.pieces
+    isWhite = color == WHITE
+    king = king_square(bitboard, color)
+    attacks = attack_sets(bitboard, 1 - color)
+
+    for kind, strategy in STRATEGIES.items():
+        movers = pieces[color * 6 + kind] & from_mask
+        while movers:
+            low = movers & -movers
+            movers ^= low
+            src = low.bit_length() - 1
+            targets = strategy.attacks(src, occupied, isWhite) & ~own
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                dst = bit.bit_length() - 1
+                if kind == KING:
+                    if square_attacked(dst, occupied & ~low, ~bit, attacks):
+                        continue
+                elif not king_safe_after(king, occupied, src, dst, dst, attacks):
+                    continue
+                moves.append(Move(src, dst, None, CAPTURE if enemy & bit else 0))
+
+    step = PAWN_STEP[color]
+    promotion_rank = PROMOTION_RANKS[color]
+    pawns = pieces[color * 6 + PAWN] & from_mask
+    while pawns:
+        low = pawns & -pawns
+        pawns ^= low
+        src = low.bit_length() - 1
+        candidates = []
+        one = src + step
+        if not occupied & (1 << one):
+            candidates.append((one, one, 0))
+            two = one + step
+            if low & PAWN_START_RANKS[color] and not occupied & (1 << two):
+                candidates.append((two, two, DOUBLE_PUSH))
+        captures = PAWN_ATTACKS[color][src]
+        targets = captures & enemy
+        while targets:
+            bit = targets & -targets
+            targets ^= bit
+            dst = bit.bit_length() - 1
+            candidates.append((dst, dst, CAPTURE))
+        if en_passant is not None and captures & (1 << en_passant):
+            candidates.append((en_passant, en_passant - step, EN_PASSANT))
+
+        for dst, captured_square, flags in candidates:
+            if not king_safe_after(king, occupied, src, dst, captured_square, attacks):
+                continue
+            if (1 << dst) & promotion_rank:
+                for promotion in (QUEEN, ROOK, BISHOP, KNIGHT):
+                    moves.append(Move(src, dst, promotion, flags))
+            else:
+                moves.append(Move(src, dst, None, flags))
+
+    if castling_rights and from_mask & (1 << king):
+        for side, right, king_from, king_to, empty, safe in CASTLING_RULES:
+            if side != color or not castling_rights & right or occupied & empty:
+                continue
+            if any(square_attacked(square, occupied, -1, attacks) for square in safe):
+                continue
+            moves.append(Move(king_from, king_to, None, CASTLE))
+
+    return moves
+
+
+def has_legal_move(bitboard, color: int, en_passant, checking: int = None, pinned: int = None) -> bool:
+    own = bitboard.occupancy[color]
+    occupied = bitboard.occupied
+    pieces = bitboard.pieces
+    king = king_square(bitboard, color)
+    attacks = attack_sets(bitboard, 1 - color)
+
+    # King steps first, in most positions one of them is legal and settles it
+    king_bit = 1 << king
+    targets = KING_ATTACKS[king] & ~own
+    while targets:
+        bit = targets & -targets
+        targets ^= bit
+        if not square_attacked(bit.bit_length() - 1, occupied & ~king_bit, ~bit, attacks):
+            return True
+
+    if checking is None:
+        checking = checkers(bitboard, color)
+    if checking & (checking - 1):
+        # Double check, only the king could have moved
+        return False
+    if pinned is None:
+        pinned = pinned_pieces(bitboard, color)
+    # In check, a move must capture the checker or block the line to the king
+    allowed = checking | BETWEEN[king][lsb(checking)] if checking else ALL_SQUARES
+    isWhite = color == WHITE
+
+    for kind, strategy in STRATEGIES.items():
+        if kind == KING:
+            continue
+        movers = pieces[color * 6 + kind]
+        while movers:
+            low = movers & -movers
+            movers ^= low
+            src = low.bit_length() - 1
+            targets = strategy.attacks(src, occupied, isWhite) & ~own & allowed
+            if not targets:
+                continue
+            if not low & pinned:
+                return True
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                dst = bit.bit_length() - 1
+                if king_safe_after(king, occupied, src, dst, dst, attacks):
+                    return True
+
+    # Pawns have pushes, promotions and en passant, leave them to the generator
+    pawns = pieces[color * 6 + PAWN]
+    return bool(pawns) and bool(generate_moves(bitboard, color, 0, en_passant, pawns))
@@ -0,0 +1,120 @@
+"""
+
+Opening book: moves known to be good in opening positions, looked up by Zobrist key.
+
+The book file is an array of fixed-size entries sorted by key:
+
+    key (64 bits) | move (16 bits, Move.encode) | weight (16 bits)
+
+so all the moves of a position sit next to each other and are found with a binary search.
+The file is opened with mmap instead of being read: opening a book costs the same whatever its
+size, only the pages a lookup touches are read from disk, and every process that opens the same
+book (engine workers, several servers on one machine) shares one copy through the page cache.
+
+Books are compiled from PGN collections with Book.py:
+    python -m Designs.Chess.Book games.pgn --output book.bin
+
+"""
+
+import mmap
+import random
+import struct
+
+from Designs.Chess.models.Move import Move
+
+ENTRY = struct.Struct("<QHH")
+KEY = struct.Struct("<Q")
+MAX_WEIGHT = 0xFFFF
+
+
+class OpeningBook:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = self._file.seek(0, 2)
+        self.map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.size = size // ENTRY.size
+
+    def __len__(self):
+        return self.size
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        # Worker processes get the path and map the file themselves
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def _first_index(self, key: int) -> int:
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(self.map, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entries(self, key: int) -> list:
+        # [(move_code, weight)] stored for the key, in file order
+        result = []
+        index = self._first_index(key)
+        while index < self.size:
+            entry_key, code, weight = ENTRY.unpack_from(self.map, index * ENTRY.size)
+            if entry_key != key:
+                break
+            result.append((code, weight))
+            index += 1
+        return result
+
+    def moves(self, board) -> list:
+        # [(Move, weight)] for the board's position, keeping only moves that are legal there
+        # (a different position with the same key would otherwise hand out illegal moves)
+        entries = self.entries(board.hash)
+        if not entries:
+            return []
+        legal = {move: move for move in board.legal_moves()}
+        result = []
+        for code, weight in entries:
+            move = legal.get(Move.decode(code))
+            if move is not None:
+                result.append((move, weight))
+        return result
+
+    def pick(self, board, rng: random.Random = None, best: bool = False):
+        # A book move chosen at random in proportion to its weight, or the heaviest one; None out of book
+        moves = [(move, weight) for move, weight in self.moves(board) if weight]
+        if not moves:
+            return None
+        if best:
+            return max(moves, key=lambda entry: entry[1])[0]
+        return (rng or random).choices([move for move, _ in moves], [weight for _, weight in moves])[0]
+
+
+def write_book(path: str, weights: dict) -> int:
+    # weights maps (key, move_code) -> weight; weights are scaled down to fit 16 bits
+    largest = max(weights.values(), default=0)
+    scale = MAX_WEIGHT / largest if largest > MAX_WEIGHT else 1
+    count = 0
+    with open(path, "wb") as file:
+        buffer = bytearray()
+        for (key, code), weight in sorted(weights.items()):
+            weight = max(1, int(weight * scale)) if weight else 0
+            buffer += ENTRY.pack(key, code, weight)
+            count += 1
+            if len(buffer) >= 1 << 20:
+                file.write(buffer)
+                buffer.clear()
+        file.write(buffer)
+    return count
@@ -0,0 +1,78 @@
+"""
+
+Parallel search in the style of Lazy SMP, using a pool of worker processes.
+
+Python runs one search per process, so to use more cores every worker process runs its own
+Search on the same root position. The workers do not split the tree between them: they
+cooperate only through a transposition table in shared memory. What one worker finds is a
+table hit for the others, so together they reach a deeper depth than one process would.
+Workers start at different depths so they do not all walk the tree in lockstep.
+
+When the time budget is over, the parent collects the result of every worker and picks the move
+of the deepest finished search, breaking ties by how many workers voted for the move.
+
+The pool and the shared table are created once and reused for every move. Call close()
+(or use the object as a context manager) to stop the workers and free the shared memory.
+
+"""
+
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.Search import Search
+from Designs.Chess.models.Tablebase import Tablebase
+from Designs.Chess.models.TranspositionTable import TranspositionTable
+
+_worker_search = None
+
+
+def _init_worker(table_name: str, size_mb: float, max_depth: int, tablebase: str = None):
+    global _worker_search
+    _worker_search = Search(max_depth, TranspositionTable(size_mb, name=table_name),
+                            Tablebase(tablebase) if tablebase else None)
+
+
+def _search_worker(board, time_limit_ms: int, start_depth: int, age: int):
+    _worker_search.tt.age = age
+    move = _worker_search.best_move(board, time_limit_ms, start_depth=start_depth)
+    return (None if move is None else move.encode(), _worker_search.completed_depth,
+            _worker_search.score, _worker_search.nodes)
+
+
+class ParallelSearch:
+    def __init__(self, workers: int = None, hash_mb: float = 64, max_depth: int = 64, tablebase: str = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.tt = TranspositionTable(hash_mb, shared=True)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                        initargs=(self.tt.name, hash_mb, max_depth, tablebase))
+        self.nodes = 0
+        self.completed_depth = 0
+        self.score = 0
+
+    def best_move(self, board, time_limit_ms: int):
+        self.tt.new_search()
+        jobs = [self.pool.submit(_search_worker, board, time_limit_ms, 1 + worker % 2, self.tt.age)
+                for worker in range(self.workers)]
+        results = [job.result() for job in jobs]
+        results = [result for result in results if result[0] is not None]
+        if not results:
+            return None
+
+        self.nodes = sum(result[3] for result in results)
+        self.completed_depth = max(result[1] for result in results)
+        deepest = [result for result in results if result[1] == self.completed_depth]
+        code, _ = Counter(result[0] for result in deepest).most_common(1)[0]
+        self.score = max(result[2] for result in deepest if result[0] == code)
+        return Move.decode(code)
+
+    def close(self):
+        self.pool.shutdown()
+        self.tt.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
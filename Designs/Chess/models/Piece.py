@@ -8,11 +8,25 @@ and we want to encapsulate these movement algorithms separately from the piece c
 We can also use Abstract Factory Pattern to create families of related chess pieces (like all white pieces or all black pieces)
 But for simplicity, we will focus on the Strategy Pattern here.
 
+Pieces are Flyweights: PieceFactory hands out one shared, immutable piece per (type, color), and
+all of them share one strategy object per type. A white pawn behaves the same on every square of
+every board, so thousands of live boards hold references to the same twelve objects. Anything
+that differs per game, like which pieces have been captured, is kept by the Board.
+
+Each strategy knows which squares its piece attacks from a given square (a lookup in the
+precomputed AttackTables), and `move` returns the legal moves of a piece on the board.
+The MoveGenerator asks the strategies for attacks and adds the board-dependent rules
+(pawn pushes, en passant, castling, king safety).
+
 """
 
 from abc import ABC, abstractmethod
 from enum import Enum
 
+from Designs.Chess.models.AttackTables import (
+    KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, rook_attacks, bishop_attacks, queen_attacks,
+)
+
 class PieceType(Enum):
     KING = "King"
     QUEEN = "Queen"
@@ -22,111 +36,145 @@ class PieceType(Enum):
     PAWN = "Pawn"
 
 class Piece(ABC):
-    def __init__(self):
-        self.isKilled = False
+    __slots__ = ("strategy", "isWhite")
+
+    def __init__(self, strategy, isWhite):
+        object.__setattr__(self, "strategy", strategy)
+        object.__setattr__(self, "isWhite", isWhite)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Pieces are shared flyweights and cannot be changed, the board keeps per-game state")
+
+    def __reduce__(self):
+        # Unpickled and copied pieces come back through the factory, as the shared instance
+        return PieceFactory.create_piece, (self.piece_type, self.isWhite)
 
     @abstractmethod
-    def move_strategy(self):
+    def move_strategy(self, board, x: int, y: int):
         pass
 
 class MovementStrategy(ABC):
     @abstractmethod
-    def move(self):
+    def attacks(self, square: int, occupied: int, isWhite: bool) -> int:
         pass
 
+    def move(self, board, x: int, y: int) -> list:
+        # Legal moves of the piece standing on (x, y)
+        return board.legal_moves(1 << (x * 8 + y))
+
 class KingMovementStrategy(MovementStrategy):
-    def move(self):
-        print("King moves one square in any direction")
+    def attacks(self, square, occupied, isWhite):
+        return KING_ATTACKS[square]
 
 class QueenMovementStrategy(MovementStrategy):
-    def move(self):
-        print("Queen moves any number of squares in any direction")
+    def attacks(self, square, occupied, isWhite):
+        return queen_attacks(square, occupied)
 
 class RookMovementStrategy(MovementStrategy):
-    def move(self):
-        print("Rook moves any number of squares horizontally or vertically")
+    def attacks(self, square, occupied, isWhite):
+        return rook_attacks(square, occupied)
 
 class BishopMovementStrategy(MovementStrategy):
-    def move(self):
-        print("Bishop moves any number of squares diagonally")
+    def attacks(self, square, occupied, isWhite):
+        return bishop_attacks(square, occupied)
 
 class KnightMovementStrategy(MovementStrategy):
-    def move(self):
-        print("Knight moves in an 'L' shape: two squares in one direction and then one square perpendicular")
+    def attacks(self, square, occupied, isWhite):
+        return KNIGHT_ATTACKS[square]
 
 class PawnMovementStrategy(MovementStrategy):
-    def move(self):
-        print("Pawn moves forward one square, with the option to move two squares on its first move")
+    def attacks(self, square, occupied, isWhite):
+        # Capture squares only, pushes depend on the board and are generated by the MoveGenerator
+        return PAWN_ATTACKS[0 if isWhite else 1][square]
 
 class King(Piece):
+    __slots__ = ()
+    piece_type = PieceType.KING
+
     def __init__(self, strategy, isWhite):
-        super().__init__()
-        self.strategy = strategy
-        self.isWhite = isWhite
+        super().__init__(strategy, isWhite)
 
-    def move_strategy(self):
-        self.strategy.move()
+    def move_strategy(self, board, x: int, y: int):
+        return self.strategy.move(board, x, y)
 
 class Queen(Piece):
+    __slots__ = ()
+    piece_type = PieceType.QUEEN
+
     def __init__(self, strategy, isWhite):
-        super().__init__()
-        self.strategy = strategy
-        self.isWhite = isWhite
+        super().__init__(strategy, isWhite)
 
-    def move_strategy(self):
-        self.strategy.move()
+    def move_strategy(self, board, x: int, y: int):
+        return self.strategy.move(board, x, y)
 
 class Rook(Piece):
+    __slots__ = ()
+    piece_type = PieceType.ROOK
+
     def __init__(self, strategy, isWhite):
-        super().__init__()
-        self.strategy = strategy
-        self.isWhite = isWhite
+        super().__init__(strategy, isWhite)
 
-    def move_strategy(self):
-        self.strategy.move()
+    def move_strategy(self, board, x: int, y: int):
+        return self.strategy.move(board, x, y)
 
 class Bishop(Piece):
+    __slots__ = ()
+    piece_type = PieceType.BISHOP
+
     def __init__(self, strategy, isWhite):
-        super().__init__()
-        self.strategy = strategy
-        self.isWhite = isWhite
+        super().__init__(strategy, isWhite)
 
-    def move_strategy(self):
-        self.strategy.move()
+    def move_strategy(self, board, x: int, y: int):
+        return self.strategy.move(board, x, y)
 
 class Knight(Piece):
+    __slots__ = ()
+    piece_type = PieceType.KNIGHT
+
     def __init__(self, strategy, isWhite):
-        super().__init__()
-        self.strategy = strategy
-        self.isWhite = isWhite
+        super().__init__(strategy, isWhite)
 
-    def move_strategy(self):
-        self.strategy.move()
+    def move_strategy(self, board, x: int, y: int):
+        return self.strategy.move(board, x, y)
 
 class Pawn(Piece):
+    __slots__ = ()
+    piece_type = PieceType.PAWN
+
     def __init__(self, strategy, isWhite):
-        super().__init__()
-        self.strategy = strategy
-        self.isWhite = isWhite
+        super().__init__(strategy, isWhite)
 
-    def move_strategy(self):
-        self.strategy.move()
+    def move_strategy(self, board, x: int, y: int):
+        return self.strategy.move(board, x, y)
 
 
 class PieceFactory:
+    # One shared piece per (type, color) and one shared strategy per type
+    _pieces = {}
+    _strategies = {
+        PieceType.KING: KingMovementStrategy(),
+        PieceType.QUEEN: QueenMovementStrategy(),
+        PieceType.ROOK: RookMovementStrategy(),
+        PieceType.BISHOP: BishopMovementStrategy(),
+        PieceType.KNIGHT: KnightMovementStrategy(),
+        PieceType.PAWN: PawnMovementStrategy(),
+    }
+    _classes = {
+        PieceType.KING: King,
+        PieceType.QUEEN: Queen,
+        PieceType.ROOK: Rook,
+        PieceType.BISHOP: Bishop,
+        PieceType.KNIGHT: Knight,
+        PieceType.PAWN: Pawn,
+    }
+
     @staticmethod
     def create_piece(piece_type: PieceType, isWhite: bool) -> Piece:
-        if piece_type == PieceType.KING:
-            return King(KingMovementStrategy(), isWhite)
-        elif piece_type == PieceType.QUEEN:
-            return Queen(QueenMovementStrategy(), isWhite)
-        elif piece_type == PieceType.ROOK:
-            return Rook(RookMovementStrategy(), isWhite)
-        elif piece_type == PieceType.BISHOP:
-            return Bishop(BishopMovementStrategy(), isWhite)
-        elif piece_type == PieceType.KNIGHT:
-            return Knight(KnightMovementStrategy(), isWhite)
-        elif piece_type == PieceType.PAWN:
-            return Pawn(PawnMovementStrategy(), isWhite)
-        else:
-            raise ValueError("Invalid Piece Type")
+        key = (piece_type, isWhite)
+        piece = PieceFactory._pieces.get(key)
+        if piece is None:
+            if piece_type not in PieceFactory._classes:
+                raise ValueError("Invalid Piece Type")
+            piece = PieceFactory._classes[piece_type](PieceFactory._strategies[piece_type], isWhite)
+            PieceFactory._pieces[key] = piece
+        return piece
@@ -4,8 +4,24 @@ This module defines the Player class, which represents a player in the chess gam
 We can also use Strategy Pattern to define different playing strategies for players
 (like aggressive, defensive, etc.), but for simplicity, we will just define the basic Player class here.
 
+A human Player types moves in UCI notation (e2e4, e7e8q). EnginePlayer is the computer player:
+it overrides get_move and asks the alpha-beta Search for the best move within its time budget.
+Its transposition table is capped at hash_mb megabytes (0 disables it). With workers > 1 it
+runs a ParallelSearch over that many processes sharing one table; call close() when done.
+Given an opening book (a path, see OpeningBook.py) it plays book moves while there are any
+and only starts searching once the game has left the book. Given a tablebase directory (see
+Tablebase.py) it plays endgames it has tables for perfectly.
+
 """
 
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.OpeningBook import OpeningBook
+from Designs.Chess.models.ParallelSearch import ParallelSearch
+from Designs.Chess.models.Search import Search
+from Designs.Chess.models.Tablebase import Tablebase
+from Designs.Chess.models.TranspositionTable import TranspositionTable
+
+
 class Player:
     def __init__(self, name, isWhite):
         self.name = name
@@ -15,4 +31,38 @@ class Player:
         return self.name
 
     def is_white(self):
-        return self.isWhite
\ No newline at end of file
+        return self.isWhite
+
+    def get_move(self, board) -> Move:
+        while True:
+            text = input(f"{self.name}, enter your move: ")
+            try:
+                return Move.from_uci(text)
+            except (ValueError, IndexError, KeyError):
+                print("Moves look like e2e4, or e7e8q for a promotion.")
+
+
+class EnginePlayer(Player):
+    def __init__(self, name, isWhite, time_limit_ms: int = 1000, max_depth: int = 64, hash_mb: float = 16,
+                 workers: int = 1, book: str = None, tablebase: str = None):
+        super().__init__(name, isWhite)
+        self.time_limit_ms = time_limit_ms
+        self.book = OpeningBook(book) if book else None
+        if workers > 1:
+            self.search = ParallelSearch(workers, hash_mb or 1, max_depth, tablebase)
+        else:
+            self.search = Search(max_depth, TranspositionTable(hash_mb) if hash_mb else None,
+                                 Tablebase(tablebase) if tablebase else None)
+
+    def get_move(self, board) -> Move:
+        if self.book is not None:
+            move = self.book.pick(board)
+            if move is not None:
+                return move
+        return self.search.best_move(board, self.time_limit_ms)
+
+    def close(self):
+        if self.book is not None:
+            self.book.close()
+        if isinstance(self.search, ParallelSearch):
+            self.search.close()
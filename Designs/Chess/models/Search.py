@@ -0,0 +1,237 @@
+"""
+
+Alpha-beta search used by the computer players.
+
+- Negamax with alpha-beta pruning, exploring moves in place with Board.make_move / unmake_move.
+- Iterative deepening: depth 1, 2, 3, ... until the time budget runs out. The best move of the
+  last finished iteration is returned, and it is searched first in the next iteration.
+- Move ordering: previous best move, then captures by MVV-LVA (most valuable victim, least
+  valuable attacker), promotions, killer moves (quiet moves that caused a cutoff at the same ply)
+  and the history heuristic (quiet moves that caused cutoffs anywhere).
+- Quiescence search: at the horizon only captures and promotions are searched, so the static
+  evaluation is never taken in the middle of an exchange. A side in check cannot stand pat
+  there, all its evasions are searched and a mate is scored as one.
+- Transposition table (optional): results are cached by position hash, giving cutoffs when a
+  position is reached again and a best move to try first.
+- Endgame tablebases (optional): once few enough pieces are left the exact result is looked up
+  instead of searched, and at the root the tablebase move is played straight away.
+
+nodes and cutoffs (beta cutoffs, in the main search and in quiescence) count the work of the
+last search, for the engine output and the profiling instrumentation (see Instrumentation.py).
+
+The time budget is a wall-clock limit in milliseconds. The search checks the clock every few
+hundred nodes and unwinds as soon as the deadline passes.
+
+"""
+
+import time
+
+from Designs.Chess.models.BitBoard import PAWN, KING
+from Designs.Chess.models.Evaluation import evaluate, PIECE_VALUES
+from Designs.Chess.models.Move import Move, CAPTURE, EN_PASSANT
+from Designs.Chess.models.Tablebase import Tablebase, WIN, LOSS
+from Designs.Chess.models.TranspositionTable import (
+    TranspositionTable, EXACT, LOWER, UPPER, score_to_table, score_from_table,
+)
+
+MATE = 100000
+INFINITY = 1000000
+MAX_PLY = 128
+CHECK_EVERY = 256
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class Search:
+    def __init__(self, max_depth: int = 64, transposition_table: TranspositionTable = None,
+                 tablebase: Tablebase = None):
+        self.max_depth = max_depth
+        self.tt = transposition_table
+        self.tablebase = tablebase
+        self.nodes = 0
+        self.cutoffs = 0
+        self.completed_depth = 0
+        self.score = 0
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[0] * 4096 for _ in range(2)]
+        self._deadline = None
+
+    def best_move(self, board, time_limit_ms: int, max_depth: int = None, start_depth: int = 1):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.completed_depth = 0
+        self.score = 0
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self._deadline = time.perf_counter() + time_limit_ms / 1000
+        if self.tt is not None:
+            self.tt.new_search()
+        undo_depth = len(board._undo_stack)
+
+        root_moves = board.legal_moves()
+        if not root_moves:
+            return None
+        if self.tablebase is not None:
+            result = self.tablebase.probe(board)
+            move = self.tablebase.best_move(board) if result is not None else None
+            if move is not None:
+                self.score = self._tablebase_score(result, 0)
+                return move
+        best = root_moves[0]
+        for depth in range(start_depth, (max_depth or self.max_depth) + 1):
+            try:
+                score, move = self._root(board, root_moves, best, depth)
+            except SearchTimeout:
+                while len(board._undo_stack) > undo_depth:
+                    board.unmake_move()
+                break
+            best = move
+            self.score = score
+            self.completed_depth = depth
+            if abs(score) >= MATE - MAX_PLY or len(root_moves) == 1:
+                break
+        return best
+
+    def _root(self, board, moves, previous_best, depth: int):
+        alpha = -INFINITY
+        best_move = previous_best
+        for move in self._order(board, moves, 0, previous_best):
+            board.make_move(move)
+            score = -self._negamax(board, depth - 1, -INFINITY, -alpha, 1)
+            board.unmake_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        if self.tt is not None:
+            self.tt.store(board.hash, depth, score_to_table(alpha, 0), EXACT, best_move.encode())
+        return alpha, best_move
+
+    def _negamax(self, board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        if board.halfmove_clock >= 100 or board.repetition_count() >= 2:
+            return 0
+
+        if self.tablebase is not None:
+            result = self.tablebase.probe(board)
+            if result is not None:
+                return self._tablebase_score(result, ply)
+
+        checked = board.checkers
+        if checked:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiesce(board, alpha, beta, ply)
+
+        tt_move = None
+        if self.tt is not None:
+            entry = self.tt.probe(board.hash)
+            if entry is not None:
+                tt_depth, tt_score, bound, move_code = entry
+                if move_code:
+                    tt_move = Move.decode(move_code)
+                if tt_depth >= depth:
+                    tt_score = score_from_table(tt_score, ply)
+                    if (bound == EXACT or (bound == LOWER and tt_score >= beta)
+                            or (bound == UPPER and tt_score <= alpha)):
+                        return tt_score
+
+        moves = board.legal_moves()
+        if not moves:
+            return -MATE + ply if checked else 0
+
+        original_alpha = alpha
+        best = -INFINITY
+        best_move = None
+        for move in self._order(board, moves, ply, tt_move):
+            board.make_move(move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score > best:
+                best = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    if not move.is_capture() and move.promotion is None:
+                        self._remember_cutoff(board, move, depth, ply)
+                    break
+
+        if self.tt is not None:
+            bound = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+            self.tt.store(board.hash, depth, score_to_table(best, ply), bound, best_move.encode())
+        return best
+
+    def _quiesce(self, board, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        if board.checkers:
+            # No standing pat in check: every evasion is searched, and having none is mate
+            moves = board.legal_moves()
+            if not moves:
+                return -MATE + ply
+            if ply >= MAX_PLY - 1:
+                return evaluate(board)
+        else:
+            stand_pat = evaluate(board)
+            if stand_pat >= beta or ply >= MAX_PLY - 1:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+            moves = [move for move in board.legal_moves() if move.is_capture() or move.promotion is not None]
+
+        for move in self._order(board, moves, ply):
+            board.make_move(move)
+            score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score >= beta:
+                self.cutoffs += 1
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    @staticmethod
+    def _tablebase_score(result, ply: int) -> int:
+        wdl, dtm = result
+        if wdl == WIN:
+            return MATE - ply - dtm
+        if wdl == LOSS:
+            return -MATE + ply + dtm
+        return 0
+
+    def _remember_cutoff(self, board, move, depth: int, ply: int):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[board.side_to_move()][move.from_square * 64 + move.to_square] += depth * depth
+
+    def _order(self, board, moves, ply: int, best=None):
+        bitboard = board.bitboard
+        killers = self.killers[ply] if ply < MAX_PLY else (None, None)
+        history = self.history[board.side_to_move()]
+
+        def score(move):
+            if move == best:
+                return 10_000_000
+            if move.flags & CAPTURE:
+                victim = bitboard.piece_at(move.to_square)[0]
+                attacker = bitboard.piece_at(move.from_square)[0]
+                return 1_000_000 + PIECE_VALUES[victim] * 10 - (attacker if attacker != KING else 6)
+            if move.flags & EN_PASSANT:
+                return 1_000_000 + PIECE_VALUES[PAWN] * 10
+            if move.promotion is not None:
+                return 900_000 + PIECE_VALUES[move.promotion]
+            if move == killers[0]:
+                return 800_000
+            if move == killers[1]:
+                return 700_000
+            return history[move.from_square * 64 + move.to_square]
+
+        return sorted(moves, key=score, reverse=True)
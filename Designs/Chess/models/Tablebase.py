@@ -0,0 +1,354 @@
+"""
+
+Endgame tablebases: the exact result of every position of an ending with few pieces.
+
+A table covers one material signature, like KQvK or KRvKP (the pieces of the stronger side
+first), and stores two bytes per position, found by a direct index (no search, no hashing):
+
+    wdl  win / draw / loss for the side to move (or illegal position)
+    dtm  distance to mate in plies
+
+The index of a position is its squares packed 6 bits per piece, white pieces first, plus
+one bit for the side to move, so a table holds 2 * 64^n entries (1 MB for three pieces,
+64 MB for four). Positions where the weaker side is White are probed by mirroring the board
+vertically and swapping the colors.
+
+Tables are generated by retrograde analysis. A forward pass visits every position once: it
+finds the checkmates and stalemates, settles captures and promotions by probing the smaller
+tables they lead to, and counts the moves that stay inside the table. Then, starting from the
+mates, results are propagated backwards in order of distance, generating predecessor
+positions by un-moving pieces: a position is won as soon as one move reaches a lost position,
+and lost once every move has been shown to reach a won one. What is never reached is drawn.
+Smaller tables a signature depends on are generated first.
+
+Generation is pure Python and scales with the table: a three-piece table takes 10 to 20
+seconds, a four-piece one (KRvKN) about 24 minutes and 450 MB. Four pieces is the practical
+limit, five would be 64 times that.
+
+Castling and en passant are not part of a table, positions that still have either are not probed.
+Because of that, endings with pawns on both sides (KPvKP and the like) are refused: a double
+push there can allow an en passant capture, and the position after it would be scored as if it
+did not. The search plays those endings.
+
+Usage (from the repository root):
+    python -m Designs.Chess.Endgames KQvK KRvK KPvK --directory tablebases
+
+"""
+
+import mmap
+import os
+
+from Designs.Chess.models.BitBoard import BitBoard, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from Designs.Chess.models.Evaluation import PIECE_VALUES
+from Designs.Chess.models.MoveGenerator import generate_moves, is_square_attacked, king_square, STRATEGIES
+
+DRAW = 0
+WIN = 1
+LOSS = 2
+ILLEGAL = 3
+
+MAX_DTM = 254
+LETTERS = "PNBRQK"
+PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+# Endings without mating material, there is nothing to generate for them
+DRAWN = {"KvK", "KBvK", "KNvK"}
+# Squares a pawn can not stand on
+PAWN_RANKS = 0xFF000000000000FF
+
+
+class TablebaseError(Exception):
+    pass
+
+
+def signature_of(white: list, black: list) -> str:
+    return ("".join(LETTERS[kind] for kind in sorted(white, reverse=True)) + "v"
+            + "".join(LETTERS[kind] for kind in sorted(black, reverse=True)))
+
+
+def parse_signature(signature: str):
+    # "KRvKP" -> ([KING, ROOK], [KING, PAWN])
+    try:
+        white, black = signature.split("v")
+        sides = [sorted((LETTERS.index(letter) for letter in side), reverse=True) for side in (white, black)]
+    except ValueError:
+        raise TablebaseError(f"Bad material signature {signature!r}")
+    if any(side.count(KING) != 1 for side in sides):
+        raise TablebaseError(f"Each side needs exactly one king: {signature!r}")
+    return sides[0], sides[1]
+
+
+def _strength(kinds: list):
+    return sum(PIECE_VALUES[kind] for kind in kinds), sorted(kinds, reverse=True)
+
+
+def canonical(pieces: list, isWhiteTurn: bool):
+    # pieces is [(kind, color, square)]; -> (signature, pieces in index order, isWhiteTurn)
+    # with the stronger side as White, mirroring the position when needed
+    white = [kind for kind, color, _ in pieces if color == WHITE]
+    black = [kind for kind, color, _ in pieces if color == BLACK]
+    if _strength(black) > _strength(white):
+        pieces = [(kind, 1 - color, square ^ 56) for kind, color, square in pieces]
+        white, black = black, white
+        isWhiteTurn = not isWhiteTurn
+    return signature_of(white, black), sorted(pieces, key=lambda piece: (piece[1], -piece[0])), isWhiteTurn
+
+
+def _pack(pieces: list, isWhiteTurn: bool) -> int:
+    index = 0
+    for slot, (_, _, square) in enumerate(pieces):
+        index |= square << (6 * slot)
+    return index if isWhiteTurn else index | 1 << (6 * len(pieces))
+
+
+class Tablebase:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._tables = {}
+        self.max_pieces = 0
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.endswith(".tb"):
+                    self.max_pieces = max(self.max_pieces, len(name) - 4)
+
+    def __getstate__(self):
+        return {"directory": self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(state["directory"])
+
+    def path(self, signature: str) -> str:
+        return os.path.join(self.directory, signature + ".tb")
+
+    def has_table(self, signature: str) -> bool:
+        return signature in DRAWN or os.path.exists(self.path(signature))
+
+    def _table(self, signature: str):
+        table = self._tables.get(signature)
+        if table is None:
+            path = self.path(signature)
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as file:
+                table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._tables[signature] = table
+        return table
+
+    def close(self):
+        for table in self._tables.values():
+            table.close()
+        self._tables = {}
+
+    def probe_pieces(self, pieces: list, isWhiteTurn: bool):
+        # -> (wdl, dtm) for the side to move, None without a table
+        signature, ordered, isWhiteTurn = canonical(pieces, isWhiteTurn)
+        if signature in DRAWN:
+            return DRAW, 0
+        table = self._table(signature)
+        if table is None:
+            return None
+        index = _pack(ordered, isWhiteTurn)
+        size = len(table) // 2
+        return table[index], table[size + index]
+
+    def probe(self, board):
+        bitboard = board.bitboard
+        if (board.castling_rights or board.en_passant is not None
+                or bitboard.occupied.bit_count() > self.max_pieces):
+            return None
+        pieces = []
+        for index, bits in enumerate(bitboard.pieces):
+            while bits:
+                low = bits & -bits
+                bits ^= low
+                pieces.append((index % 6, index // 6, low.bit_length() - 1))
+        return self.probe_pieces(pieces, board.isWhiteTurn)
+
+    def best_move(self, board):
+        # The move keeping the best result: fastest win, else a draw, else the slowest loss
+        best = None
+        best_rank = None
+        for move in board.legal_moves():
+            board.make_move(move)
+            result = self.probe(board)
+            board.unmake_move()
+            if result is None:
+                return None
+            wdl, dtm = result
+            rank = (2, -dtm) if wdl == LOSS else (0, dtm) if wdl == WIN else (1, 0)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = move, rank
+        return best
+
+
+def dependencies(signature: str) -> list:
+    # The signatures reachable by one capture or promotion
+    white, black = parse_signature(signature)
+    result = set()
+    for own, other in ((white, black), (black, white)):
+        for slot, kind in enumerate(own):
+            if kind == KING:
+                continue
+            rest = own[:slot] + own[slot + 1:]
+            result.add(canonical([(k, WHITE, 8) for k in rest] + [(k, BLACK, 8) for k in other], True)[0])
+            if kind == PAWN:
+                for promotion in PROMOTIONS:
+                    result.add(canonical([(k, WHITE, 8) for k in rest + [promotion]]
+                                         + [(k, BLACK, 8) for k in other], True)[0])
+    result.discard(signature)
+    return sorted(result)
+
+
+def generate(signature: str, directory: str, log=None) -> str:
+    # Writes <directory>/<signature>.tb, generating the tables it depends on first
+    white, black = parse_signature(signature)
+    if PAWN in white and PAWN in black:
+        raise TablebaseError(f"{signature}: en passant is not part of the tables, pawns on both sides are not supported")
+    signature = canonical([(k, WHITE, 8) for k in white] + [(k, BLACK, 8) for k in black], True)[0]
+    os.makedirs(directory, exist_ok=True)
+    tablebase = Tablebase(directory)
+    for dependency in dependencies(signature):
+        if not tablebase.has_table(dependency):
+            generate(dependency, directory, log)
+    tablebase = Tablebase(directory)
+    if signature in DRAWN or tablebase.has_table(signature):
+        return tablebase.path(signature)
+
+    white, black = parse_signature(signature)
+    kinds = white + black
+    colors = [WHITE] * len(white) + [BLACK] * len(black)
+    count = len(kinds)
+    side_bit = 1 << (6 * count)
+    size = 2 * side_bit
+    wdl = bytearray(size)
+    dtm = bytearray(size)
+    moves_left = bytearray(size)
+    longest = bytearray(size)
+    buckets = [[] for _ in range(MAX_DTM + 2)]
+    bitboard = BitBoard()
+
+    # Forward pass
+    for index in range(size):
+        color = BLACK if index & side_bit else WHITE
+        squares = [(index >> (6 * slot)) & 63 for slot in range(count)]
+        occupied = 0
+        legal = True
+        for slot in range(count):
+            bit = 1 << squares[slot]
+            if occupied & bit or (kinds[slot] == PAWN and bit & PAWN_RANKS):
+                legal = False
+                break
+            occupied |= bit
+        if not legal:
+            wdl[index] = ILLEGAL
+            continue
+        pieces = [0] * 12
+        for slot in range(count):
+            pieces[colors[slot] * 6 + kinds[slot]] |= 1 << squares[slot]
+        bitboard.pieces = pieces
+        bitboard.occupancy = [sum(pieces[:6]), sum(pieces[6:])]
+        bitboard.occupied = occupied
+        if is_square_attacked(bitboard, king_square(bitboard, 1 - color), color):
+            wdl[index] = ILLEGAL
+            continue
+
+        moves = generate_moves(bitboard, color, 0, None)
+        if not moves:
+            if is_square_attacked(bitboard, king_square(bitboard, color), 1 - color):
+                buckets[0].append((index, LOSS))
+            continue
+
+        inside = 0
+        best_win = None
+        slowest = 0
+        drawn = False
+        for move in moves:
+            slot = squares.index(move.from_square)
+            if move.promotion is None and not occupied & (1 << move.to_square):
+                inside += 1
+                continue
+            child = [(kinds[other], colors[other], squares[other]) for other in range(count)
+                     if other != slot and squares[other] != move.to_square]
+            child.append((kinds[slot] if move.promotion is None else move.promotion, color, move.to_square))
+            result = tablebase.probe_pieces(child, color == BLACK)
+            if result is None:
+                raise TablebaseError(f"Missing table for {canonical(child, True)[0]}")
+            child_wdl, child_dtm = result
+            if child_wdl == LOSS:
+                if best_win is None or child_dtm + 1 < best_win:
+                    best_win = child_dtm + 1
+            elif child_wdl == WIN:
+                slowest = max(slowest, child_dtm + 1)
+            else:
+                drawn = True
+
+        moves_left[index] = inside
+        longest[index] = 255 if drawn else min(slowest, MAX_DTM)
+        if best_win is not None:
+            buckets[min(best_win, MAX_DTM)].append((index, WIN))
+        elif not inside and not drawn:
+            buckets[min(slowest, MAX_DTM)].append((index, LOSS))
+
+    # Retrograde pass, in order of distance to mate
+    for distance in range(MAX_DTM + 1):
+        bucket = buckets[distance]
+        while bucket:
+            index, result = bucket.pop()
+            if wdl[index] != DRAW:
+                continue
+            wdl[index] = result
+            dtm[index] = distance
+            following = min(distance + 1, MAX_DTM)
+            for parent in _unmoves(index, kinds, colors, count, side_bit):
+                if wdl[parent] != DRAW:
+                    continue
+                if result == LOSS:
+                    buckets[following].append((parent, WIN))
+                else:
+                    moves_left[parent] -= 1
+                    if longest[parent] == 255:
+                        continue
+                    if following > longest[parent]:
+                        longest[parent] = following
+                    if not moves_left[parent]:
+                        buckets[longest[parent]].append((parent, LOSS))
+
+    path = tablebase.path(signature)
+    with open(path + ".tmp", "wb") as file:
+        file.write(wdl)
+        file.write(dtm)
+    os.replace(path + ".tmp", path)
+    if log is not None:
+        log(f"{signature}: {wdl.count(WIN)} won, {wdl.count(LOSS)} lost, {wdl.count(DRAW)} drawn, "
+            f"longest mate {max(dtm)} plies")
+    return path
+
+
+def _unmoves(index: int, kinds: list, colors: list, count: int, side_bit: int):
+    # Indexes of the positions that reach this one with a quiet, non-promoting move
+    mover = WHITE if index & side_bit else BLACK
+    parent_side = index ^ side_bit
+    squares = [(index >> (6 * slot)) & 63 for slot in range(count)]
+    occupied = 0
+    for square in squares:
+        occupied |= 1 << square
+    for slot in range(count):
+        if colors[slot] != mover:
+            continue
+        square = squares[slot]
+        base = parent_side & ~(63 << (6 * slot))
+        kind = kinds[slot]
+        if kind == PAWN:
+            # White pawns move towards square 0, so they came from a higher square
+            back = 8 if mover == WHITE else -8
+            source = square + back
+            if not occupied & (1 << source) and not (1 << source) & PAWN_RANKS:
+                yield base | source << (6 * slot)
+                double = source + back
+                if (16 <= source < 24 if mover == BLACK else 40 <= source < 48) and not occupied & (1 << double):
+                    yield base | double << (6 * slot)
+            continue
+        sources = STRATEGIES[kind].attacks(square, occupied, mover == WHITE) & ~occupied
+        while sources:
+            low = sources & -sources
+            sources ^= low
+            yield base | (low.bit_length() - 1) << (6 * slot)
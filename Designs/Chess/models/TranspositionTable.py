@@ -0,0 +1,126 @@
+"""
+
+Transposition table: a fixed-size cache of search results keyed by the Zobrist hash.
+
+The same position is reached through different move orders many times during a search, so the
+search stores what it learnt about a position (depth searched, score, bound type and best move)
+and reuses it the next time it gets there.
+
+The table lives in one preallocated buffer whose size is given in MB, so its memory use is
+known up front and never grows. Each entry takes two 64-bit words:
+
+    key   the Zobrist key XOR data, used to detect index collisions
+    data  move (16 bits) | depth (8) | bound (2) | age (6) | score + 2^31 (32)
+
+Storing key XOR data instead of the key makes the entry self-checking: the table can live in
+shared memory and be written by several processes without locks (see ParallelSearch.py), and
+an entry torn by two concurrent writes simply fails the key check on probe.
+
+The index is the low bits of the key. When two positions compete for the same slot the
+replacement policy decides: ALWAYS_REPLACE keeps the newest result, DEPTH_PREFERRED keeps the
+deeper one unless it is left over from an earlier search.
+
+"""
+
+from enum import Enum
+from multiprocessing import shared_memory
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+ENTRY_BYTES = 16
+MATE_BOUND = 100000 - 256
+
+
+class ReplacementPolicy(Enum):
+    ALWAYS_REPLACE = "Always replace"
+    DEPTH_PREFERRED = "Depth preferred"
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: float = 16, policy: ReplacementPolicy = ReplacementPolicy.DEPTH_PREFERRED,
+                 shared: bool = False, name: str = None):
+        entries = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        # Round down to a power of two so the index is a mask of the key
+        self.size = 1 << (entries.bit_length() - 1)
+        self.mask = self.size - 1
+        self.size_mb = size_mb
+        self.policy = policy
+        self.age = 0
+        self.shared_memory = None
+        self._owner = False
+        if name is not None:
+            # Attaching to a table created by another process, only the creator unlinks it
+            self.shared_memory = shared_memory.SharedMemory(name=name)
+        elif shared:
+            self.shared_memory = shared_memory.SharedMemory(create=True, size=self.size * ENTRY_BYTES)
+            self._owner = True
+        if self.shared_memory is not None:
+            self.table = self.shared_memory.buf[:self.size * ENTRY_BYTES].cast("Q")
+        else:
+            self.table = memoryview(bytearray(self.size * ENTRY_BYTES)).cast("Q")
+
+    @property
+    def name(self):
+        return None if self.shared_memory is None else self.shared_memory.name
+
+    def close(self):
+        self.table.release()
+        if self.shared_memory is not None:
+            self.shared_memory.close()
+            if self._owner:
+                self.shared_memory.unlink()
+
+    def new_search(self):
+        self.age = (self.age + 1) & 63
+
+    def clear(self):
+        self.table[:] = memoryview(bytearray(self.size * ENTRY_BYTES)).cast("Q")
+        self.age = 0
+
+    def probe(self, key: int):
+        index = (key & self.mask) << 1
+        data = self.table[index + 1]
+        if self.table[index] ^ data != key:
+            return None
+        return (data >> 40) & 255, (data & 0xFFFFFFFF) - (1 << 31), (data >> 38) & 3, data >> 48
+
+    def store(self, key: int, depth: int, score: int, bound: int, move_code: int = 0):
+        index = (key & self.mask) << 1
+        table = self.table
+        old_data = table[index + 1]
+        same_position = table[index] ^ old_data == key
+        if self.policy == ReplacementPolicy.DEPTH_PREFERRED:
+            if (not same_position and old_data
+                    and (old_data >> 32) & 63 == self.age and (old_data >> 40) & 255 > depth):
+                return
+        if not move_code and same_position:
+            move_code = old_data >> 48
+        data = (move_code << 48 | max(0, min(depth, 255)) << 40 | bound << 38
+                | self.age << 32 | (score + (1 << 31)))
+        table[index] = key ^ data
+        table[index + 1] = data
+
+    def usage(self) -> float:
+        # Fraction of the first thousand slots that hold an entry from the current search
+        sample = min(self.size, 1000)
+        used = sum(1 for slot in range(sample) if self.table[2 * slot + 1] and (self.table[2 * slot + 1] >> 32) & 63 == self.age)
+        return used / sample
+
+
+def score_to_table(score: int, ply: int) -> int:
+    # Mate scores are stored relative to the position, not to the root
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_table(score: int, ply: int) -> int:
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
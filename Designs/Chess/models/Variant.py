@@ -0,0 +1,225 @@
+"""
+
+Variant descriptors: the board size and piece set of a chess variant.
+
+A Variant lists its PieceDefinitions. Every piece except the pawn is described by how it moves:
+leaps (fixed jumps like the knight's) and slides (directions it rides until blocked). New
+pieces are combinations of the two, like the Archbishop (bishop + knight) and the Chancellor
+(rook + knight) of Capablanca chess, so a variant never needs new move generation code.
+
+The geometry is turned into tables once per variant, the first time a board of that variant
+is created, and cached on the Variant (VariantTables):
+
+- leap attacks: one bitboard of target squares per piece kind and square
+- rays: per direction and square, the bitboard of the squares until the edge. A slide is the
+  ray minus the ray behind the first blocker, which is the nearest set bit of ray & occupied:
+  the lowest one for directions that go up in square numbers, the highest for the others.
+- pawn attacks, pushes and the start and promotion rows per color (pawns step twice from the
+  row they start on and promote on the last row)
+- castling: per side the squares the king and rook move between, the squares that must be empty
+  and the squares the king must not be attacked on
+
+Variants differ in more than geometry, the descriptor also carries their rules:
+
+- castling: per side (king's side first, FEN letters K/Q), the files the king goes to and the
+  rook goes from and to, with the king starting on its file in start_fen. Capablanca chess
+  castles like standard chess, the king moving three files on the wider board.
+- promotion_ranks: how many ranks at the far end pawns may promote on. Promotion on the last
+  one is mandatory, on the ranks before it optional.
+- promote_to_captured: pawns only promote to a kind of piece their side has fewer of than at
+  the start, as in Grand chess (where a pawn may not step onto the last rank while no piece
+  of its side has been captured).
+
+So a 10x10 board is generated with the same few table lookups per piece as an 8x8 one, there
+are no bounds checks or coordinate arithmetic left when moves are generated. VariantBoard
+(see VariantBoard.py) plays any variant on these tables.
+
+Squares follow the cell grid: square = x * width + y, with x = 0 the row Black starts on.
+
+"""
+
+import re
+from functools import partial
+
+KNIGHT_LEAPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_LEAPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+ORTHOGONAL = ((1, 0), (-1, 0), (0, 1), (0, -1))
+DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class PieceDefinition:
+    __slots__ = ("name", "letter", "value", "leaps", "slides")
+
+    def __init__(self, name: str, letter: str, value: int, leaps: tuple = (), slides: tuple = ()):
+        self.name = name
+        self.letter = letter.upper()
+        self.value = value
+        self.leaps = leaps
+        self.slides = slides
+
+    def __repr__(self):
+        return f"PieceDefinition({self.name})"
+
+
+# Pawn moves depend on color and board state, the move generator handles them
+PAWN = PieceDefinition("Pawn", "P", 100)
+KNIGHT = PieceDefinition("Knight", "N", 320, leaps=KNIGHT_LEAPS)
+BISHOP = PieceDefinition("Bishop", "B", 330, slides=DIAGONAL)
+ROOK = PieceDefinition("Rook", "R", 500, slides=ORTHOGONAL)
+QUEEN = PieceDefinition("Queen", "Q", 900, slides=ORTHOGONAL + DIAGONAL)
+KING = PieceDefinition("King", "K", 0, leaps=KING_LEAPS)
+ARCHBISHOP = PieceDefinition("Archbishop", "A", 875, leaps=KNIGHT_LEAPS, slides=DIAGONAL)
+CHANCELLOR = PieceDefinition("Chancellor", "C", 950, leaps=KNIGHT_LEAPS, slides=ORTHOGONAL)
+
+
+class VariantTables:
+    def __init__(self, variant: "Variant"):
+        width, height = variant.width, variant.height
+        self.size = width * height
+
+        def on_board(x, y):
+            return 0 <= x < height and 0 <= y < width
+
+        def leap_table(leaps):
+            table = []
+            for square in range(self.size):
+                x, y = divmod(square, width)
+                mask = 0
+                for dx, dy in leaps:
+                    if on_board(x + dx, y + dy):
+                        mask |= 1 << ((x + dx) * width + y + dy)
+                table.append(mask)
+            return table
+
+        self.rays = {}
+        for piece in variant.pieces:
+            for dx, dy in piece.slides:
+                if (dx, dy) in self.rays:
+                    continue
+                table = []
+                for square in range(self.size):
+                    x, y = divmod(square, width)
+                    mask = 0
+                    x, y = x + dx, y + dy
+                    while on_board(x, y):
+                        mask |= 1 << (x * width + y)
+                        x, y = x + dx, y + dy
+                    table.append(mask)
+                self.rays[(dx, dy)] = table
+
+        # moves[kind] = (leap table or None, ((ray table, direction goes up in square numbers), ...))
+        self.moves = []
+        for piece in variant.pieces:
+            leaps = leap_table(piece.leaps) if piece.leaps else None
+            rays = tuple((self.rays[direction], direction[0] * width + direction[1] > 0) for direction in piece.slides)
+            self.moves.append((leaps, rays))
+
+        # For attack checks pieces are grouped by move: one lookup per leap pattern and one slide per
+        # direction tells whether any piece of any kind moving that way attacks a square
+        # (VariantBoard.attack_sets, checked by MoveGenerator.square_attacked)
+        leap_groups = {}
+        slide_groups = {}
+        for kind, piece in enumerate(variant.pieces):
+            if piece.leaps:
+                leap_groups.setdefault(piece.leaps, (self.moves[kind][0], []))[1].append(kind)
+            for direction in piece.slides:
+                ray = ((self.rays[direction], direction[0] * width + direction[1] > 0),)
+                slide_groups.setdefault(direction, (partial(slide_attacks, rays=ray), []))[1].append(kind)
+        self.leap_groups = [(table, tuple(kinds)) for table, kinds in leap_groups.values()]
+        self.slide_groups = [(slide, tuple(kinds)) for slide, kinds in slide_groups.values()]
+
+        # White pawns move towards row 0
+        self.pawn_attacks = (leap_table(((-1, -1), (-1, 1))), leap_table(((1, -1), (1, 1))))
+        self.pawn_step = (-width, width)
+        row = (1 << width) - 1
+        self.promotion_rows = (row, row << (width * (height - 1)))
+        # Promotion is optional on the rows of the zone before the last one
+        self.promotion_zones = (
+            sum(row << (width * x) for x in range(1, variant.promotion_ranks)),
+            sum(row << (width * (height - 1 - x)) for x in range(1, variant.promotion_ranks)),
+        )
+        # Pawns may step twice from the row they start on
+        self.pawn_start_rows = tuple(row << (width * x) for x in variant.pawn_rows)
+        self.full = (1 << self.size) - 1
+
+        # (color, right, king from, king to, rook from, rook to, squares that must be empty,
+        #  squares the king must not be attacked on); castling_keep[square] = rights kept after
+        # a move from or to the square
+        self.castling = []
+        self.castling_moves = {}
+        self.castling_keep = [15] * self.size
+        for color, x in enumerate((height - 1, 0)):
+            for side, (king_to, rook_from, rook_to) in enumerate(variant.castling):
+                right = 1 << (2 * color + side)
+                king, rook = x * width + variant.king_file, x * width + rook_from
+                target, rook_target = x * width + king_to, x * width + rook_to
+                squares = (king, rook, target, rook_target)
+                empty = 0
+                for square in range(min(squares), max(squares) + 1):
+                    if square not in (king, rook):
+                        empty |= 1 << square
+                path = tuple(range(min(king, target), max(king, target) + 1))
+                self.castling.append((color, right, king, target, rook, rook_target, empty, path))
+                self.castling_moves[(king, target)] = (rook, rook_target)
+                self.castling_keep[king] &= ~right
+                self.castling_keep[rook] &= ~right
+
+
+def slide_attacks(square: int, occupied: int, rays: tuple) -> int:
+    attacks = 0
+    for table, increasing in rays:
+        ray = table[square]
+        blockers = ray & occupied
+        if blockers:
+            first = (blockers & -blockers).bit_length() - 1 if increasing else blockers.bit_length() - 1
+            ray ^= table[first]
+        attacks |= ray
+    return attacks
+
+
+class Variant:
+    def __init__(self, name: str, width: int, height: int, pieces: tuple, start_fen: str, castling: tuple = (),
+                 promotion_ranks: int = 1, promote_to_captured: bool = False):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.pieces = pieces
+        self.start_fen = start_fen
+        self.castling = castling
+        self.promotion_ranks = promotion_ranks
+        self.promote_to_captured = promote_to_captured
+        self.letters = "".join(piece.letter for piece in pieces)
+        self.pawn = self.letters.index("P")
+        self.king = self.letters.index("K")
+        self.promotions = tuple(kind for kind in range(len(pieces)) if kind not in (self.pawn, self.king))
+        rows = start_fen.split()[0].split("/")
+        self.pawn_rows = tuple(next(x for x, row in enumerate(rows) if letter in row) for letter in "Pp")
+        # Pieces per (color, kind) index at the start, for promote_to_captured
+        placement = start_fen.split()[0]
+        self.initial_counts = tuple(placement.count(letter) for letter in self.letters + self.letters.lower())
+        # File the white king starts on, castling starts from there
+        first_row = re.sub(r"\d+", lambda digits: "." * int(digits.group()), rows[-1])
+        self.king_file = first_row.find("K") if castling else None
+        self._tables = None
+
+    @property
+    def tables(self) -> VariantTables:
+        if self._tables is None:
+            self._tables = VariantTables(self)
+        return self._tables
+
+    def __repr__(self):
+        return f"Variant({self.name}, {self.width}x{self.height})"
+
+
+STANDARD = Variant("Standard", 8, 8, (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING),
+                   "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+                   castling=((6, 7, 5), (2, 0, 3)))
+CAPABLANCA = Variant("Capablanca", 10, 8, (PAWN, KNIGHT, BISHOP, ROOK, ARCHBISHOP, CHANCELLOR, QUEEN, KING),
+                     "rnabqkbcnr/pppppppppp/10/10/10/10/PPPPPPPPPP/RNABQKBCNR w KQkq - 0 1",
+                     castling=((8, 9, 7), (2, 0, 3)))
+# No castling in Grand chess
+GRAND = Variant("Grand", 10, 10, (PAWN, KNIGHT, BISHOP, ROOK, ARCHBISHOP, CHANCELLOR, QUEEN, KING),
+                "r8r/1nbqkcabn1/pppppppppp/10/10/10/10/PPPPPPPPPP/1NBQKCABN1/R8R w - - 0 1",
+                promotion_ranks=3, promote_to_captured=True)
+VARIANTS = {variant.name.lower(): variant for variant in (STANDARD, CAPABLANCA, GRAND)}
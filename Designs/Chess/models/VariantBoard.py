@@ -0,0 +1,338 @@
+"""
+
+A board for any Variant (see Variant.py): any width and height, any set of leaping and sliding pieces.
+
+The position is kept as one bitboard per (color, kind), like BitBoard, only with width * height
+bits, plus a mailbox list (the piece index on every square) so make_move finds the captured
+piece without scanning. Moves are generated from the variant's cached tables: a leap is one
+table lookup, a slide is one lookup per direction plus a bit scan. A move is kept when the own
+king is not attacked afterwards, which is checked against the occupancy the move would produce
+by the attack check of MoveGenerator (square_attacked / king_safe_after), given attack sets
+built from the variant's tables.
+
+make_move / unmake_move work in place with an undo stack. Castling, en passant and promotion
+follow the variant's rules (see Variant.py). Like Board.make_move, make_move works out en
+passant, double pushes and castling from the piece and the squares, so a plain Move(src, dst)
+from a player is enough.
+
+VariantBoard is a move generation model: FEN in and out, legal moves, make / unmake and perft.
+It does not have the rest of the Board API (validate_move, Zobrist hashing, boardstate,
+repetition and the fifty-move rule as game results), so the players, the Server and the PGN
+code work with the standard Board only. The standard 8x8 game keeps its own specialised
+Board; VariantBoard(STANDARD) plays the same moves and gives the same perft counts.
+
+"""
+
+from Designs.Chess.models.Move import Move, CAPTURE, DOUBLE_PUSH, EN_PASSANT, CASTLE
+from Designs.Chess.models.MoveGenerator import square_attacked, king_safe_after
+from Designs.Chess.models.Variant import Variant, STANDARD, slide_attacks
+
+WHITE = 0
+BLACK = 1
+
+
+class VariantBoard:
+    def __init__(self, variant: Variant = STANDARD, fen: str = None):
+        self.variant = variant
+        self.tables = variant.tables
+        self.kinds = len(variant.pieces)
+        self.set_fen(fen or variant.start_fen)
+
+    def set_fen(self, fen: str):
+        variant = self.variant
+        fields = fen.split()
+        rows = fields[0].split("/")
+        if len(rows) != variant.height:
+            raise ValueError(f"{variant.name} needs {variant.height} rows: {fen!r}")
+        self.pieces = [0] * (2 * self.kinds)
+        self.mailbox = [None] * self.tables.size
+        for x, row in enumerate(rows):
+            y = 0
+            number = ""
+            for char in row + " ":
+                if char.isdigit():
+                    number += char
+                    continue
+                if number:
+                    y += int(number)
+                    number = ""
+                if char == " ":
+                    break
+                kind = variant.letters.find(char.upper())
+                if kind < 0 or y >= variant.width:
+                    raise ValueError(f"Bad piece placement: {fen!r}")
+                self._put(x * variant.width + y, (WHITE if char.isupper() else BLACK) * self.kinds + kind)
+                y += 1
+            if y != variant.width:
+                raise ValueError(f"Row with other than {variant.width} squares: {fen!r}")
+        self.isWhiteTurn = len(fields) < 2 or fields[1] == "w"
+        self.castling_rights = 0
+        if len(fields) > 2 and fields[2] != "-":
+            for color, letters in enumerate(("KQ", "kq")):
+                for side, letter in enumerate(letters[:len(variant.castling)]):
+                    if letter in fields[2]:
+                        self.castling_rights |= 1 << (2 * color + side)
+        # A right is only kept while its king and rook are on their home squares
+        for color, right, king, _, rook, _, _, _ in self.tables.castling:
+            if (self.mailbox[king] != color * self.kinds + variant.king
+                    or self.mailbox[rook] != color * self.kinds + variant.letters.index("R")):
+                self.castling_rights &= ~right
+        self.en_passant = None if len(fields) < 4 or fields[3] == "-" else self.parse_square(fields[3])
+        self.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        self.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+        self._undo_stack = []
+
+    def _put(self, square: int, index: int):
+        self.pieces[index] |= 1 << square
+        self.mailbox[square] = index
+
+    @property
+    def occupancy(self) -> tuple:
+        kinds = self.kinds
+        white = black = 0
+        for kind in range(kinds):
+            white |= self.pieces[kind]
+            black |= self.pieces[kinds + kind]
+        return white, black
+
+    def fen(self) -> str:
+        variant = self.variant
+        rows = []
+        for x in range(variant.height):
+            row = ""
+            empty = 0
+            for index in self.mailbox[x * variant.width:(x + 1) * variant.width]:
+                if index is None:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                letter = variant.letters[index % self.kinds]
+                row += letter if index < self.kinds else letter.lower()
+            rows.append(row + (str(empty) if empty else ""))
+        en_passant = "-" if self.en_passant is None else self.square_name(self.en_passant)
+        castling = "".join(letter for bit, letter in enumerate("KQkq") if self.castling_rights >> bit & 1) or "-"
+        return (f"{'/'.join(rows)} {'w' if self.isWhiteTurn else 'b'} {castling} {en_passant} "
+                f"{self.halfmove_clock} {self.fullmove_number}")
+
+    def square_name(self, square: int) -> str:
+        x, y = divmod(square, self.variant.width)
+        return "abcdefghijklmnop"[y] + str(self.variant.height - x)
+
+    def parse_square(self, name: str) -> int:
+        return (self.variant.height - int(name[1:])) * self.variant.width + "abcdefghijklmnop".index(name[0])
+
+    def move_name(self, move: Move) -> str:
+        promotion = "" if move.promotion is None else self.variant.letters[move.promotion].lower()
+        return self.square_name(move.from_square) + self.square_name(move.to_square) + promotion
+
+    def side_to_move(self) -> int:
+        return WHITE if self.isWhiteTurn else BLACK
+
+    def king_square(self, color: int) -> int:
+        return self.pieces[color * self.kinds + self.variant.king].bit_length() - 1
+
+    def attack_sets(self, by_color: int) -> tuple:
+        # MoveGenerator.attack_sets for the variant: the leap patterns and directions some by_color piece moves in.
+        # Built once per move generation, the attack checks then only look at what is on the board.
+        tables = self.tables
+        pieces = self.pieces
+        offset = by_color * self.kinds
+        leaps = []
+        for table, kinds in tables.leap_groups:
+            attackers = 0
+            for kind in kinds:
+                attackers |= pieces[offset + kind]
+            if attackers:
+                leaps.append((table, attackers))
+        slides = []
+        for slide, kinds in tables.slide_groups:
+            attackers = 0
+            for kind in kinds:
+                attackers |= pieces[offset + kind]
+            if attackers:
+                slides.append((slide, attackers))
+        return leaps, slides, tables.pawn_attacks[1 - by_color], pieces[offset + self.variant.pawn]
+
+    def is_square_attacked(self, square: int, by_color: int, occupied: int = None, ignore: int = 0) -> bool:
+        if occupied is None:
+            occupied = sum(self.occupancy)
+        return square_attacked(square, occupied, ~ignore, self.attack_sets(by_color))
+
+    def in_check(self) -> bool:
+        color = self.side_to_move()
+        return self.is_square_attacked(self.king_square(color), 1 - color)
+
+    def legal_moves(self) -> list:
+        tables = self.tables
+        variant = self.variant
+        color = self.side_to_move()
+        offset = color * self.kinds
+        white, black = self.occupancy
+        own, enemy = (white, black) if color == WHITE else (black, white)
+        occupied = white | black
+        king = self.king_square(color)
+        attacks = self.attack_sets(1 - color)
+        moves = []
+
+        for kind, (leaps, rays) in enumerate(tables.moves):
+            if kind == variant.pawn:
+                continue
+            movers = self.pieces[offset + kind]
+            while movers:
+                low = movers & -movers
+                movers ^= low
+                src = low.bit_length() - 1
+                targets = (leaps[src] if leaps is not None else 0) | (slide_attacks(src, occupied, rays) if rays else 0)
+                targets &= ~own
+                while targets:
+                    bit = targets & -targets
+                    targets ^= bit
+                    dst = bit.bit_length() - 1
+                    if kind == variant.king:
+                        if square_attacked(dst, occupied & ~low, ~bit, attacks):
+                            continue
+                    elif not king_safe_after(king, occupied, src, dst, dst, attacks):
+                        continue
+                    moves.append(Move(src, dst, None, CAPTURE if enemy & bit else 0))
+
+        if self.castling_rights:
+            for side_color, right, king_from, king_to, _, _, empty, path in tables.castling:
+                if side_color != color or not self.castling_rights & right or occupied & empty:
+                    continue
+                # Not out of, through or into check
+                without_king = occupied & ~(1 << king_from)
+                if any(square_attacked(square, without_king, -1, attacks) for square in path):
+                    continue
+                moves.append(Move(king_from, king_to, None, CASTLE))
+
+        step = tables.pawn_step[color]
+        promotion_row = tables.promotion_rows[color]
+        promotion_zone = tables.promotion_zones[color]
+        promotions = None
+        pawns = self.pieces[offset + variant.pawn]
+        while pawns:
+            low = pawns & -pawns
+            pawns ^= low
+            src = low.bit_length() - 1
+            candidates = []
+            one = src + step
+            if not occupied >> one & 1:
+                candidates.append((one, one, 0))
+                two = one + step
+                if low & tables.pawn_start_rows[color] and not occupied >> two & 1:
+                    candidates.append((two, two, DOUBLE_PUSH))
+            captures = tables.pawn_attacks[color][src]
+            targets = captures & enemy
+            while targets:
+                bit = targets & -targets
+                targets ^= bit
+                dst = bit.bit_length() - 1
+                candidates.append((dst, dst, CAPTURE))
+            if self.en_passant is not None and captures >> self.en_passant & 1:
+                candidates.append((self.en_passant, self.en_passant - step, EN_PASSANT))
+
+            for dst, captured_square, flags in candidates:
+                if not king_safe_after(king, occupied, src, dst, captured_square, attacks):
+                    continue
+                if (1 << dst) & (promotion_row | promotion_zone):
+                    if promotions is None:
+                        promotions = self._promotions(color)
+                    for promotion in promotions:
+                        moves.append(Move(src, dst, promotion, flags))
+                    if (1 << dst) & promotion_zone:
+                        moves.append(Move(src, dst, None, flags))
+                else:
+                    moves.append(Move(src, dst, None, flags))
+        return moves
+
+    def _promotions(self, color: int) -> tuple:
+        variant = self.variant
+        if not variant.promote_to_captured:
+            return variant.promotions
+        # Only kinds the side has lost pieces of
+        offset = color * self.kinds
+        return tuple(kind for kind in variant.promotions
+                     if self.pieces[offset + kind].bit_count() < variant.initial_counts[offset + kind])
+
+    def make_move(self, move: Move):
+        pieces = self.pieces
+        mailbox = self.mailbox
+        kinds = self.kinds
+        tables = self.tables
+        color = self.side_to_move()
+        src, dst = move.from_square, move.to_square
+        moved = mailbox[src]
+        kind = moved % kinds
+        step = tables.pawn_step[color]
+        # Worked out from the board, not from move.flags, like Board.make_move
+        captured_square = dst
+        if kind == self.variant.pawn and dst == self.en_passant:
+            captured_square = dst - step
+        rook_move = tables.castling_moves.get((src, dst)) if kind == self.variant.king else None
+        captured = mailbox[captured_square]
+        self._undo_stack.append((move, moved, captured, captured_square, self.en_passant, self.halfmove_clock,
+                                 self.castling_rights, rook_move))
+
+        if captured is not None:
+            pieces[captured] &= ~(1 << captured_square)
+            mailbox[captured_square] = None
+        pieces[moved] &= ~(1 << src)
+        mailbox[src] = None
+        placed = moved if move.promotion is None else color * kinds + move.promotion
+        pieces[placed] |= 1 << dst
+        mailbox[dst] = placed
+        if rook_move is not None:
+            rook_from, rook_to = rook_move
+            rook = mailbox[rook_from]
+            pieces[rook] ^= (1 << rook_from) | (1 << rook_to)
+            mailbox[rook_from] = None
+            mailbox[rook_to] = rook
+
+        keep = tables.castling_keep
+        self.castling_rights &= keep[src] & keep[dst]
+        self.en_passant = (src + dst) // 2 if kind == self.variant.pawn and dst - src == 2 * step else None
+        self.halfmove_clock = 0 if captured is not None or kind == self.variant.pawn else self.halfmove_clock + 1
+        if color == BLACK:
+            self.fullmove_number += 1
+        self.isWhiteTurn = not self.isWhiteTurn
+
+    def unmake_move(self):
+        (move, moved, captured, captured_square, en_passant, halfmove_clock,
+         castling_rights, rook_move) = self._undo_stack.pop()
+        pieces = self.pieces
+        mailbox = self.mailbox
+        self.isWhiteTurn = not self.isWhiteTurn
+        if not self.isWhiteTurn:
+            self.fullmove_number -= 1
+        src, dst = move.from_square, move.to_square
+        pieces[mailbox[dst]] &= ~(1 << dst)
+        mailbox[dst] = None
+        pieces[moved] |= 1 << src
+        mailbox[src] = moved
+        if captured is not None:
+            pieces[captured] |= 1 << captured_square
+            mailbox[captured_square] = captured
+        if rook_move is not None:
+            rook_from, rook_to = rook_move
+            rook = mailbox[rook_to]
+            pieces[rook] ^= (1 << rook_from) | (1 << rook_to)
+            mailbox[rook_to] = None
+            mailbox[rook_from] = rook
+        self.castling_rights = castling_rights
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+
+    def perft(self, depth: int) -> int:
+        if depth == 0:
+            return 1
+        moves = self.legal_moves()
+        if depth == 1:
+            return len(moves)
+        nodes = 0
+        for move in moves:
+            self.make_move(move)
+            nodes += self.perft(depth - 1)
+            self.unmake_move()
+        return nodes
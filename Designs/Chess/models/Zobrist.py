@@ -0,0 +1,59 @@
+"""
+
+Zobrist hashing gives every position a 64-bit key.
+
+Each (piece, square) pair, the side to move, every castling rights combination and every
+en passant file gets a random 64-bit number, and the key of a position is the XOR of the numbers
+of everything present in it. Because XOR is its own inverse, a move only has to XOR out what it
+removes and XOR in what it adds, so Board.make_move updates the key in a few operations instead
+of rehashing all 64 squares.
+
+The en passant file is only part of the key when a pawn of the side to move stands next to the
+pawn that just stepped twice, ready to capture it (whether the capture would be legal is not
+checked). Otherwise the position after a double step would never equal the same position
+reached another way, and repetitions after a double step would go unnoticed.
+
+The numbers come from a fixed seed so the same position gets the same key in every process,
+which lets keys be stored on disk or shared between workers.
+
+"""
+
+import random
+
+from Designs.Chess.models.AttackTables import PAWN_ATTACKS
+
+_random = random.Random(0x5EED_C4E55)
+
+
+def _key() -> int:
+    return _random.getrandbits(64)
+
+
+PIECE_KEYS = [[_key() for _ in range(64)] for _ in range(12)]
+SIDE_KEY = _key()
+CASTLING_KEYS = [_key() for _ in range(16)]
+EN_PASSANT_KEYS = [_key() for _ in range(8)]
+
+
+def en_passant_key(pieces: list, en_passant, isWhiteTurn: bool) -> int:
+    # Key of the en passant square, 0 when no pawn of the side to move can capture there
+    if en_passant is None:
+        return 0
+    color = 0 if isWhiteTurn else 1
+    if PAWN_ATTACKS[1 - color][en_passant] & pieces[color * 6]:
+        return EN_PASSANT_KEYS[en_passant % 8]
+    return 0
+
+
+def hash_position(bitboard, isWhiteTurn: bool, castling_rights: int, en_passant) -> int:
+    key = 0
+    for index, pieces in enumerate(bitboard.pieces):
+        keys = PIECE_KEYS[index]
+        while pieces:
+            low = pieces & -pieces
+            pieces ^= low
+            key ^= keys[low.bit_length() - 1]
+    if not isWhiteTurn:
+        key ^= SIDE_KEY
+    key ^= CASTLING_KEYS[castling_rights]
+    return key ^ en_passant_key(bitboard.pieces, en_passant, isWhiteTurn)
@@ -0,0 +1,54 @@
+import importlib.util
+import unittest
+
+from Designs.Chess.Perft import POSITIONS
+from Designs.Chess.models.Board import Board
+from Designs.Chess.models.BitBoard import KNIGHT, BISHOP, ROOK, QUEEN
+from Designs.Chess.models.Evaluation import evaluate
+from Designs.Chess.models.Fen import START_FEN
+from Designs.Chess.models.MoveGenerator import STRATEGIES
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+FENS = [fen or START_FEN for fen, _ in POSITIONS.values()] + ["4k3/8/8/8/8/8/8/4K2R b K - 0 1"]
+
+
+def mobility(board) -> list:
+    # White minus Black squares attacked per kind, not counting squares of own pieces
+    bitboard = board.bitboard
+    result = [0] * 6
+    for color, sign in ((0, 1), (1, -1)):
+        own = bitboard.occupancy[color]
+        for kind in (KNIGHT, BISHOP, ROOK, QUEEN):
+            pieces = bitboard.pieces[color * 6 + kind]
+            while pieces:
+                low = pieces & -pieces
+                pieces ^= low
+                targets = STRATEGIES[kind].attacks(low.bit_length() - 1, bitboard.occupied, color == 0) & ~own
+                result[kind] += sign * bin(targets).count("1")
+    return result
+
+
+@unittest.skipUnless(HAS_NUMPY, "BatchEvaluation needs NumPy")
+class BatchEvaluationTest(unittest.TestCase):
+    def setUp(self):
+        from Designs.Chess.models import BatchEvaluation
+        self.batch = BatchEvaluation
+        self.boards = [Board(None, None, fen=fen) for fen in FENS]
+
+    def test_matches_evaluate_without_mobility(self):
+        weights = self.batch.WEIGHTS.copy()
+        weights[6:12] = 0
+        scores = self.batch.evaluate_fens(FENS, weights)
+        self.assertEqual(scores.tolist(), [evaluate(board) for board in self.boards])
+        planes, white_to_move = self.batch.encode_boards(self.boards)
+        self.assertEqual(self.batch.evaluate_batch(planes, white_to_move, weights).tolist(), scores.tolist())
+
+    def test_mobility_matches_brute_force(self):
+        planes, _ = self.batch.encode_fens(FENS)
+        features = self.batch.features(planes)
+        for board, row in zip(self.boards, features):
+            self.assertEqual(row[6:12].astype(int).tolist(), mobility(board), board.fen())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from Designs.Chess.models.Board import Board, BoardState
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.Piece import PieceFactory, PieceType
+from Designs.Chess.models.Player import Player
+
+
+class BoardStateTest(unittest.TestCase):
+    def setUp(self):
+        self.board = Board(Player("white", True), Player("black", False))
+        self.board.initialize()
+
+    def play(self, *moves):
+        for text in moves:
+            self.board.make_move(Move.from_uci(text))
+
+    def test_check_and_mate(self):
+        self.play("f2f3", "e7e5")
+        self.assertEqual(self.board.boardstate, BoardState.ACTIVE)
+        self.play("g2g4", "d8h4")
+        self.assertTrue(self.board.checkers)
+        self.assertEqual(self.board.boardstate, BoardState.CHECKMATE)
+        self.assertEqual(self.board.game_result(), ("0-1", "checkmate"))
+        self.board.unmake_move()
+        self.play("f8c5")
+        self.assertEqual(self.board.boardstate, BoardState.ACTIVE)
+        self.assertIsNone(self.board.game_result())
+
+    def test_stalemate(self):
+        board = self.board
+        for x in range(8):
+            for y in range(8):
+                board.set_piece(x, y, None)
+        board.isWhiteTurn = False
+        board.castling_rights = 0
+        board.set_piece(0, 0, PieceFactory.create_piece(PieceType.KING, False))
+        board.set_piece(2, 1, PieceFactory.create_piece(PieceType.QUEEN, True))
+        board.set_piece(7, 7, PieceFactory.create_piece(PieceType.KING, True))
+        self.assertEqual(board.checkers, 0)
+        self.assertEqual(board.boardstate, BoardState.STALEMATE)
+        self.assertEqual(board.game_result(), ("1/2-1/2", "stalemate"))
+
+    def test_set_piece_updates_checkers(self):
+        # A queen dropped on e2 checks the black king along the open e-file once e7 is cleared
+        self.board.isWhiteTurn = False
+        self.board.set_piece(6, 4, PieceFactory.create_piece(PieceType.QUEEN, True))
+        self.board.set_piece(1, 4, None)
+        self.assertEqual(self.board.checkers, 1 << 52)
+        self.assertEqual(self.board.boardstate, BoardState.CHECK)
+        self.board.set_piece(1, 4, PieceFactory.create_piece(PieceType.PAWN, False))
+        self.assertEqual(self.board.checkers, 0)
+        self.assertEqual(self.board.boardstate, BoardState.ACTIVE)
+
+
+if __name__ == "__main__":
+    unittest.main()
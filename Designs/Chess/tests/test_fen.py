@@ -0,0 +1,44 @@
+import unittest
+
+from Designs.Chess.models.Board import Board, BoardRepresentation
+from Designs.Chess.models.Fen import START_FEN, FenError
+
+
+class FenTest(unittest.TestCase):
+    def test_round_trip(self):
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        self.assertEqual(Board(None, None, fen=fen).fen(), fen)
+
+    def test_unmake_restores_fen(self):
+        # Castling, en passant and promotions (with and without capture), every move made and unmade
+        for fen in ("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+                    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"):
+            board = Board(None, None, fen=fen)
+            for move in board.legal_moves():
+                board.make_move(move)
+                board.unmake_move()
+                self.assertEqual(board.fen(), fen, move.uci())
+
+    def test_rejects_bad_positions(self):
+        for fen in (
+            "P3k3/8/8/8/8/8/8/4K3 w - - 0 1",        # white pawn on the last rank
+            "4k3/8/8/8/8/8/8/p3K3 b - - 0 1",        # black pawn on the first rank
+            "4k3/4Q3/8/8/8/8/8/4K3 w - - 0 1",       # the side not to move is in check
+            "8/8/8/8/8/8/8/4K3 w - - 0 1",           # no black king
+            "4k3/8/8/8/8/8/8/4K3 w - e3 0 1",        # en passant square on the wrong rank
+            "4k3/8/8/8/8/8/8/4K2 w - - 0 1",         # rank of 7 squares
+        ):
+            with self.assertRaises(FenError, msg=fen):
+                Board(None, None, BoardRepresentation.BITBOARD, fen=fen)
+
+    def test_bad_fen_leaves_board_unchanged(self):
+        board = Board(None, None, fen=START_FEN)
+        with self.assertRaises(FenError):
+            board.set_fen("4k3/4Q3/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertEqual(board.fen(), START_FEN)
+        self.assertEqual(len(board.legal_moves()), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
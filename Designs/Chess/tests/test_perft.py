@@ -0,0 +1,25 @@
+import unittest
+
+from Designs.Chess.Perft import POSITIONS, divide, new_board, perft
+
+
+class PerftTest(unittest.TestCase):
+    def test_depth_2(self):
+        for name, (fen, known) in POSITIONS.items():
+            self.assertEqual(perft(new_board(fen), 2), known[1], name)
+
+    def test_depth_3(self):
+        # The cheaper positions, the others run at depth 3 and more in the Perft script
+        for name in ("start", "position3", "position4"):
+            fen, known = POSITIONS[name]
+            self.assertEqual(perft(new_board(fen), 3), known[2], name)
+
+    def test_divide_sums_to_perft(self):
+        fen, known = POSITIONS["kiwipete"]
+        board = new_board(fen)
+        self.assertEqual(sum(divide(board, 2).values()), known[1])
+        self.assertEqual(len(board.legal_moves()), known[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
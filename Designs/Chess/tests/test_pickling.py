@@ -0,0 +1,33 @@
+import copy
+import pickle
+import unittest
+
+from Designs.Chess.models.Board import Board
+from Designs.Chess.models.ParallelSearch import ParallelSearch
+from Designs.Chess.models.Piece import PieceFactory, PieceType
+from Designs.Chess.models.Player import Player
+
+
+class PicklingTest(unittest.TestCase):
+    def setUp(self):
+        self.board = Board(Player("white", True), Player("black", False))
+        self.board.initialize()
+
+    def test_pieces_keep_flyweight_identity(self):
+        queen = PieceFactory.create_piece(PieceType.QUEEN, True)
+        self.assertIs(pickle.loads(pickle.dumps(queen)), queen)
+        self.assertIs(copy.deepcopy(queen), queen)
+
+    def test_cells_board_round_trips(self):
+        for clone in (pickle.loads(pickle.dumps(self.board)), copy.deepcopy(self.board)):
+            self.assertEqual(clone.fen(), self.board.fen())
+            self.assertIs(clone.get_piece(7, 4), self.board.get_piece(7, 4))
+
+    def test_parallel_search_on_cells_board(self):
+        with ParallelSearch(workers=2, hash_mb=1) as search:
+            move = search.best_move(self.board, 200)
+        self.assertIn(move, self.board.legal_moves())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import time
+import unittest
+
+from Designs.Chess.models.Board import Board
+from Designs.Chess.models.Move import parse_square
+from Designs.Chess.models.Piece import PieceFactory, PieceType
+from Designs.Chess.models.Player import Player
+from Designs.Chess.models.Search import Search, MATE, INFINITY
+
+
+def position(pieces: dict, isWhiteTurn: bool = True) -> Board:
+    # pieces: square name -> (PieceType, isWhite), no castling or en passant
+    board = Board(Player("white", True), Player("black", False))
+    board.initialize()
+    for x in range(8):
+        for y in range(8):
+            board.set_piece(x, y, None)
+    for name, (piece_type, isWhite) in pieces.items():
+        board.set_piece(*divmod(parse_square(name), 8), PieceFactory.create_piece(piece_type, isWhite))
+    board.isWhiteTurn = isWhiteTurn
+    board.castling_rights = 0
+    board.en_passant = None
+    board.rehash()
+    return board
+
+
+class SearchTest(unittest.TestCase):
+    def test_mate_in_two(self):
+        # Rb7 (or Ra7) and mate on the back rank next move
+        board = position({"h8": (PieceType.KING, False), "h1": (PieceType.KING, True),
+                          "a2": (PieceType.ROOK, True), "b1": (PieceType.ROOK, True)})
+        search = Search()
+        move = search.best_move(board, 5000, max_depth=4)
+        self.assertEqual(search.score, MATE - 3)
+        board.make_move(move)
+        for reply in board.legal_moves():
+            board.make_move(reply)
+            search.best_move(board, 5000, max_depth=2)
+            self.assertEqual(search.score, MATE - 1)
+            board.unmake_move()
+
+    def test_quiescence_scores_mate_in_check(self):
+        # Black is mated, standing pat would score the material instead
+        board = position({"h8": (PieceType.KING, False), "g7": (PieceType.QUEEN, True),
+                          "g6": (PieceType.KING, True)}, isWhiteTurn=False)
+        search = Search()
+        search._deadline = time.perf_counter() + 5
+        self.assertEqual(search._quiesce(board, -INFINITY, INFINITY, 3), -MATE + 3)
+
+    def test_deadline(self):
+        board = Board(Player("white", True), Player("black", False))
+        board.initialize()
+        key = board.hash
+        started = time.perf_counter()
+        move = Search().best_move(board, 100)
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertIn(move, board.legal_moves())
+        # The search unwound every move it was exploring when the time ran out
+        self.assertEqual(board.hash, key)
+        self.assertEqual(len(board._undo_stack), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
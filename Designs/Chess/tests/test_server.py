@@ -0,0 +1,41 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from Designs.Chess.Server import GameServer
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "chess.sock")
+        self.server = GameServer()
+        await self.server.start_unix(self.path)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        self.directory.cleanup()
+
+    async def test_join_own_game_is_rejected(self):
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        writer.write(b"NEW white\n")
+        self.assertEqual(await reader.readline(), b"GAME 1 white\n")
+        writer.write(b"JOIN 1\n")
+        self.assertEqual(await reader.readline(), b"ERROR 1 already playing this game\n")
+        writer.write(b"QUIT\n")
+        await reader.read()
+        writer.close()
+        await asyncio.sleep(0)
+        self.assertFalse(self.server.tasks)
+        self.assertEqual(len(self.server.manager), 0)
+
+        # The game was never started, so the seat is not left open either
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        writer.write(b"JOIN 1\n")
+        self.assertEqual(await reader.readline(), b"ERROR unknown command JOIN 1\n")
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
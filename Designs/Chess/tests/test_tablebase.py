@@ -0,0 +1,29 @@
+import tempfile
+import unittest
+
+from Designs.Chess.models.Board import Board, BoardRepresentation
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.Search import Search
+from Designs.Chess.models.Tablebase import Tablebase, TablebaseError, generate
+from Designs.Chess.models.TranspositionTable import TranspositionTable
+
+
+class TablebaseTest(unittest.TestCase):
+    def test_refuses_pawns_on_both_sides(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for signature in ("KPvKP", "KRPvKP"):
+                with self.assertRaises(TablebaseError):
+                    generate(signature, directory)
+
+    def test_kpvkp_en_passant_is_left_to_the_search(self):
+        # Only dxe3 e.p. wins for Black: the new pawn on e3 runs in, and the white king is too far
+        board = Board(None, None, BoardRepresentation.BITBOARD, fen="8/K7/8/8/3pP3/8/8/7k b - e3 0 1")
+        with tempfile.TemporaryDirectory() as directory:
+            tablebase = Tablebase(directory)
+            self.assertIsNone(tablebase.probe(board))
+            search = Search(8, TranspositionTable(4), tablebase)
+            self.assertEqual(search.best_move(board, 1000), Move.from_uci("d4e3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
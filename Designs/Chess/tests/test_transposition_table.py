@@ -0,0 +1,94 @@
+import unittest
+
+from Designs.Chess.models.TranspositionTable import (
+    TranspositionTable, ReplacementPolicy, EXACT, LOWER, UPPER, score_to_table, score_from_table,
+)
+
+KEY = 0x9E3779B97F4A7C15
+
+
+class TranspositionTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(0.01)
+        # Same index, different position
+        self.other = KEY + self.table.size
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_round_trip(self):
+        for depth, score, bound, move in ((0, 0, EXACT, 0), (5, -1234, UPPER, 0x0FFF), (255, 99_999, LOWER, 0xFFFF),
+                                          (12, -99_999, EXACT, 1), (3, -(1 << 31), LOWER, 77)):
+            self.table.store(KEY, depth, score, bound, move)
+            self.assertEqual(self.table.probe(KEY), (depth, score, bound, move))
+
+    def test_depth_is_clamped(self):
+        self.table.store(KEY, 300, 10, EXACT)
+        self.assertEqual(self.table.probe(KEY)[0], 255)
+
+    def test_collision_is_detected(self):
+        self.table.store(KEY, 4, 50, EXACT, 9)
+        self.assertEqual(KEY & self.table.mask, self.other & self.table.mask)
+        self.assertIsNone(self.table.probe(self.other))
+        self.assertIsNone(self.table.probe(KEY ^ 1 << 63))
+
+    def test_torn_entry_fails_the_key_check(self):
+        self.table.store(KEY, 4, 50, EXACT, 9)
+        index = (KEY & self.table.mask) << 1
+        key_word = self.table.table[index]
+        self.table.store(KEY, 6, -50, UPPER, 10)
+        # Key word of the first write with the data word of the second, as a race would leave it
+        self.table.table[index] = key_word
+        self.assertIsNone(self.table.probe(KEY))
+
+    def test_depth_preferred_keeps_deeper_entry(self):
+        self.table.store(KEY, 8, 100, EXACT, 1)
+        self.table.store(self.other, 3, -100, EXACT, 2)
+        self.assertIsNotNone(self.table.probe(KEY))
+        self.assertIsNone(self.table.probe(self.other))
+        # As deep or deeper replaces it
+        self.table.store(self.other, 8, -100, EXACT, 2)
+        self.assertEqual(self.table.probe(self.other), (8, -100, EXACT, 2))
+        self.assertIsNone(self.table.probe(KEY))
+
+    def test_old_entries_are_replaced(self):
+        self.table.store(KEY, 8, 100, EXACT, 1)
+        self.table.new_search()
+        self.table.store(self.other, 1, -100, EXACT, 2)
+        self.assertEqual(self.table.probe(self.other), (1, -100, EXACT, 2))
+
+    def test_age_wraps(self):
+        for _ in range(64):
+            self.table.new_search()
+        self.assertEqual(self.table.age, 0)
+
+    def test_always_replace(self):
+        table = TranspositionTable(0.01, ReplacementPolicy.ALWAYS_REPLACE)
+        table.store(KEY, 8, 100, EXACT, 1)
+        table.store(self.other, 1, -100, EXACT, 2)
+        self.assertEqual(table.probe(self.other), (1, -100, EXACT, 2))
+        table.close()
+
+    def test_same_position_keeps_move(self):
+        self.table.store(KEY, 4, 50, LOWER, 321)
+        self.table.store(KEY, 2, -20, UPPER)
+        self.assertEqual(self.table.probe(KEY), (2, -20, UPPER, 321))
+
+    def test_shared_table(self):
+        table = TranspositionTable(0.01, shared=True)
+        attached = TranspositionTable(0.01, name=table.name)
+        table.store(KEY, 7, -300, LOWER, 5)
+        self.assertEqual(attached.probe(KEY), (7, -300, LOWER, 5))
+        attached.close()
+        table.close()
+
+    def test_mate_scores_are_relative(self):
+        mate_in_3 = 100000 - 5
+        stored = score_to_table(mate_in_3, 2)
+        self.assertEqual(score_from_table(stored, 4), mate_in_3 - 2)
+        self.assertEqual(score_from_table(score_to_table(-mate_in_3, 2), 2), -mate_in_3)
+        self.assertEqual(score_to_table(-150, 9), -150)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from Designs.Chess.models.Board import Board, BoardRepresentation
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.Player import Player
+
+
+def piece_key(piece):
+    return None if piece is None else (piece.piece_type, piece.isWhite)
+
+
+def snapshot(board) -> tuple:
+    # Everything a FEN holds, plus the key, the checkers and the cell grid
+    return (tuple(board.bitboard.pieces), board.isWhiteTurn, board.castling_rights, board.en_passant,
+            board.halfmove_clock, board.fullmove_number, board.hash, board.checkers,
+            tuple(piece_key(board.get_piece(x, y)) for x in range(8) for y in range(8)))
+
+
+class UndoTest(unittest.TestCase):
+    def check_line(self, *moves):
+        for representation in (BoardRepresentation.CELLS, BoardRepresentation.BITBOARD):
+            board = Board(Player("white", True), Player("black", False), representation)
+            board.initialize()
+            before = []
+            for text in moves:
+                state = snapshot(board)
+                move = Move.from_uci(text)
+                board.make_move(move)
+                after = snapshot(board)
+                board.unmake_move()
+                self.assertEqual(snapshot(board), state, text)
+                board.make_move(move)
+                self.assertEqual(snapshot(board), after, text)
+                before.append(state)
+            while before:
+                board.unmake_move()
+                self.assertEqual(snapshot(board), before.pop())
+
+    def test_castling(self):
+        # Castling moves the rook and drops both white rights, Bxf2+ then gives check
+        self.check_line("e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "f8c5", "e1g1", "c5f2")
+
+    def test_en_passant(self):
+        self.check_line("e2e4", "a7a6", "e4e5", "d7d5", "e5d6")
+
+    def test_promotion(self):
+        # gxh8=Q captures a rook, takes Black's kingside right and gives check
+        self.check_line("h2h4", "g7g5", "h4g5", "h7h6", "g5h6", "f8g7", "h6g7", "g8f6", "g7h8q")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from Designs.Chess.Perft import POSITIONS
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.Variant import CAPABLANCA, GRAND, STANDARD
+from Designs.Chess.models.VariantBoard import VariantBoard
+
+
+class VariantBoardTest(unittest.TestCase):
+    def test_standard_perft_with_castling(self):
+        for name in ("kiwipete", "position4", "position5"):
+            fen, known = POSITIONS[name]
+            board = VariantBoard(STANDARD, fen)
+            self.assertEqual(board.perft(2), known[1], name)
+            self.assertEqual(board.fen(), fen)
+
+    def test_variant_start_perft(self):
+        self.assertEqual(VariantBoard(CAPABLANCA).perft(2), 784)
+        self.assertEqual(VariantBoard(GRAND).perft(2), 4225)
+
+    def test_plain_moves_are_worked_out_from_the_board(self):
+        # No flags on the moves, as they come from a player
+        board = VariantBoard(STANDARD, "r3k2r/8/8/8/3p4/8/4P3/R3K2R w KQkq - 0 1")
+        board.make_move(Move(52, 36))
+        self.assertEqual(board.fen(), "r3k2r/8/8/8/3pP3/8/8/R3K2R b KQkq e3 0 1")
+        board.make_move(Move(35, 44))
+        self.assertEqual(board.fen(), "r3k2r/8/8/8/8/4p3/8/R3K2R w KQkq - 0 2")
+        board.make_move(Move(60, 62))
+        self.assertEqual(board.fen(), "r3k2r/8/8/8/8/4p3/8/R4RK1 b kq - 1 2")
+        board.unmake_move()
+        board.unmake_move()
+        board.unmake_move()
+        self.assertEqual(board.fen(), "r3k2r/8/8/8/3p4/8/4P3/R3K2R w KQkq - 0 1")
+
+    def test_grand_promotes_only_to_captured_kinds(self):
+        # Every white piece is still on the board, so the pawn on a9 cannot move to the last row
+        board = VariantBoard(GRAND, "9k/P9/10/10/10/10/10/10/1NBQKCABN1/R8R w - - 0 1")
+        self.assertFalse([move for move in board.legal_moves() if move.from_square == 10])
+        # With every piece lost, promoting is optional in the zone and compulsory on the last row
+        board = VariantBoard(GRAND, "9k/10/P9/10/10/10/10/10/10/K9 w - - 0 1")
+        self.assertEqual(len([move for move in board.legal_moves() if move.from_square == 20]), 7)
+        board = VariantBoard(GRAND, "9k/P9/10/10/10/10/10/10/10/K9 w - - 0 1")
+        self.assertEqual(len([move for move in board.legal_moves() if move.from_square == 10]), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from Designs.Chess.models.Board import Board
+from Designs.Chess.models.Move import Move
+from Designs.Chess.models.Player import Player
+from Designs.Chess.models.Zobrist import hash_position
+
+
+def full_hash(board) -> int:
+    return hash_position(board.bitboard, board.isWhiteTurn, board.castling_rights, board.en_passant)
+
+
+class ZobristTest(unittest.TestCase):
+    def setUp(self):
+        self.board = Board(Player("white", True), Player("black", False))
+        self.board.initialize()
+
+    def play(self, *moves):
+        for text in moves:
+            self.board.make_move(Move.from_uci(text))
+
+    def test_incremental_hash_matches_rehash(self):
+        board = self.board
+        rng = random.Random(7)
+        keys = [board.hash]
+        for _ in range(200):
+            moves = board.legal_moves()
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            self.assertEqual(board.hash, full_hash(board))
+            keys.append(board.hash)
+        while len(keys) > 1:
+            board.unmake_move()
+            keys.pop()
+            self.assertEqual(board.hash, keys[-1])
+            self.assertEqual(board.hash, full_hash(board))
+
+    def test_threefold_repetition(self):
+        self.assertEqual(self.board.repetition_count(), 1)
+        self.play("g1f3", "g8f6", "f3g1", "f6g8")
+        self.assertEqual(self.board.repetition_count(), 2)
+        self.assertFalse(self.board.is_threefold_repetition())
+        self.play("g1f3", "g8f6", "f3g1", "f6g8")
+        self.assertEqual(self.board.repetition_count(), 3)
+        self.assertTrue(self.board.is_threefold_repetition())
+        # Unmaking the move takes its count back
+        self.board.unmake_move()
+        self.assertEqual(self.board.repetition_count(), 2)
+
+    def test_repetition_after_double_step(self):
+        # No black pawn can take on e3, so the en passant square does not make the position new
+        self.play("e2e4")
+        first = self.board.hash
+        self.play("g8f6", "g1f3", "f6g8", "f3g1")
+        self.assertEqual(self.board.hash, first)
+        self.assertEqual(self.board.repetition_count(), 2)
+
+    def test_capturable_en_passant_is_hashed(self):
+        self.play("e2e4", "a7a6", "e4e5", "d7d5")
+        self.assertEqual(self.board.en_passant, 19)
+        without = hash_position(self.board.bitboard, True, self.board.castling_rights, None)
+        self.assertNotEqual(self.board.hash, without)
+
+
+if __name__ == "__main__":
+    unittest.main()
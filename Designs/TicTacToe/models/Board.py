@@ -1,61 +1,162 @@
-from .piece import Piece
+"""
+One int per player (one byte per square past MASK_LIMIT), with wins checked against precomputed lines.
+"""
+
+from .piece import Piece, PieceType
+
+# Boards up to this size keep one int per player
+MASK_LIMIT = 16
+
+# The piece of every player, index 0 is X and 1 is O
+PIECES = (Piece(PieceType.X), Piece(PieceType.O))
+
+_lines_cache = {}
+
+
+def lines_through(size: int, win_length: int) -> tuple:
+    # square -> masks of the win_length windows through that square
+    key = (size, win_length)
+    lines = _lines_cache.get(key)
+    if lines is None:
+        per_square = [[] for _ in range(size * size)]
+        reach = win_length - 1
+        for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for x in range(size):
+                for y in range(size):
+                    if not (0 <= x + dx * reach < size and 0 <= y + dy * reach < size):
+                        continue
+                    squares = [(x + dx * i) * size + y + dy * i for i in range(win_length)]
+                    mask = 0
+                    for square in squares:
+                        mask |= 1 << square
+                    for square in squares:
+                        per_square[square].append(mask)
+        lines = _lines_cache[key] = tuple(tuple(masks) for masks in per_square)
+    return lines
 
 
 class Board:
-    def __init__(self, size: int = 3):
+    __slots__ = ("size", "win_length", "moves", "masks", "_lines", "cells", "rows", "cols", "diagonal",
+                 "anti_diagonal", "_steps", "_runs", "_last", "_longest")
+
+    def __init__(self, size: int = 3, win_length: int = None):
+        if win_length is not None and not 1 <= win_length <= size:
+            raise ValueError(f"win_length must be between 1 and {size}")
         self.size = size
-        self.board: list[list[Piece | None]] = [[None for _ in range(size)] for _ in range(size)]
+        self.win_length = win_length or size
+        self.moves = 0
+        self.masks = None
+        self.cells = None
+        if size <= MASK_LIMIT:
+            self.masks = [0, 0]
+            self._lines = lines_through(size, self.win_length)
+            return
+        self.cells = bytearray(size * size)
+        if self.win_length == size:
+            self.rows = [0] * size
+            self.cols = [0] * size
+            self.diagonal = 0
+            self.anti_diagonal = 0
+        else:
+            stride = size + 1
+            self._steps = (1, stride, stride + 1, stride - 1)
+            # player -> per direction, square -> length of the run that square is an end of
+            self._runs = (({}, {}, {}, {}), ({}, {}, {}, {}))
+            # (x, y, player) of the last piece placed and the longest of its runs
+            self._last = None
+            self._longest = 0
+
+    @staticmethod
+    def _player(piece: Piece) -> int:
+        return 0 if piece.type == PieceType.X else 1
+
+    def get_piece(self, x: int, y: int) -> Piece | None:
+        square = x * self.size + y
+        if self.masks is not None:
+            for player in (0, 1):
+                if self.masks[player] >> square & 1:
+                    return PIECES[player]
+            return None
+        value = self.cells[square]
+        return PIECES[value - 1] if value else None
+
+    def is_full(self) -> bool:
+        return self.moves == self.size * self.size
 
     def print_board(self):
         for i in range(self.size):
             for j in range(self.size):
                 print("|", end="")
-                if self.board[i][j] is None:
+                piece = self.get_piece(i, j)
+                if piece is None:
                     print("_", end="")
                 else:
-                    print(self.board[i][j].type.value, end="")
+                    print(piece.type.value, end="")
                 print("|", end="")
             print()
 
+    def on_board(self, x: int, y: int) -> bool:
+        return 0 <= x < self.size and 0 <= y < self.size
+
     def place_piece(self, x: int, y: int, piece: Piece) -> bool:
-        if self.board[x][y] is not None:
+        if not self.on_board(x, y):
             return False
-        self.board[x][y] = piece
+        square = x * self.size + y
+        player = self._player(piece)
+        masks = self.masks
+        if masks is not None:
+            bit = 1 << square
+            if (masks[0] | masks[1]) & bit:
+                return False
+            masks[player] |= bit
+            self.moves += 1
+            return True
+
+        if self.cells[square]:
+            return False
+        self.cells[square] = player + 1
+        self.moves += 1
+        if self.win_length < self.size:
+            self._last = (x, y, player)
+            self._longest = self._extend_runs(x * (self.size + 1) + y, player)
+            return True
+        sign = 1 - 2 * player
+        self.rows[x] += sign
+        self.cols[y] += sign
+        if x == y:
+            self.diagonal += sign
+        if x + y == self.size - 1:
+            self.anti_diagonal += sign
         return True
 
-    def is_win(self, x: int, y: int, piece: Piece) -> bool:
-        row_match = True
-        col_match = True
-        diag_match = True
-        anti_diag_match = True
+    def _extend_runs(self, square: int, player: int) -> int:
+        longest = 0
+        for step, runs in zip(self._steps, self._runs[player]):
+            before = runs.get(square - step, 0)
+            after = runs.get(square + step, 0)
+            length = before + after + 1
+            runs[square - before * step] = length
+            runs[square + after * step] = length
+            if length > longest:
+                longest = length
+        return longest
 
-        # for row matching
-        for i in range(self.size):
-            if self.board[i][y] is not None and self.board[i][y].type == piece.type:
-                continue
-            row_match = False
-            break
-
-        for j in range(self.size):
-            if self.board[x][j] is not None and self.board[x][j].type == piece.type:
-                continue
-            col_match = False
-            break
-
-        i = 0
-        for j in range(self.size):
-            if self.board[i][j] is not None and self.board[i][j].type == piece.type:
-                i += 1
-                continue
-            diag_match = False
-            break
-
-        i = self.size - 1
-        for j in range(self.size - 1, -1, -1):
-            if self.board[i][j] is not None and self.board[i][j].type == piece.type:
-                i -= 1
-                continue
-            anti_diag_match = False
-            break
-
-        return row_match | col_match | diag_match | anti_diag_match
+    def is_win(self, x: int, y: int, piece: Piece) -> bool:
+        if not self.on_board(x, y):
+            return False
+        player = self._player(piece)
+        if self.masks is not None:
+            square = x * self.size + y
+            mask = self.masks[player]
+            if not mask >> square & 1:
+                return False
+            for line in self._lines[square]:
+                if mask & line == line:
+                    return True
+            return False
+        if self.win_length < self.size:
+            return (x, y, player) == self._last and self._longest >= self.win_length
+        target = (1 - 2 * player) * self.size
+        return (self.rows[x] == target or self.cols[y] == target
+                or (x == y and self.diagonal == target)
+                or (x + y == self.size - 1 and self.anti_diagonal == target))
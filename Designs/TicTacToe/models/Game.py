@@ -5,9 +5,9 @@ from .Player import Player
 
 
 class Game:
-    def __init__(self, size: int = 3, players: deque = deque()):
+    def __init__(self, size: int = 3, players: deque = deque(), win_length: int = None):
         self.size = size
-        self.board = Board(size)
+        self.board = Board(size, win_length)
         self.players: deque = players
 
     def __str__(self):
@@ -24,7 +24,7 @@ class Game:
             player_to_play: Player = self.players.popleft()
             self.board.print_board()
             print(f"{player_to_play.name}'s turn")
-            x, y = list(map(int, input("Enter cord: ").split(",")))
+            x, y = player_to_play.get_move(self.board)
             if self.board.place_piece(x, y, player_to_play.piece):
                 self.players.append(player_to_play)
             else:
@@ -35,3 +35,7 @@ class Game:
                 print(f"{player_to_play.name} won!")
                 self.board.print_board()
                 break
+            if self.board.is_full():
+                print("Draw!")
+                self.board.print_board()
+                break
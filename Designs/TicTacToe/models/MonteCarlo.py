@@ -0,0 +1,196 @@
+"""
+
+Monte Carlo tree search for boards too large to solve exactly (see Solver.py), like five in a row
+on 15x15.
+
+Every iteration walks down the tree picking children by UCT (the average result plus an
+exploration term that shrinks as a child gets visited), adds one new child for an untried move,
+plays the rest of the game out with random moves and adds the result (1 win, 0.5 draw, 0 loss)
+to every node on the way back up, seen from the player who made the move into the node. The
+move played is the most visited child of the root.
+
+The search works on the bitmask board (one int per player, see Board.py): a playout shuffles
+the empty squares once and plays them in turn on two local ints, checking only the precomputed
+lines through the square just played, so no board object is copied.
+
+The tree is kept between moves: after the opponent replies, the child for that reply becomes
+the new root with all its statistics. The budget is a number of iterations, a time limit in
+milliseconds, or both (whichever runs out first).
+
+With workers > 1 the search is root parallel: every worker process grows its own tree from the
+current position with its own random seed for the same budget, and the visit counts of the
+root moves are summed to pick the move. The trees stay in the workers, so this mode starts from
+a fresh tree every move.
+
+"""
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .Board import Board, lines_through
+from .piece import Piece
+
+
+class Node:
+    __slots__ = ("move", "parent", "children", "untried", "visits", "score", "result")
+
+    def __init__(self, move, parent, untried: list, result: float = None):
+        self.move = move
+        self.parent = parent
+        self.children = {}
+        self.untried = untried
+        self.visits = 0
+        # Sum of the playout results for the player who moved into this node
+        self.score = 0.0
+        # Set when the game is over in this node: 1.0 the move won, 0.5 the board is full
+        self.result = result
+
+
+class MonteCarlo:
+    def __init__(self, size: int = 15, win_length: int = 5, iterations: int = None, time_limit_ms: int = 100,
+                 exploration: float = 1.4, workers: int = 1, seed: int = None):
+        if iterations is None and time_limit_ms is None:
+            raise ValueError("Give an iteration or a time budget")
+        self.size = size
+        self.win_length = win_length or size
+        self.squares = size * size
+        self.full = (1 << self.squares) - 1
+        self.lines = lines_through(size, self.win_length)
+        self.iterations = iterations
+        self.time_limit_ms = time_limit_ms
+        self.exploration = exploration
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.root = None
+        # (X mask, O mask) of the root position
+        self._position = None
+        self._executor = None
+
+    def _empty_squares(self, empty: int) -> list:
+        squares = [square for square in range(self.squares) if empty >> square & 1]
+        self.rng.shuffle(squares)
+        return squares
+
+    def _wins(self, mask: int, square: int) -> bool:
+        for line in self.lines[square]:
+            if mask & line == line:
+                return True
+        return False
+
+    def _playout(self, own: int, other: int) -> float:
+        # Result of a random game for the player to move, whose pieces are own
+        squares = self._empty_squares(self.full & ~(own | other))
+        lines = self.lines
+        masks = [own, other]
+        turn = 0
+        for square in squares:
+            mask = masks[turn] = masks[turn] | 1 << square
+            for line in lines[square]:
+                if mask & line == line:
+                    return 1.0 if turn == 0 else 0.0
+            turn ^= 1
+        return 0.5
+
+    def _iterate(self, root: Node, own: int, other: int):
+        node = root
+        exploration = self.exploration
+        while node.result is None and not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            best = None
+            best_value = -1.0
+            for child in node.children.values():
+                value = child.score / child.visits + exploration * math.sqrt(log_visits / child.visits)
+                if value > best_value:
+                    best, best_value = child, value
+            node = best
+            own, other = other, own | 1 << node.move
+
+        if node.result is None and node.untried:
+            square = node.untried.pop()
+            mine = own | 1 << square
+            empty = self.full & ~(mine | other)
+            result = 1.0 if self._wins(mine, square) else 0.5 if not empty else None
+            child = node.children[square] = Node(square, node, self._empty_squares(empty) if result is None else [],
+                                                 result)
+            node = child
+            own, other = other, mine
+
+        value = node.result if node.result is not None else 1.0 - self._playout(own, other)
+        while node is not None:
+            node.visits += 1
+            node.score += value
+            value = 1.0 - value
+            node = node.parent
+
+    def search(self, own: int, other: int, root: Node = None) -> Node:
+        # Grows the tree of the position where the player with the pieces own is to move
+        if root is None:
+            root = Node(None, None, self._empty_squares(self.full & ~(own | other)))
+        deadline = None if self.time_limit_ms is None else time.perf_counter() + self.time_limit_ms / 1000
+        iteration = 0
+        while self.iterations is None or iteration < self.iterations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, own, other)
+            iteration += 1
+        return root
+
+    def _reused_root(self, masks: tuple):
+        # The subtree of the current position when it follows from the root by one opponent move
+        if self.root is None:
+            return None
+        previous = self._position[0] | self._position[1]
+        added = (masks[0] | masks[1]) ^ previous
+        if (masks[0] | masks[1]) & previous != previous or added & (added - 1):
+            return None
+        return self.root.children.get(added.bit_length() - 1)
+
+    def best_move(self, board: Board, piece: Piece):
+        # (x, y) of the move to play for piece on board, None when the board is full
+        if board.masks is None or board.size != self.size or board.win_length != self.win_length:
+            raise ValueError("The board does not match the search")
+        player = board._player(piece)
+        own, other = board.masks[player], board.masks[1 - player]
+        if not self.full & ~(own | other):
+            return None
+        if self.workers > 1:
+            square = self._parallel_best(own, other)
+        else:
+            root = self._reused_root(tuple(board.masks))
+            if root is not None:
+                root.parent = None
+            root = self.search(own, other, root)
+            square = max(root.children.values(), key=lambda child: child.visits).move
+            # Keep the subtree of the move played for the next move
+            self.root = root.children[square]
+            self.root.parent = None
+            masks = list(board.masks)
+            masks[player] |= 1 << square
+            self._position = tuple(masks)
+        return divmod(square, self.size)
+
+    def _parallel_best(self, own: int, other: int) -> int:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        jobs = [self._executor.submit(root_visits, self.size, self.win_length, own, other, self.iterations,
+                                      self.time_limit_ms, self.exploration, self.rng.getrandbits(64))
+                for _ in range(self.workers)]
+        visits = {}
+        for job in jobs:
+            for square, count in job.result().items():
+                visits[square] = visits.get(square, 0) + count
+        return max(visits, key=visits.get)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def root_visits(size: int, win_length: int, own: int, other: int, iterations, time_limit_ms, exploration: float,
+                seed: int) -> dict:
+    # One root-parallel worker: square -> visits of the root move
+    root = MonteCarlo(size, win_length, iterations, time_limit_ms, exploration, seed=seed).search(own, other)
+    return {square: child.visits for square, child in root.children.items()}
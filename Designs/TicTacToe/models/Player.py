@@ -5,3 +5,17 @@ class Player:
     def __init__(self, name: str, piece: Piece):
         self.name = name
         self.piece = piece
+
+    def get_move(self, board) -> tuple:
+        x, y = list(map(int, input("Enter cord: ").split(",")))
+        return x, y
+
+
+class ComputerPlayer(Player):
+    # Plays the moves of a Solver (or any object with best_move(board, piece))
+    def __init__(self, name: str, piece: Piece, solver):
+        super().__init__(name, piece)
+        self.solver = solver
+
+    def get_move(self, board) -> tuple:
+        return self.solver.best_move(board, self.piece)
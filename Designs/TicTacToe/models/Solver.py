@@ -0,0 +1,224 @@
+"""
+
+Perfect play for TicTacToe boards that keep one bitmask per player (see Board.py).
+
+The solver runs negamax with alpha-beta pruning on the two masks directly: the player to move
+tries every empty square, a move that completes one of the precomputed lines through its square
+wins at once, otherwise the position is scored from the opponent's side. A win is worth the
+number of squares that were still empty, so quicker wins score higher and slower losses are
+preferred, and a full board is a draw (0).
+
+Results are memoized in a transposition cache. A square board looks the same under its 8
+symmetries (4 rotations, each one mirrored), so a position is stored under its canonical form:
+the smallest key of the 8 transformed positions. The masks are transformed with per-symmetry
+lookup tables, one 256-entry table per byte of the mask. Since alpha-beta does not always find
+the exact value, every entry carries a flag saying whether the value is exact or only a lower or
+upper bound.
+
+The cache survives between moves, so after the first reply a game is answered from it. For 3x3
+the best move of every reachable position can also be precomputed once (build_table) and saved
+to disk as fixed-size records (save_table / load_table), then a reply is one dict lookup:
+
+    python -m models.Solver --output solved3x3.bin      (from Designs/TicTacToe)
+
+"""
+
+import argparse
+import struct
+
+from .Board import Board, MASK_LIMIT, lines_through
+from .piece import Piece
+
+EXACT, LOWER, UPPER = 0, 1, 2
+INFINITY = 1 << 20
+# Position key (mover's mask << squares | opponent's mask), best square
+RECORD = struct.Struct("<QH")
+
+
+def _symmetries(size: int) -> list:
+    # Every symmetry as a square -> square list
+    def rotate(x, y):
+        return y, size - 1 - x
+
+    result = []
+    for mirror in (False, True):
+        for turns in range(4):
+            mapping = []
+            for square in range(size * size):
+                x, y = divmod(square, size)
+                if mirror:
+                    y = size - 1 - y
+                for _ in range(turns):
+                    x, y = rotate(x, y)
+                mapping.append(x * size + y)
+            result.append(mapping)
+    return result
+
+
+def _byte_tables(mapping: list) -> list:
+    # tables[i][byte] = the transformed mask of the squares 8 * i .. 8 * i + 7 set in byte
+    tables = []
+    for start in range(0, len(mapping), 8):
+        table = []
+        for byte in range(256):
+            mask = 0
+            for bit in range(8):
+                if byte >> bit & 1 and start + bit < len(mapping):
+                    mask |= 1 << mapping[start + bit]
+            table.append(mask)
+        tables.append(table)
+    return tables
+
+
+class Solver:
+    def __init__(self, size: int = 3, win_length: int = None, table: str = None):
+        if size > MASK_LIMIT:
+            raise ValueError(f"The solver needs a board of at most {MASK_LIMIT}x{MASK_LIMIT}")
+        self.size = size
+        self.win_length = win_length or size
+        self.squares = size * size
+        self.full = (1 << self.squares) - 1
+        self.lines = lines_through(size, self.win_length)
+        self.symmetries = _symmetries(size)
+        self._transforms = [_byte_tables(mapping) for mapping in self.symmetries]
+        # Squares on more lines first, the center of 3x3 before the corners before the edges
+        self.order = sorted(range(self.squares), key=lambda square: -len(self.lines[square]))
+        self.cache = {}
+        self.table = load_table(table) if table else {}
+        self.nodes = 0
+
+    def _transform(self, mask: int, tables: list) -> int:
+        result = 0
+        for table in tables:
+            result |= table[mask & 0xFF]
+            mask >>= 8
+        return result
+
+    def key(self, own: int, other: int) -> int:
+        return own << self.squares | other
+
+    def canonical(self, own: int, other: int) -> int:
+        return min(self.key(self._transform(own, tables), self._transform(other, tables))
+                   for tables in self._transforms)
+
+    def wins(self, mask: int, square: int) -> bool:
+        for line in self.lines[square]:
+            if mask & line == line:
+                return True
+        return False
+
+    def negamax(self, own: int, other: int, alpha: int = -INFINITY, beta: int = INFINITY) -> int:
+        # Value of the position for the player to move, whose pieces are own
+        self.nodes += 1
+        empty = self.full & ~(own | other)
+        if not empty:
+            return 0
+        key = self.canonical(own, other)
+        entry = self.cache.get(key)
+        if entry is not None:
+            value, bound = entry
+            if bound == EXACT:
+                return value
+            if bound == LOWER and value > alpha:
+                alpha = value
+            elif bound == UPPER and value < beta:
+                beta = value
+            if alpha >= beta:
+                return value
+
+        original_alpha = alpha
+        remaining = bin(empty).count("1")
+        best = -INFINITY
+        for square in self.order:
+            bit = 1 << square
+            if not empty & bit:
+                continue
+            mine = own | bit
+            value = remaining if self.wins(mine, square) else -self.negamax(other, mine, -beta, -alpha)
+            if value > best:
+                best = value
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        break
+
+        bound = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        self.cache[key] = (best, bound)
+        return best
+
+    def best_square(self, own: int, other: int):
+        # (square, value) of the best move for the player whose pieces are own, None on a full board
+        square = self.table.get(self.key(own, other))
+        if square is not None:
+            return square, None
+        empty = self.full & ~(own | other)
+        remaining = bin(empty).count("1")
+        best = None
+        alpha = -INFINITY
+        for square in self.order:
+            bit = 1 << square
+            if not empty & bit:
+                continue
+            mine = own | bit
+            value = remaining if self.wins(mine, square) else -self.negamax(other, mine, -INFINITY, -alpha)
+            if best is None or value > alpha:
+                best = square, value
+                alpha = value
+        return best
+
+    def best_move(self, board: Board, piece: Piece):
+        # (x, y) of the best move for piece on board, None when the board is full
+        if board.size != self.size or board.win_length != self.win_length:
+            raise ValueError("The board does not match the solver")
+        player = board._player(piece)
+        result = self.best_square(board.masks[player], board.masks[1 - player])
+        return None if result is None else divmod(result[0], self.size)
+
+    def build_table(self) -> dict:
+        # Best square of every position reachable from the empty board that is not over yet
+        table = {}
+        seen = set()
+        stack = [(0, 0)]
+        while stack:
+            own, other = stack.pop()
+            key = self.key(own, other)
+            if key in seen:
+                continue
+            seen.add(key)
+            empty = self.full & ~(own | other)
+            if not empty:
+                continue
+            table[key] = self.best_square(own, other)[0]
+            for square in range(self.squares):
+                bit = 1 << square
+                if empty & bit and not self.wins(own | bit, square):
+                    stack.append((other, own | bit))
+        return table
+
+
+def save_table(path: str, table: dict):
+    with open(path, "wb") as file:
+        for key in sorted(table):
+            file.write(RECORD.pack(key, table[key]))
+
+
+def load_table(path: str) -> dict:
+    with open(path, "rb") as file:
+        return {key: square for key, square in RECORD.iter_unpack(file.read())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve TicTacToe and save the best move of every position")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win-length", type=int)
+    args = parser.parse_args(argv)
+
+    solver = Solver(args.size, args.win_length)
+    table = solver.build_table()
+    save_table(args.output, table)
+    print(f"{len(table)} positions, {len(solver.cache)} cached, value {solver.negamax(0, 0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from Designs.TicTacToe.models.Board import Board
+from Designs.TicTacToe.models.piece import Piece, PieceType
+
+X = Piece(PieceType.X)
+O = Piece(PieceType.O)
+
+
+def brute_force_win(owners: dict, x: int, y: int, win_length: int) -> bool:
+    # Longest run of the owner of (x, y) through it, counted square by square
+    owner = owners[(x, y)]
+    for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        length = 1
+        for sign in (1, -1):
+            step = 1
+            while owners.get((x + sign * dx * step, y + sign * dy * step)) is owner:
+                length += 1
+                step += 1
+        if length >= win_length:
+            return True
+    return False
+
+
+def lines(size: int, win_length: int) -> list:
+    # Every winning line of the board as a list of squares
+    result = []
+    for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for x in range(size):
+            for y in range(size):
+                squares = [(x + dx * i, y + dy * i) for i in range(win_length)]
+                if all(0 <= a < size and 0 <= b < size for a, b in squares):
+                    result.append(squares)
+    return result
+
+
+class BoardTest(unittest.TestCase):
+    def test_off_board_moves_are_rejected(self):
+        for size, win_length in ((3, None), (20, None), (20, 5)):
+            board = Board(size, win_length)
+            for x, y in ((0, size), (size, 1), (-1, 0), (0, -1)):
+                self.assertFalse(board.place_piece(x, y, X))
+                self.assertFalse(board.is_win(x, y, X))
+            self.assertEqual(board.moves, 0)
+            self.assertIsNone(board.get_piece(1, 0))
+
+    def test_row_wins(self):
+        board = Board(3)
+        for y in range(3):
+            self.assertTrue(board.place_piece(1, y, X))
+        self.assertTrue(board.is_win(1, 2, X))
+
+    def check_random_games(self, size: int, win_length: int, games: int):
+        # X mostly plays along one winning line, so games on large boards are won too
+        rng = random.Random(size * 100 + win_length)
+        all_lines = lines(size, win_length)
+        for _ in range(games):
+            board = Board(size) if win_length == size else Board(size, win_length)
+            owners = {}
+            target = rng.choice(all_lines)
+            pieces = (X, O)
+            for turn in range(size * size):
+                piece = pieces[turn % 2]
+                free = [square for square in target if square not in owners]
+                if piece is X and free and rng.random() < 0.7:
+                    x, y = rng.choice(free)
+                else:
+                    while True:
+                        x, y = rng.randrange(size), rng.randrange(size)
+                        if (x, y) not in owners:
+                            break
+                self.assertTrue(board.place_piece(x, y, piece))
+                self.assertFalse(board.place_piece(x, y, pieces[1 - turn % 2]))
+                owners[(x, y)] = piece
+                won = brute_force_win(owners, x, y, win_length)
+                self.assertEqual(board.is_win(x, y, piece), won, (size, win_length, x, y))
+                self.assertFalse(board.is_win(x, y, pieces[1 - turn % 2]))
+                if won:
+                    break
+
+    def test_full_line_wins_match_brute_force(self):
+        for size in (3, 4, 7, 17, 20):
+            self.check_random_games(size, size, 30)
+
+    def test_k_in_a_row_wins_match_brute_force(self):
+        for size, win_length in ((4, 3), (7, 4), (15, 5), (20, 5), (19, 6)):
+            self.check_random_games(size, win_length, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()